@@ -0,0 +1,95 @@
+# Benchmark: notebook interpolation vs sdg7.etl, full vs incremental runs
+#
+# The raw file is enlarged synthetically (every country copied --scale times
+# with a suffix). The incremental run after appending a new year for a few
+# countries, plus a brand new country, is checked against a full rebuild.
+# Usage: python benchmarks/bench_etl.py [--scale 20]
+import argparse
+import sys
+import tempfile
+import time
+import warnings
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sdg7.config import RAW_CSV  # noqa: E402
+from sdg7.etl import clean_columns, process, run  # noqa: E402
+
+
+def notebook_process(df):
+    # Interpolation cell of jupyter_notebooks/SDG7.ipynb
+    df = df.copy()
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        df.interpolate(method="linear", inplace=True)
+        df = df.sort_values(by=["country", "year"])
+        df = df.groupby("country").apply(lambda group: group.interpolate(method="linear", limit_direction="both"))
+    return df.reset_index(drop=True)
+
+
+def enlarge(df_raw, factor):
+    copies = []
+    for i in range(factor):
+        df_copy = df_raw.copy()
+        df_copy["Entity"] = df_copy["Entity"] + f" #{i:03d}"
+        copies.append(df_copy)
+    return pd.concat(copies, ignore_index=True).sort_values(["Entity", "Year"], kind="stable")
+
+
+def add_new_data(df_raw, n_countries, seed=0):
+    """Append a 2021 row for n countries and one new country."""
+    rng = np.random.default_rng(seed)
+    latest = df_raw[df_raw["Year"] == df_raw["Year"].max()]
+    new_year = latest.sample(n_countries, random_state=seed).copy()
+    new_year["Year"] += 1
+    numeric = new_year.select_dtypes(include="number").columns.drop("Year")
+    new_year[numeric] = new_year[numeric] * rng.normal(1, 0.01, size=(len(new_year), len(numeric)))
+    new_year.iloc[::3, 3] = np.nan  # some gaps in the new rows
+    new_country = df_raw[df_raw["Entity"] == df_raw["Entity"].iloc[0]].copy()
+    new_country["Entity"] = "Aaa New Country"
+    return pd.concat([df_raw, new_year, new_country], ignore_index=True).sort_values(["Entity", "Year"], kind="stable")
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scale", type=int, default=20)
+    parser.add_argument("--changed", type=int, default=10, help="Countries that get a new year")
+    args = parser.parse_args()
+
+    df_raw = enlarge(pd.read_csv(RAW_CSV, encoding="latin1"), args.scale)
+    cleaned = clean_columns(df_raw).sort_values(["country", "year"], kind="stable").reset_index(drop=True)
+    print(f"x{args.scale}: {len(df_raw)} rows, {df_raw['Entity'].nunique()} countries")
+
+    t_notebook, expected = timed(notebook_process, cleaned)
+    t_process, result = timed(process, cleaned)
+    pd.testing.assert_frame_equal(result, expected)
+    print(f"  interpolation  notebook {t_notebook * 1000:8.1f} ms | vectorized {t_process * 1000:8.1f} ms")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        raw_path, out_full, out_incr = tmp / "raw.csv", tmp / "full.csv", tmp / "incremental.csv"
+        df_raw.to_csv(raw_path, index=False, encoding="latin1")
+        t_first, _ = timed(run, raw_path, out_incr)
+
+        add_new_data(df_raw, args.changed).to_csv(raw_path, index=False, encoding="latin1")
+        t_full, _ = timed(run, raw_path, out_full)
+        t_incr, affected = timed(run, raw_path, out_incr, incremental=True)
+        assert out_full.read_bytes() == out_incr.read_bytes(), "incremental output differs from full rebuild"
+
+    print(f"  pipeline       full {t_first * 1000:8.1f} ms")
+    print(f"  after update   full {t_full * 1000:8.1f} ms | incremental {t_incr * 1000:8.1f} ms "
+          f"({len(affected)} countries reprocessed, identical output)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+# Benchmark: full and incremental builds of the static site (python -m sdg7.export)
+#
+# On a copy of the data: a full build with each worker count, a re-run with
+# nothing changed, and a re-run after correcting one value of one country
+# in 2015 (which re-renders that country's page, the 2015 Hypotheses page
+# and the pages built from all countries). Times are wall-clock of the whole
+# command, interpreter start and data loading included.
+# Usage: python benchmarks/bench_export.py [--workers 1 4] [--country Kenya]
+import argparse
+import csv
+import io
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from sdg7.config import DATA_DIR, PROCESSED_CSV  # noqa: E402
+
+SUMMARY_LINE = re.compile(r"(\d+) pages, (\d+) rendered")
+
+
+def export(data_dir, site_dir, workers):
+    """Run the exporter; returns (seconds, pages, rendered)."""
+    env = dict(os.environ, SDG7_DATA_DIR=str(data_dir))
+    start = time.perf_counter()
+    out = subprocess.run([sys.executable, "-m", "sdg7.export", "--output", str(site_dir), "--workers", str(workers)],
+                         env=env, cwd=ROOT_DIR, capture_output=True, text=True)
+    elapsed = time.perf_counter() - start
+    if out.returncode:
+        raise RuntimeError(out.stderr.strip().splitlines()[-1])
+    pages, rendered = map(int, SUMMARY_LINE.search(out.stdout).groups())
+    return elapsed, pages, rendered
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, nargs="+", default=None)
+    parser.add_argument("--country", default="Kenya", help="Country whose data is corrected for the last run")
+    args = parser.parse_args()
+
+    cpus = os.cpu_count()
+    worker_counts = args.workers or sorted({1, cpus})
+    print(f"{cpus} CPUs")
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = Path(tmp) / "Data"
+        for name in ["Processed", "Predictions", "Reference"]:
+            shutil.copytree(DATA_DIR / name, data_dir / name)
+        env = dict(os.environ, SDG7_DATA_DIR=str(data_dir))
+        subprocess.run([sys.executable, "-m", "sdg7.store"], env=env, cwd=ROOT_DIR, check=True, capture_output=True)
+
+        def report(label, result):
+            elapsed, pages, rendered = result
+            print(f"  {label:28s} {elapsed:8.2f} s ({rendered} of {pages} pages rendered)")
+
+        for workers in worker_counts:
+            report(f"full build, {workers} workers", export(data_dir, Path(tmp) / f"site-{workers}", workers))
+        site_dir = Path(tmp) / f"site-{worker_counts[-1]}"
+        report("incremental, no change", export(data_dir, site_dir, worker_counts[-1]))
+
+        # A mid-series correction: no other country's row or quartile moves. The
+        # line is edited as text, writing a parsed frame back could reformat other rows' floats
+        processed = data_dir / "Processed" / PROCESSED_CSV.name
+        lines = processed.read_text().splitlines(keepends=True)
+        header = next(csv.reader(lines[:1]))
+        for i, line in enumerate(lines[1:], start=1):
+            fields = next(csv.reader([line]))
+            if fields[header.index("country")] == args.country and float(fields[header.index("year")]) == 2015:
+                column = header.index("access_to_clean_fuels")
+                fields[column] = str(float(fields[column]) + 0.5)
+                buffer = io.StringIO()
+                csv.writer(buffer, lineterminator="\n").writerow(fields)
+                lines[i] = buffer.getvalue()
+                break
+        else:
+            parser.error(f"No 2015 row for {args.country}")
+        processed.write_text("".join(lines))
+        subprocess.run([sys.executable, "-m", "sdg7.store"], env=env, cwd=ROOT_DIR, check=True, capture_output=True)
+        report(f"incremental, {args.country} changed", export(data_dir, site_dir, worker_counts[-1]))
+
+
+if __name__ == "__main__":
+    main()
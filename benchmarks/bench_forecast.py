@@ -0,0 +1,92 @@
+# Benchmark: per-country LinearRegression loop (Model.ipynb) vs batched forecast
+#
+# Usage: python benchmarks/bench_forecast.py [--scale 1 10 100]
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LinearRegression
+from sklearn.metrics import mean_absolute_error, r2_score
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sdg7.config import PROCESSED_CSV, TARGET_VARS  # noqa: E402
+from sdg7.forecast import forecast  # noqa: E402
+
+
+def loop_forecast(df, year_future=2030):
+    # Forecast cell of jupyter_notebooks/Model.ipynb
+    predictions = []
+    metrics = []
+    for country in df["country"].unique():
+        df_country = df[df["country"] == country]
+        for target in TARGET_VARS:
+            df_target = df_country[["year", target]].dropna()
+            if len(df_target) >= 5:
+                X = df_target[["year"]]
+                y = df_target[target]
+                model = LinearRegression()
+                model.fit(X, y)
+                y_pred = model.predict(X)
+                future_pred = model.predict(pd.DataFrame({"year": [year_future]}))[0]
+                if target in ["access_to_electricity", "access_to_clean_fuels"]:
+                    future_pred = min(100, max(0, future_pred))
+                elif target == "renewable_capacity_per_capita":
+                    future_pred = max(0, future_pred)
+                predictions.append({"country": country, "target": target, "predicted_value": future_pred})
+                metrics.append({"country": country, "target": target,
+                                "r2": r2_score(y, y_pred), "mae": mean_absolute_error(y, y_pred)})
+    return pd.DataFrame(predictions), pd.DataFrame(metrics)
+
+
+def scale_data(df, factor, seed=0):
+    """Replicate every country `factor` times with small multiplicative noise."""
+    if factor == 1:
+        return df
+    rng = np.random.default_rng(seed)
+    copies = []
+    for i in range(factor):
+        df_copy = df.copy()
+        df_copy["country"] = df_copy["country"] + f" #{i}"
+        df_copy[TARGET_VARS] = df_copy[TARGET_VARS] * rng.normal(1, 0.02, size=(len(df_copy), len(TARGET_VARS)))
+        copies.append(df_copy)
+    return pd.concat(copies, ignore_index=True)
+
+
+def timed(func, *args, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scale", type=int, nargs="+", default=[1, 10])
+    args = parser.parse_args()
+
+    df = pd.read_csv(PROCESSED_CSV)
+    for factor in args.scale:
+        df_scaled = scale_data(df, factor)
+        t_batch, (pred_batch, met_batch) = timed(forecast, df_scaled)
+        t_loop, (pred_loop, met_loop) = timed(loop_forecast, df_scaled, repeat=1)
+
+        merged = pred_loop.merge(pred_batch, on=["country", "target"], suffixes=("_loop", "_batch"))
+        merged_met = met_loop.merge(met_batch, on=["country", "target"], suffixes=("_loop", "_batch"))
+        assert len(merged) == len(pred_loop) == len(pred_batch)
+        max_pred_diff = (merged["predicted_value_loop"] - merged["predicted_value_batch"]).abs().max()
+        max_r2_diff = (merged_met["r2_loop"] - merged_met["r2_batch"]).abs().max()
+
+        print(f"x{factor}: {df_scaled['country'].nunique()} countries, {len(pred_batch)} series")
+        print(f"  loop    {t_loop * 1000:10.1f} ms")
+        print(f"  batched {t_batch * 1000:10.1f} ms  ({t_loop / t_batch:.0f}x faster)")
+        print(f"  max |Δ prediction| {max_pred_diff:.2e} | max |Δ R²| {max_r2_diff:.2e}")
+
+
+if __name__ == "__main__":
+    main()
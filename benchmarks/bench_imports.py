@@ -0,0 +1,129 @@
+# Benchmark: import-time profile (-X importtime) of app startup and each page's first visit
+#
+# A fresh interpreter started with -X importtime drives app.py through
+# streamlit.testing.v1.AppTest: "streamlit" is importing Streamlit itself
+# (the floor of dyno boot), "startup" the first run of the app (the default
+# page, i.e. first paint), then the first visit of every other page. Phase
+# markers written to stderr split the importtime log, so each phase reports
+# its wall time, total import time and heaviest top-level imports. Results
+# are written as JSON with the commit id, like bench_pages.py.
+# Usage: python benchmarks/bench_imports.py [--runs 3] [--top 8] [--output benchmarks/results/bench_imports.json]
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+RESULTS_DIR = ROOT_DIR / "benchmarks" / "results"  # not committed
+PAGES = ["Dashboard", "Predictions", "What-if Scenarios", "Country Overview", "Hypotheses"]
+MARKER = "# bench_imports phase: "
+IMPORT_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def child(timeout):
+    """Run the phases, marking each on stderr; prints the wall times as JSON."""
+    wall = {}
+
+    def phase(name, action):
+        print(MARKER + name, file=sys.stderr, flush=True)
+        start = time.perf_counter()
+        action()
+        wall[name] = time.perf_counter() - start
+
+    state = {}
+
+    def startup():
+        from streamlit.testing.v1 import AppTest
+
+        state["at"] = AppTest.from_file(str(ROOT_DIR / "app.py"), default_timeout=timeout).run()
+
+    phase("streamlit", lambda: __import__("streamlit.testing.v1"))
+    phase("startup", startup)
+    at = state["at"]
+    if at.exception:
+        raise RuntimeError(f"startup: {at.exception[0].value}")
+    for page in PAGES:
+        phase(page, lambda: at.sidebar.radio[0].set_value(page).run())
+        if at.exception:
+            raise RuntimeError(f"{page}: {at.exception[0].value}")
+    print(json.dumps(wall))
+
+
+def parse_importtime(stderr):
+    """{phase: [(module, cumulative us)]} of the top-level imports of every phase."""
+    phases, current = {}, None
+    for line in stderr.splitlines():
+        if line.startswith(MARKER):
+            current = line[len(MARKER):]
+            phases[current] = []
+            continue
+        match = IMPORT_LINE.match(line)
+        # Nested imports are indented under the module that triggered them
+        if match and current is not None and len(match.group(3)) == 1:
+            phases[current].append((match.group(4), int(match.group(2))))
+    return phases
+
+
+def git_commit():
+    out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR, capture_output=True, text=True)
+    return out.stdout.strip() or None
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=8, help="Heaviest imports listed per phase")
+    parser.add_argument("--timeout", type=float, default=600, help="Seconds allowed per app run")
+    parser.add_argument("--output", default=str(RESULTS_DIR / "bench_imports.json"))
+    parser.add_argument("--child", action="store_true")
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.timeout)
+        return
+
+    runs = []
+    for _ in range(args.runs):
+        out = subprocess.run([sys.executable, "-X", "importtime", __file__, "--child", "--timeout", str(args.timeout)],
+                             env=dict(os.environ, PYTHONPATH=str(ROOT_DIR)), cwd=ROOT_DIR,
+                             capture_output=True, text=True)
+        if out.returncode:
+            raise RuntimeError(out.stderr.strip().splitlines()[-1])
+        runs.append((json.loads(out.stdout.strip().splitlines()[-1]), parse_importtime(out.stderr)))
+
+    results = {"commit": git_commit(), "created": time.strftime("%Y-%m-%dT%H:%M:%S"), "phases": {}}
+    for name in runs[0][0]:
+        imports = {}
+        for _, phases in runs:
+            for module, us in phases.get(name, []):
+                imports.setdefault(module, []).append(us)
+        # Median over runs; a module only imported in some runs counts as 0 in the others
+        medians = {module: statistics.median(values + [0] * (len(runs) - len(values)))
+                   for module, values in imports.items()}
+        top = sorted(medians.items(), key=lambda item: -item[1])[:args.top]
+        results["phases"][name] = {
+            "seconds": statistics.median(wall[name] for wall, _ in runs),
+            "import_seconds": statistics.median(sum(us for _, us in phases.get(name, [])) / 1e6
+                                                for _, phases in runs),
+            "modules": len(imports),
+            "top_imports": {module: us / 1e6 for module, us in top},
+        }
+
+    for name, phase in results["phases"].items():
+        print(f"{name:18s} {phase['seconds'] * 1000:8.0f} ms wall | {phase['import_seconds'] * 1000:7.0f} ms "
+              f"importing {phase['modules']} top-level modules")
+        for module, seconds in phase["top_imports"].items():
+            if seconds >= 0.005:
+                print(f"    {module:40s} {seconds * 1000:7.0f} ms")
+    Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+    Path(args.output).write_text(json.dumps(results, indent=2) + "\n")
+    print(f"Results saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+# Benchmark: memory of the shared dataset and per-session overhead of app.py
+#
+# In a fresh interpreter one AppTest session visits every page (loading the
+# data and filling the shared caches), then --sessions more sessions do the
+# same and are kept alive. Reported:
+#   shared       - RSS growth of the first session (data, caches, imports)
+#   per session  - Python/NumPy memory (tracemalloc) still held after the
+#                  extra sessions, divided by --sessions
+#   per rerun    - median peak allocations of a warm rerun of each page
+#                  (--repeats runs), i.e. what every rerun copies or builds
+# With --ref the same measurement runs on a git worktree of that commit,
+# so the report shows before and after side by side. --dataset x10/x100 use
+# the synthetic datasets of bench_pages.py. The pages visited are the
+# sidebar options of the checked-out app, so older refs without a page work.
+# Usage: python benchmarks/bench_memory.py [--dataset x1] [--sessions 8] [--ref HEAD~1]
+import argparse
+import gc
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+
+
+def rss_bytes():
+    """Current (not peak) resident set size."""
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def child(app_dir, sessions, repeats, timeout):
+    from streamlit.testing.v1 import AppTest
+
+    def visit_all():
+        at = AppTest.from_file(str(Path(app_dir) / "app.py"), default_timeout=timeout).run()
+        for page in at.sidebar.radio[0].options[1:]:
+            at.sidebar.radio[0].set_value(page).run()
+            if at.exception:
+                raise RuntimeError(f"{page}: {at.exception[0].value}")
+        return at
+
+    gc.collect()
+    rss_start = rss_bytes()
+    first = visit_all()
+    gc.collect()
+    rss_shared = rss_bytes()
+    pages = first.sidebar.radio[0].options
+
+    tracemalloc.start()
+    gc.collect()
+    held_before, _ = tracemalloc.get_traced_memory()
+    others = [visit_all() for _ in range(sessions)]
+    gc.collect()
+    held_after, _ = tracemalloc.get_traced_memory()
+
+    rerun = {}
+    for page in pages:
+        first.sidebar.radio[0].set_value(page).run()  # switch, then measure warm reruns
+        peaks = []
+        for _ in range(repeats):
+            gc.collect()
+            tracemalloc.reset_peak()
+            base, _ = tracemalloc.get_traced_memory()
+            first.run()
+            peaks.append(tracemalloc.get_traced_memory()[1] - base)
+        rerun[page] = statistics.median(peaks)
+    tracemalloc.stop()
+
+    print(json.dumps({
+        "shared_bytes": rss_shared - rss_start,
+        "per_session_bytes": (held_after - held_before) / max(sessions, 1),
+        "rerun_peak_bytes": rerun,
+        "sessions": len(others) + 1,
+    }))
+
+
+def measure(app_dir, data_dir, args):
+    env = dict(os.environ, PYTHONPATH=str(app_dir))
+    if data_dir is not None:
+        env["SDG7_DATA_DIR"] = str(data_dir)
+    out = subprocess.run([sys.executable, __file__, "--child", str(app_dir), "--sessions", str(args.sessions),
+                          "--repeats", str(args.repeats),
+                          "--timeout", str(args.timeout)],
+                         env=env, cwd=app_dir, capture_output=True, text=True)
+    if out.returncode:
+        raise RuntimeError(out.stderr.strip().splitlines()[-1])
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--dataset", default="x1", help="x1 (real data), x10 or x100")
+    parser.add_argument("--sessions", type=int, default=8, help="Extra sessions kept alive")
+    parser.add_argument("--repeats", type=int, default=5, help="Warm reruns measured per page")
+    parser.add_argument("--ref", help="Also measure this commit (e.g. HEAD~1) for comparison")
+    parser.add_argument("--timeout", type=float, default=600)
+    parser.add_argument("--child")
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child, args.sessions, args.repeats, args.timeout)
+        return
+
+    # Imported here: bench_pages puts this checkout's sdg7 first on sys.path,
+    # which the children measuring another worktree must not inherit
+    from bench_pages import DATASETS, prepare
+
+    if args.dataset not in DATASETS:
+        parser.error(f"--dataset must be one of {list(DATASETS)}")
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = None if args.dataset == "x1" else prepare(args.dataset, tmp)
+        if args.ref:
+            worktree = Path(tmp) / "ref"
+            subprocess.run(["git", "worktree", "add", "--detach", str(worktree), args.ref],
+                           cwd=ROOT_DIR, check=True, capture_output=True)
+            try:
+                results[args.ref] = measure(worktree, data_dir, args)
+            finally:
+                subprocess.run(["git", "worktree", "remove", "--force", str(worktree)], cwd=ROOT_DIR)
+        results["working tree"] = measure(ROOT_DIR, data_dir, args)
+
+    mib = 2 ** 20
+    for name, result in results.items():
+        print(f"{name}:")
+        print(f"  shared (first session)  {result['shared_bytes'] / mib:8.1f} MiB")
+        print(f"  per extra session       {result['per_session_bytes'] / mib:8.2f} MiB held")
+        for page, peak in result["rerun_peak_bytes"].items():
+            print(f"  rerun {page:18s}  {peak / mib:8.2f} MiB allocated at peak")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+# Benchmark: model zoo wall-clock time vs process pool size
+#
+# Every worker count starts from an empty artifact cache; the last line is a
+# re-run on the warm cache (nothing retrained). A subset of countries keeps
+# the single-worker run short.
+# Usage: python benchmarks/bench_model_zoo.py [--countries 40] [--workers 1 2 4 8]
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sdg7.config import PROCESSED_CSV  # noqa: E402
+from sdg7.model_zoo import run  # noqa: E402
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--countries", type=int, default=40)
+    parser.add_argument("--workers", type=int, nargs="+", default=None)
+    parser.add_argument("--threads-per-worker", type=int, default=1)
+    args = parser.parse_args()
+
+    cpus = os.cpu_count()
+    worker_counts = args.workers or sorted({1, 2, 4, cpus})
+    df = pd.read_csv(PROCESSED_CSV)
+    df = df[df["country"].isin(df["country"].unique()[:args.countries])]
+    print(f"{df['country'].nunique()} countries, {cpus} CPUs, {args.threads_per_worker} thread(s) per worker")
+
+    baseline = None
+    with tempfile.TemporaryDirectory() as tmp:
+        for workers in worker_counts:
+            artifact_dir = Path(tmp) / f"workers-{workers}"
+            elapsed, (df_results, n_trained) = timed(run, df, workers=workers, artifact_dir=artifact_dir,
+                                                     threads_per_worker=args.threads_per_worker)
+            baseline = baseline or elapsed
+            print(f"  {workers:3d} workers {elapsed:8.2f} s ({n_trained} fits, speed-up x{baseline / elapsed:.2f})")
+        elapsed, (_, n_trained) = timed(run, df, workers=worker_counts[-1], artifact_dir=artifact_dir)
+        print(f"  warm cache {elapsed:8.2f} s ({n_trained} fits)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+# Benchmark: render time of every app.py page and its main widget interactions
+#
+# The app is driven headlessly with streamlit.testing.v1.AppTest, once on the
+# real data and once per synthetic dataset generated from the processed CSV:
+#   x10  - every country copied 10 times (with a suffix and a little noise)
+#   x100 - the x10 entities at monthly granularity (year + month / 12, values
+#          interpolated between the yearly rows), ~110x the rows
+# Each dataset runs in a fresh interpreter with SDG7_DATA_DIR pointing at it,
+# so "cold" steps include data loading and cache builds; "warm" steps are
+# reruns of the same page on the populated caches (median of --repeats).
+# Results are written as JSON, tagged with the current commit.
+# Usage: python benchmarks/bench_pages.py [--datasets x1 x10 x100] [--output benchmarks/results/bench_pages.json]
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+RESULTS_DIR = ROOT_DIR / "benchmarks" / "results"  # not committed
+sys.path.insert(0, str(ROOT_DIR))
+
+from sdg7.config import DATA_DIR, PROCESSED_CSV  # noqa: E402
+from sdg7.countries import COUNTRIES_CSV  # noqa: E402
+
+DATASETS = {"x1": (1, False), "x10": (10, False), "x100": (10, True)}
+PAGES = ["Quick Summary", "Dashboard", "Predictions", "What-if Scenarios", "Country Overview", "Hypotheses"]
+
+
+def scale_entities(df, factor, seed=0):
+    """Every country `factor` times; copies get a suffix and ±1% noise."""
+    import numpy as np
+    import pandas as pd
+
+    rng = np.random.default_rng(seed)
+    numeric = df.select_dtypes(include="number").columns.drop("year")
+    copies = [df]
+    for i in range(1, factor):
+        df_copy = df.copy()
+        df_copy["country"] = df_copy["country"] + f" #{i:02d}"
+        df_copy[numeric] = df_copy[numeric] * rng.normal(1, 0.01, size=(len(df_copy), len(numeric)))
+        copies.append(df_copy)
+    return pd.concat(copies, ignore_index=True).sort_values(["country", "year"], kind="stable")
+
+
+def scale_countries(df_countries, factor):
+    """Country table rows for the scale_entities() copies (ISO3 code + copy number)."""
+    import pandas as pd
+
+    copies = [df_countries]
+    for i in range(1, factor):
+        df_copy = df_countries.copy()
+        df_copy["name"] = df_copy["name"] + f" #{i:02d}"
+        df_copy["iso3"] = df_copy["iso3"] + f"{i:02d}"
+        df_copy["aliases"] = ""
+        copies.append(df_copy)
+    return pd.concat(copies, ignore_index=True)
+
+
+def to_monthly(df):
+    """Twelve rows per country and year, linearly interpolated towards the next year."""
+    import numpy as np
+    import pandas as pd
+
+    df = df.sort_values(["country", "year"], kind="stable").reset_index(drop=True)
+    numeric = df.select_dtypes(include="number").columns.drop("year")
+    same_country = df["country"].eq(df["country"].shift(-1)).to_numpy()
+    nxt = df[numeric].shift(-1).to_numpy()
+    cur = df[numeric].to_numpy()
+
+    # The last year of each country only gets its January row
+    months = np.where(same_country, 12, 1)
+    rows = np.repeat(np.arange(len(df)), months)
+    month = np.arange(len(rows)) - np.repeat(np.cumsum(months) - months, months)
+    frac = (month / 12)[:, None]
+    values = cur[rows] * (1 - frac) + np.where(same_country[rows, None], nxt[rows], cur[rows]) * frac
+
+    df_monthly = pd.DataFrame(values, columns=numeric)
+    df_monthly.insert(0, "country", df["country"].to_numpy()[rows])
+    df_monthly.insert(1, "year", df["year"].to_numpy()[rows] + month / 12)
+    return df_monthly[df.columns]
+
+
+def prepare(name, tmp):
+    """Write the dataset into tmp/<name> (CSVs, forecasts and store); returns its data dir."""
+    import pandas as pd
+
+    factor, monthly = DATASETS[name]
+    data_dir = Path(tmp) / name
+    (data_dir / "Processed").mkdir(parents=True)
+    (data_dir / "Predictions").mkdir()
+    (data_dir / "Reference").mkdir()
+    df_countries = pd.read_csv(COUNTRIES_CSV, keep_default_na=False)
+    scale_countries(df_countries, factor).to_csv(data_dir / "Reference" / COUNTRIES_CSV.name, index=False)
+    df = scale_entities(pd.read_csv(PROCESSED_CSV), factor)
+    if monthly:
+        df = to_monthly(df)
+    df.to_csv(data_dir / "Processed" / PROCESSED_CSV.name, index=False)
+
+    env = dict(os.environ, SDG7_DATA_DIR=str(data_dir))
+    for module in ["sdg7.forecast", "sdg7.store"]:
+        subprocess.run([sys.executable, "-m", module], env=env, cwd=ROOT_DIR, check=True, capture_output=True)
+    return data_dir
+
+
+def child(repeats, timeout):
+    """Drive the app through every page and interaction; prints the timings as JSON."""
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(str(ROOT_DIR / "app.py"), default_timeout=timeout)
+    timings = {}
+
+    def step(name, action):
+        start = time.perf_counter()
+        action().run()
+        timings[name] = time.perf_counter() - start
+        if at.exception:
+            raise RuntimeError(f"{name}: {at.exception[0].value}")
+
+    def page(name):
+        return lambda: at.sidebar.radio[0].set_value(name)
+
+    step("startup", lambda: at)
+    for name in PAGES[1:]:
+        step(f"{name} (cold)", page(name))
+
+    step("Dashboard (warm)", page("Dashboard"))
+    countries = at.multiselect(key="electricity_countries")
+    step("Dashboard: add country to time series",
+         lambda: countries.set_value(countries.value + [countries.options[0]]))
+    step("Dashboard: all countries",
+         lambda: countries.set_value(list(countries.options)))
+    step("Dashboard: regional aggregate", lambda: at.radio(key="electricity_view").set_value("Regional aggregate"))
+    step("Dashboard: map year 2000", lambda: at.selectbox[0].set_value(2000))
+    step("Dashboard: map year 2030", lambda: at.selectbox[0].set_value(2030))
+
+    step("Predictions (warm)", page("Predictions"))
+    if "forecast_model" in at.session_state:
+        step("Predictions: best model per series",
+             lambda: at.radio(key="forecast_model").set_value("Best model per series"))
+    step("Predictions: compare countries", lambda: at.multiselect[0].set_value(at.multiselect[0].options[:5]))
+
+    step("What-if Scenarios (warm)", page("What-if Scenarios"))
+    step("What-if Scenarios: regional growth slider",
+         lambda: at.slider(key="scenario_renewable_capacity_per_capita_Africa").set_value(50))
+    step("What-if Scenarios: recent slope basis",
+         lambda: at.radio(key="scenario_basis_co2_emissions_kt").set_value("recent"))
+    step("What-if Scenarios: show CO₂", lambda: at.selectbox(key="scenario_target").set_value("co2_emissions_kt"))
+
+    step("Country Overview (warm)", page("Country Overview"))
+    step("Country Overview: select country", lambda: at.selectbox[0].set_value(at.selectbox[0].options[-1]))
+    step("Country Overview: all-country table metric",
+         lambda: at.selectbox(key="summary_metric").set_value("co2_emissions_kt"))
+
+    step("Hypotheses (warm)", page("Hypotheses"))
+    step("Hypotheses: year 2010", lambda: at.select_slider(key="hypotheses_year").set_value(2010))
+    step("Hypotheses: year 2020", lambda: at.select_slider(key="hypotheses_year").set_value(2020))
+    step("Hypotheses: regional CO₂ change", lambda: at.radio(key="h4_arrow_view").set_value("Regional aggregate"))
+
+    # Steady state: rerun every page on warm caches
+    for name in PAGES:
+        samples = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            at.sidebar.radio[0].set_value(name).run()
+            samples.append(time.perf_counter() - start)
+        timings[f"{name} (rerun)"] = statistics.median(samples)
+    print(json.dumps(timings))
+
+
+def git_commit():
+    out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR, capture_output=True, text=True)
+    return out.stdout.strip() or None
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--datasets", nargs="+", choices=list(DATASETS), default=list(DATASETS))
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--timeout", type=float, default=600, help="Seconds allowed per app run")
+    parser.add_argument("--output", default=str(RESULTS_DIR / "bench_pages.json"))
+    parser.add_argument("--child", action="store_true")
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.repeats, args.timeout)
+        return
+
+    import pandas as pd
+
+    results = {"commit": git_commit(), "created": time.strftime("%Y-%m-%dT%H:%M:%S"), "datasets": {}}
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in args.datasets:
+            data_dir = DATA_DIR if name == "x1" else prepare(name, tmp)
+            env = dict(os.environ, PYTHONPATH=str(ROOT_DIR), SDG7_DATA_DIR=str(data_dir))
+            df = pd.read_csv(data_dir / "Processed" / PROCESSED_CSV.name, usecols=["country"])
+
+            out = subprocess.run([sys.executable, __file__, "--child", "--repeats", str(args.repeats),
+                                  "--timeout", str(args.timeout)],
+                                 env=env, cwd=ROOT_DIR, capture_output=True, text=True)
+            print(f"{name}: {len(df)} rows, {df['country'].nunique()} countries")
+            results["datasets"][name] = {"rows": len(df), "countries": int(df["country"].nunique())}
+            if out.returncode:
+                # Recorded rather than raised, so the other datasets still get timed
+                if out.returncode < 0:
+                    error = f"killed by signal {-out.returncode}"
+                else:
+                    error = (out.stderr.strip().splitlines() or [f"exit code {out.returncode}"])[-1]
+                results["datasets"][name]["error"] = error
+                print(f"  failed: {error}")
+                continue
+            timings = json.loads(out.stdout.strip().splitlines()[-1])
+            results["datasets"][name]["seconds"] = timings
+            for step_name, seconds in timings.items():
+                print(f"  {step_name:45s} {seconds * 1000:9.1f} ms")
+
+    Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+    Path(args.output).write_text(json.dumps(results, indent=2) + "\n")
+    print(f"Results saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+# Benchmark: cold-start load of the CSVs vs the columnar store
+#
+# Every run happens in a fresh interpreter so nothing is cached between them.
+# Usage: python benchmarks/bench_store.py [--runs 5]
+import argparse
+import json
+import resource
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+
+def child(mode):
+    import pandas  # noqa: F401  (imported up front so only the load is timed)
+    from sdg7 import store
+
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    if mode == "csv":
+        df_cleaned, df_pred_2030 = store.load_csv_tables()
+    else:
+        assert store.read_manifest() is not None, "store is missing or stale, run python -m sdg7.store"
+        df_cleaned, df_pred_2030 = store.load_tables()
+    # Touch every column, like the first page render does
+    df_cleaned.sum(numeric_only=True)
+    elapsed = time.perf_counter() - start
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(json.dumps({"seconds": elapsed, "rss_kb": rss_after, "rss_delta_kb": rss_after - rss_before}))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--child", choices=["csv", "store"])
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child)
+        return
+
+    for mode in ["csv", "store"]:
+        results = []
+        for _ in range(args.runs):
+            out = subprocess.run([sys.executable, __file__, "--child", mode], capture_output=True, text=True,
+                                 check=True, cwd=ROOT_DIR)
+            results.append(json.loads(out.stdout.strip().splitlines()[-1]))
+        ms = statistics.median(r["seconds"] for r in results) * 1000
+        rss = statistics.median(r["rss_kb"] for r in results) / 1024
+        delta = statistics.median(r["rss_delta_kb"] for r in results) / 1024
+        print(f"{mode:6s} load {ms:7.1f} ms | peak RSS {rss:6.1f} MiB (+{delta:.1f} MiB for the load)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+# Benchmark: full refit (sdg7.forecast) vs incremental update (sdg7.trend_stats)
+#
+# The processed data is enlarged synthetically (every country copied --scale
+# times with a suffix). The update appends a new year for a few countries,
+# corrects one year of a few others and adds a brand new country.
+# tests/test_trend_stats.py checks the updated predictions, R² and MAE
+# against a full refit.
+# Usage: python benchmarks/bench_trend_stats.py [--scale 10]
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sdg7.config import PROCESSED_CSV, TARGET_VARS  # noqa: E402
+from sdg7.forecast import forecast  # noqa: E402
+from sdg7.trend_stats import TrendStats  # noqa: E402
+
+
+def scale_data(df, factor):
+    copies = []
+    for i in range(factor):
+        df_copy = df.copy()
+        df_copy["country"] = df_copy["country"] + f" #{i:03d}"
+        copies.append(df_copy)
+    return pd.concat(copies, ignore_index=True)
+
+
+def make_update(df, n_changed, seed=0):
+    """New-year rows for n countries, corrected values for n others and one new country.
+
+    Returns (added, removed, updated df).
+    """
+    rng = np.random.default_rng(seed)
+    countries = rng.choice(df["country"].unique(), 2 * n_changed, replace=False)
+    latest = df[df["year"] == df["year"].max()]
+    new_rows = latest[latest["country"].isin(countries[:n_changed])].copy()
+    new_rows["year"] += 1
+    new_rows[TARGET_VARS] = new_rows[TARGET_VARS] * rng.normal(1, 0.05, size=(len(new_rows), len(TARGET_VARS)))
+
+    old_rows = df[df["country"].isin(countries[n_changed:]) & (df["year"] == 2010)]
+    fixed_rows = old_rows.copy()
+    fixed_rows[TARGET_VARS] = fixed_rows[TARGET_VARS] * 1.1
+
+    new_country = df[df["country"] == countries[0]].copy()
+    new_country["country"] = "Aaa New Country"
+
+    added = pd.concat([new_rows, fixed_rows, new_country])
+    df_updated = pd.concat([df.drop(old_rows.index), added], ignore_index=True)
+    return added, old_rows, df_updated
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scale", type=int, default=10)
+    parser.add_argument("--changed", type=int, default=5, help="Countries with new and with corrected rows")
+    args = parser.parse_args()
+
+    df = scale_data(pd.read_csv(PROCESSED_CSV), args.scale)
+    added, removed, df_updated = make_update(df, args.changed)
+    print(f"x{args.scale}: {len(df)} rows, {df['country'].nunique()} countries, "
+          f"{len(added)} rows added, {len(removed)} removed")
+
+    stats = TrendStats.from_data(df)
+    t_full, _ = timed(forecast, df_updated)
+    t_update, touched = timed(stats.update, added, removed, df_current=df_updated)
+    t_predict, _ = timed(stats.predict)
+
+    print(f"  full refit {t_full * 1000:8.1f} ms | update {t_update * 1000:8.1f} ms "
+          f"({len(touched)} series) + predict {t_predict * 1000:6.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
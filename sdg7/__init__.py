@@ -0,0 +1 @@
+# SDG7 data, forecasting and dashboard helpers
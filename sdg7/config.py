@@ -0,0 +1,35 @@
+# Shared paths and constants for the SDG7 project
+import os
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+# SDG7_DATA_DIR points everything at another copy of Data/ (used by the benchmarks)
+DATA_DIR = Path(os.environ.get("SDG7_DATA_DIR", ROOT_DIR / "Data"))
+
+RAW_CSV = DATA_DIR / "Raw" / "global-data-on-sustainable-energy.csv"
+PROCESSED_CSV = DATA_DIR / "Processed" / "global-data-on-sustainable-energy-processed.csv"
+PREDICTIONS_CSV = DATA_DIR / "Predictions" / "predictions_linear_2030.csv"
+
+# Variables forecast per country (see jupyter_notebooks/Model.ipynb)
+TARGET_VARS = [
+    "access_to_electricity",
+    "access_to_clean_fuels",
+    "co2_emissions_kt",
+    "renewable_capacity_per_capita",
+]
+# Percentages are clipped to 0-100, capacity can't be negative
+PERCENT_TARGETS = ["access_to_electricity", "access_to_clean_fuels"]
+NON_NEGATIVE_TARGETS = ["renewable_capacity_per_capita"]
+
+MIN_POINTS = 5
+FORECAST_YEAR = 2030
+# Points a multi-series line chart may send to the browser (see sdg7.downsample)
+CHART_POINT_BUDGET = 2000
+
+# Opt-in rerun instrumentation (see sdg7.metrics): JSON lines to SDG7_METRICS_LOG
+# (stderr if unset), Prometheus text on http://127.0.0.1:SDG7_METRICS_PORT/metrics,
+# and the timings panel in the sidebar when the URL has ?admin=SDG7_ADMIN_TOKEN
+METRICS_ENABLED = os.environ.get("SDG7_METRICS", "") not in ("", "0")
+METRICS_LOG = os.environ.get("SDG7_METRICS_LOG") or None
+METRICS_PORT = int(os.environ.get("SDG7_METRICS_PORT", 9464))
+ADMIN_TOKEN = os.environ.get("SDG7_ADMIN_TOKEN") or None
@@ -0,0 +1,205 @@
+# Batched Pearson/Spearman correlations for every column pair and year
+#
+# All slices (one per year) are stacked into a padded (slice, row, column)
+# array with a validity mask, so Pearson r and p-values for every pair of
+# every slice come out of a few batched matmuls instead of one
+# scipy.stats.pearsonr call per pair and year. Spearman ranks depend on
+# each pair's complete rows, so Spearman and the bootstrap confidence
+# intervals are only computed for the pairs that are shown.
+import zlib
+
+import numpy as np
+import pandas as pd
+from scipy.special import stdtr
+from scipy.stats import rankdata
+
+from sdg7.data_access import year_key
+
+METHODS = ["pearson", "spearman"]
+
+
+def _stack(frames, columns):
+    """Pad the frames into a (n_slices, max_rows, n_columns) array, NaN-filled."""
+    n_rows = max(len(frame) for frame in frames)
+    values = np.full((len(frames), n_rows, len(columns)), np.nan)
+    for i, frame in enumerate(frames):
+        values[i, :len(frame)] = frame[columns].to_numpy(dtype=float)
+    return values
+
+
+def _pearson(values):
+    """Pairwise-complete Pearson r and pair counts over axis -2 of (..., rows, cols)."""
+    mask = np.isfinite(values)
+    # Standardize each column first: r is unchanged but the sums stay well-conditioned
+    count = np.maximum(mask.sum(axis=-2, keepdims=True), 1)
+    mean = np.where(mask, values, 0.0).sum(axis=-2, keepdims=True) / count
+    x = np.where(mask, values - mean, 0.0)
+    scale = np.sqrt((x * x).sum(axis=-2, keepdims=True) / count)
+    x = x / np.where(scale > 0, scale, 1.0)
+    m = mask.astype(float)
+
+    xt = np.swapaxes(x, -1, -2)
+    n = np.swapaxes(m, -1, -2) @ m
+    sx = xt @ m
+    sxx = (xt * xt) @ m
+    sxy = xt @ x
+    sy = np.swapaxes(sx, -1, -2)
+    syy = np.swapaxes(sxx, -1, -2)
+
+    cov = n * sxy - sx * sy
+    var = (n * sxx - sx * sx) * (n * syy - sy * sy)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        r = np.where((var > 0) & (n >= 2), cov / np.sqrt(var), np.nan)
+    return np.clip(r, -1, 1), n
+
+
+def _ranks(values):
+    """Average ranks per column over axis -2."""
+    return rankdata(values, axis=-2)
+
+
+def _correlate(values, method):
+    """r and n over axis -2; Spearman only takes complete rows (ranks are per pair of columns)."""
+    if method == "spearman":
+        if np.isnan(values).any():
+            raise ValueError("Spearman correlation needs complete rows: rank each pair over its complete rows")
+        values = _ranks(values)
+    return _pearson(values)
+
+
+def p_values(r, n):
+    """Two-sided p-value of r under the t distribution with n - 2 dof (as pearsonr)."""
+    dof = n - 2
+    with np.errstate(invalid="ignore", divide="ignore"):
+        t = r * np.sqrt(dof / np.maximum(1 - r * r, 0))
+        p = 2 * stdtr(dof, -np.abs(t))
+    return np.where(dof > 0, p, np.nan)
+
+
+def _bootstrap(values, method, n_boot, confidence, rng, max_chunk_bytes=128 * 2**20):
+    """Percentile bootstrap CI of r for one column pair -> (low, high).
+
+    values is the (rows, 2) array of the pair's complete rows. Resamples are
+    drawn in chunks whose float64 copy stays under max_chunk_bytes, so long
+    (e.g. monthly x100) panels don't exhaust memory.
+    """
+    n_rows = len(values)
+    if n_rows < 3:
+        return np.nan, np.nan
+    chunk_size = int(np.clip(max_chunk_bytes // (values.size * 8), 1, n_boot))
+    samples = []
+    for start in range(0, n_boot, chunk_size):
+        idx = rng.integers(0, n_rows, (min(chunk_size, n_boot - start), n_rows))
+        r, _ = _correlate(values[idx], method)
+        samples.append(r[:, 0, 1])
+    alpha = (1 - confidence) / 2
+    with np.errstate(invalid="ignore"):
+        low, high = np.nanquantile(np.concatenate(samples), [alpha, 1 - alpha])
+    return low.item(), high.item()
+
+
+def _label_seed(label):
+    """Stable integer of a slice or column label, so a pair's draws don't depend on the other slices and columns."""
+    return zlib.crc32(repr(label).encode())
+
+
+class CorrelationCube:
+    """r, p-value and bootstrap CI for every (slice, column, column) triple.
+
+    Slices are usually years; arrays are indexed [slice, column, column].
+    Pearson r, p and n of every pair come out of the batched matmuls up
+    front. Spearman is computed when a pair is asked for: with gaps, each
+    pair has to be ranked over its own complete rows. The bootstrap CI is
+    also computed on demand, on the pair's complete rows, from its own random
+    stream (seeded by seed, slice label and column names). Both are kept.
+    """
+
+    def __init__(self, frames, columns, n_boot=200, confidence=0.95, seed=0):
+        self.labels = list(frames)
+        self.columns = list(columns)
+        self.n_boot = n_boot
+        self.confidence = confidence
+        self.seed = seed
+        self._pos = {label: i for i, label in enumerate(self.labels)}
+        self._col = {col: i for i, col in enumerate(self.columns)}
+
+        self._values = _stack([frames[label] for label in self.labels], self.columns)
+        r, n = _pearson(self._values)
+        self.stats = {"pearson": {"r": r, "p": p_values(r, n), "n": n}}
+        self._spearman = {}
+        self._intervals = {}
+
+    @classmethod
+    def from_years(cls, df, columns=None, **kwargs):
+        """One slice per year of a long country/year frame."""
+        if columns is None:
+            columns = [c for c in df.select_dtypes(include="number").columns if c != "year"]
+        frames = {year_key(year): frame for year, frame in df.groupby("year")}
+        return cls(frames, columns, **kwargs)
+
+    def interval(self, x, y, label, method="pearson"):
+        """Bootstrap CI (low, high) of r for one column pair in one slice."""
+        i, j = sorted((self._col[x], self._col[y]))
+        key = (method, label, i, j)
+        if key not in self._intervals:
+            if not self.n_boot or i == j:
+                self._intervals[key] = (np.nan, np.nan)
+            else:
+                rng = np.random.default_rng([self.seed, _label_seed(label), _label_seed(self.columns[i]),
+                                             _label_seed(self.columns[j]), METHODS.index(method)])
+                self._intervals[key] = _bootstrap(self._complete_rows(label, i, j), method, self.n_boot,
+                                                  self.confidence, rng)
+        return self._intervals[key]
+
+    def _complete_rows(self, label, i, j):
+        """(rows, 2) values of columns i and j where both are present."""
+        values = self._values[self._pos[label]][:, [i, j]]
+        return values[np.isfinite(values).all(axis=1)]
+
+    def _ranked(self, label, i, j):
+        """Spearman r, p and n of columns i <= j in one slice."""
+        key = (label, i, j)
+        if key not in self._spearman:
+            r, n = _correlate(self._complete_rows(label, i, j), "spearman")
+            r, n = r[0, 1], n[0, 1]
+            self._spearman[key] = {"r": r.item(), "p": p_values(r, n).item(), "n": n.item()}
+        return self._spearman[key]
+
+    def matrix(self, label, method="pearson", stat="r"):
+        """Column x column DataFrame of one statistic (r, p or n) for one slice."""
+        if method == "pearson":
+            values = self.stats[method][stat][self._pos[label]]
+        else:
+            values = np.array([[self._ranked(label, *sorted((i, j)))[stat] for j in range(len(self.columns))]
+                               for i in range(len(self.columns))])
+        return pd.DataFrame(values, index=self.columns, columns=self.columns)
+
+    def pair(self, x, y, label, method="pearson", ci=True):
+        """Statistics of one column pair: dict with r, p, n and, with ci, low and high."""
+        s, i, j = self._pos[label], self._col[x], self._col[y]
+        if method == "pearson":
+            stats = {stat: values[s, i, j].item() for stat, values in self.stats[method].items()}
+        else:
+            stats = dict(self._ranked(label, *sorted((i, j))))
+        if ci:
+            stats["low"], stats["high"] = self.interval(x, y, label, method)
+        return stats
+
+    def series(self, x, y, method="pearson", ci=True):
+        """One column pair across all slices as a DataFrame indexed by label."""
+        return pd.DataFrame([self.pair(x, y, label, method, ci) for label in self.labels],
+                            index=pd.Index(self.labels, name="slice"))
+
+
+def growth_frames(df, columns, base_year):
+    """Per-country change of `columns` from base_year to every later year.
+
+    Returns {year: frame indexed by country}, countries missing either year dropped.
+    """
+    wide = df.pivot(index="country", columns="year", values=columns)
+    base = wide.xs(base_year, axis=1, level="year")
+    frames = {}
+    for year in sorted(wide.columns.get_level_values("year").unique()):
+        if year > base_year:
+            frames[year_key(year)] = (wide.xs(year, axis=1, level="year") - base).dropna()
+    return frames
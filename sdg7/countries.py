@@ -0,0 +1,81 @@
+# Country dimension table: ISO3 code, region, sub-region, canonical name, aliases
+#
+# Data/Reference/countries.csv replaces the inline country -> continent dict.
+# Country names in the data are resolved through it (canonical name or
+# alias) when the tables are loaded, so an unknown or misspelt name fails
+# loudly instead of silently dropping out of regional charts and maps.
+# Regions are the continents used across the dashboard; sub-regions follow
+# the UN M49 geoscheme.
+import pandas as pd
+
+from sdg7.config import DATA_DIR
+
+COUNTRIES_CSV = DATA_DIR / "Reference" / "countries.csv"
+COLUMNS = ["iso3", "name", "region", "sub_region", "aliases"]
+ALIAS_SEPARATOR = "|"
+
+
+def load_countries(path=COUNTRIES_CSV):
+    """The dimension table, validated; aliases as lists."""
+    df_countries = pd.read_csv(path, keep_default_na=False, na_values=[""])
+    df_countries["aliases"] = df_countries["aliases"].fillna("").map(
+        lambda aliases: [alias for alias in aliases.split(ALIAS_SEPARATOR) if alias])
+    validate_countries(df_countries)
+    return df_countries
+
+
+def validate_countries(df_countries):
+    """Raise ValueError if the table has missing fields, duplicate codes or ambiguous names."""
+    problems = []
+    missing = [col for col in COLUMNS if col not in df_countries.columns]
+    if missing:
+        raise ValueError(f"Country table is missing columns: {missing}")
+    for col in ["iso3", "name", "region", "sub_region"]:
+        empty = df_countries.loc[df_countries[col].isna(), "name"].tolist()
+        if empty:
+            problems.append(f"no {col} for {empty}")
+    for col in ["iso3", "name"]:
+        duplicated = df_countries.loc[df_countries[col].duplicated(), col].tolist()
+        if duplicated:
+            problems.append(f"duplicate {col}: {duplicated}")
+
+    # An alias may not point at two countries or shadow another country's name
+    owners = {}
+    for name, aliases in zip(df_countries["name"], df_countries["aliases"]):
+        for alias in [name] + aliases:
+            owners.setdefault(alias.casefold(), set()).add(name)
+    ambiguous = sorted(alias for alias, names in owners.items() if len(names) > 1)
+    if ambiguous:
+        problems.append(f"names/aliases used by several countries: {ambiguous}")
+    if problems:
+        raise ValueError("Invalid country table: " + "; ".join(problems))
+
+
+def name_lookup(df_countries):
+    """{casefolded name or alias: canonical name}."""
+    lookup = {}
+    for name, aliases in zip(df_countries["name"], df_countries["aliases"]):
+        for alias in [name] + aliases:
+            lookup[alias.casefold()] = name
+    return lookup
+
+
+def canonical_names(names, df_countries):
+    """Map data country names to canonical names; raises ValueError on unknown names."""
+    names = pd.Series(names)
+    lookup = name_lookup(df_countries)
+    unique = names.unique()
+    mapping = {name: lookup.get(str(name).casefold()) for name in unique}
+    unknown = sorted(str(name) for name, canonical in mapping.items() if canonical is None)
+    if unknown:
+        raise ValueError(f"Countries not in {COUNTRIES_CSV.name} (add them or an alias): {unknown}")
+    return names.map(mapping)
+
+
+def add_country_columns(df, df_countries, columns=("iso3", "region", "sub_region")):
+    """Canonicalize df["country"] and add the dimension columns (in place)."""
+    df["country"] = canonical_names(df["country"], df_countries).to_numpy()
+    dim = df_countries.set_index("name")
+    for col in columns:
+        df[col] = df["country"].map(dim[col])
+    return df
@@ -0,0 +1,125 @@
+# Precomputed slices of the processed data shared by all dashboard pages
+#
+# Built once per data version (see store.data_version) and cached with
+# st.cache_resource, so pages look slices up instead of scanning df_cleaned
+# with boolean masks on every rerun. Returned frames are shared between
+# sessions and read-only: the columns pages used to add per rerun
+# (DERIVED_COLUMNS, combined["clean_growth"]) are computed here once, and
+# df_cleaned keeps the read-only memory-mapped arrays of the store.
+import numpy as np
+import pandas as pd
+
+from sdg7.store import load_country_index
+
+COMBINED_COLUMNS = ["access_to_electricity", "access_to_clean_fuels", "co2_emissions_kt"]
+DERIVED_COLUMNS = ["difference", "gdp_quartile", "co2_quartile"]
+CO2_QUARTILE_LABELS = ["Q1 (Low)", "Q2", "Q3", "Q4 (High)"]
+
+
+def year_key(year):
+    """Lookup key of a year value: 2020.0 -> 2020, sub-annual values stay floats."""
+    year = float(year)
+    return int(year) if year.is_integer() else year
+
+
+def _quartile_codes(values):
+    """0-3 quartile of each value within its year (NaN if the year can't be split)."""
+    try:
+        return pd.qcut(values, q=4, labels=False)
+    except ValueError:
+        return pd.Series(np.nan, index=values.index)
+
+
+def _quartile_labels(values):
+    """qcut interval labels ("(a, b]") within one year, as strings."""
+    try:
+        return pd.qcut(values, q=4).astype(str)
+    except ValueError:
+        return pd.Series("nan", index=values.index)
+
+
+def derived_columns(df_cleaned):
+    """DERIVED_COLUMNS of every row; quartiles are taken within each year.
+
+    co2_quartile holds CO2_QUARTILE_LABELS as strings rather than a Categorical:
+    plotly groups by it without observed=, which pandas warns about for
+    categoricals. Charts keep the label order with category_orders.
+    """
+    by_year = df_cleaned.groupby("year")
+    co2_codes = by_year["co2_emissions_kt"].transform(_quartile_codes)
+    co2_labels = np.array([*CO2_QUARTILE_LABELS, np.nan], dtype=object)
+    return pd.DataFrame({
+        "difference": df_cleaned["access_to_electricity"] - df_cleaned["renewable_capacity_per_capita"],
+        "gdp_quartile": by_year["gdp_per_capita"].transform(_quartile_labels),
+        "co2_quartile": co2_labels[co2_codes.fillna(-1).astype(int).to_numpy()],
+    }, index=df_cleaned.index)
+
+
+class DataIndex:
+    def __init__(self, df_cleaned, df_pred_2030, version=None):
+        self.version = version
+        # Column by column with copy=False, so the store's memory-mapped arrays aren't consolidated
+        df_derived = derived_columns(df_cleaned)
+        df_cleaned = pd.DataFrame({**{col: df_cleaned[col].array for col in df_cleaned.columns},
+                                   **{col: df_derived[col].array for col in df_derived.columns}},
+                                  index=df_cleaned.index, copy=False)
+        self.df_cleaned = df_cleaned
+        self.df_pred_2030 = df_pred_2030
+
+        # Rows of each country are contiguous: df_cleaned is sorted by (country, year)
+        countries, offsets = load_country_index(df_cleaned)
+        self.country_names = countries
+        self._country_pos = {country: i for i, country in enumerate(countries)}
+        self._offsets = np.asarray(offsets)
+        self._year_values = df_cleaned["year"].to_numpy()
+
+        self._year_rows = {year_key(year): rows for year, rows in df_cleaned.groupby("year").indices.items()}
+        self._year_frames = {year: df_cleaned.iloc[rows] for year, rows in self._year_rows.items()}
+        self.combined = self.combine(df_pred_2030)
+
+    def combine(self, df_pred):
+        """2020 actuals next to a wide predictions frame, one row per country, with the clean fuel growth."""
+        df_2020 = self.year(2020)[["country"] + COMBINED_COLUMNS]
+        df_2020.columns = ["country"] + [f"{col}_2020" for col in COMBINED_COLUMNS]
+        df_combined = pd.merge(df_2020, df_pred, on="country")
+        df_combined["clean_growth"] = df_combined["access_to_clean_fuels"] - df_combined["access_to_clean_fuels_2020"]
+        return df_combined
+
+    def year(self, year):
+        """All countries for one year (empty frame if the year is not in the data)."""
+        frame = self._year_frames.get(year_key(year))
+        return frame if frame is not None else self.df_cleaned.iloc[:0]
+
+    def years(self, years):
+        """All countries for several years, in (country, year) order."""
+        rows = [self._year_rows[year_key(y)] for y in years if year_key(y) in self._year_rows]
+        if not rows:
+            return self.df_cleaned.iloc[:0]
+        return self.df_cleaned.iloc[np.sort(np.concatenate(rows))]
+
+    def _country_range(self, country):
+        pos = self._country_pos.get(country)
+        if pos is None:
+            return 0, 0
+        return self._offsets[pos], self._offsets[pos + 1]
+
+    def country(self, country):
+        """Every year of one country."""
+        start, end = self._country_range(country)
+        return self.df_cleaned.iloc[start:end]
+
+    def countries(self, countries):
+        """Every year of the selected countries, in (country, year) order."""
+        ranges = sorted(self._country_range(c) for c in set(countries))
+        rows = [np.arange(start, end) for start, end in ranges]
+        if not rows:
+            return self.df_cleaned.iloc[:0]
+        return self.df_cleaned.iloc[np.concatenate(rows)]
+
+    def country_year(self, country, year):
+        """The row of one country and year as a (possibly empty) frame."""
+        start, end = self._country_range(country)
+        pos = start + np.searchsorted(self._year_values[start:end], year)
+        if pos < end and self._year_values[pos] == year:
+            return self.df_cleaned.iloc[pos:pos + 1]
+        return self.df_cleaned.iloc[:0]
@@ -0,0 +1,114 @@
+# Point budgets and regional aggregates for multi-series line charts
+#
+# Line charts send every (x, y) pair of every trace to the browser, so
+# payload and client render time grow with series count and resolution.
+# downsample() trims each series to its share of a point budget (min-max
+# bucketing, vectorized over all series at once, or LTTB per series) and
+# regional_bands() collapses countries into their region with a mean line
+# and a quantile band per x value.
+import numpy as np
+import pandas as pd
+
+from sdg7.config import CHART_POINT_BUDGET
+
+METHODS = ["minmax", "lttb"]
+# Series are never trimmed below this many points
+MIN_POINTS_PER_SERIES = 4
+
+
+def _minmax_keep(codes, y, budget):
+    """Mask of rows kept by min-max bucketing; rows are sorted by (series, x), y has no NaN.
+
+    Each series of more than `budget` points is cut into budget // 2 - 1
+    equal-count buckets; the first and last point plus the min and max of
+    every bucket are kept.
+    """
+    n = len(codes)
+    starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+    counts = np.diff(np.r_[starts, n])
+    series = np.repeat(np.arange(len(starts)), counts)
+    pos = np.arange(n) - starts[series]
+    size = counts[series]
+
+    n_buckets = max(budget // 2 - 1, 1)
+    bucket = pos * n_buckets // size
+    key = series * n_buckets + bucket
+
+    order = np.lexsort((y, key))
+    key_sorted = key[order]
+    first = np.r_[True, key_sorted[1:] != key_sorted[:-1]]
+    last = np.r_[key_sorted[1:] != key_sorted[:-1], True]
+    keep = np.zeros(n, dtype=bool)
+    keep[order[first | last]] = True
+    keep[starts] = True
+    keep[starts + counts - 1] = True
+    # Short series are left untouched
+    keep |= size <= budget
+    return keep
+
+
+def lttb_indices(x, y, n_out):
+    """Largest-Triangle-Three-Buckets: indices of the n_out points of one series to keep."""
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    kept = np.empty(n_out, dtype=int)
+    kept[0], kept[-1] = 0, n - 1
+    prev = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        # Average of the next bucket (the last point for the final bucket)
+        nxt_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x, avg_y = x[end:nxt_end].mean(), y[end:nxt_end].mean()
+        area = np.abs((x[prev] - avg_x) * (y[start:end] - y[prev])
+                      - (x[prev] - x[start:end]) * (avg_y - y[prev]))
+        prev = start + int(np.argmax(area))
+        kept[i + 1] = prev
+    return kept
+
+
+def downsample(df, x, y, by=None, max_points=CHART_POINT_BUDGET, method="minmax"):
+    """Rows of df to plot so the chart stays within about max_points points.
+
+    The budget is shared evenly between the series (`by` groups), with at
+    least MIN_POINTS_PER_SERIES each. Frames already within budget are
+    returned unchanged. Other columns (for hover, colour) are kept; missing
+    y values are dropped from trimmed frames.
+    """
+    if len(df) <= max_points:
+        return df
+    if method not in METHODS:
+        raise ValueError(f"Unknown method {method!r}, expected one of {METHODS}")
+
+    df = df[df[y].notna()].sort_values([by, x] if by else [x], kind="stable")
+    codes = pd.factorize(df[by])[0] if by else np.zeros(len(df), dtype=int)
+    n_series = codes.max() + 1
+    budget = max(max_points // n_series, MIN_POINTS_PER_SERIES)
+
+    if method == "minmax":
+        return df[_minmax_keep(codes, df[y].to_numpy(dtype=float), budget)]
+
+    xs = df[x].to_numpy(dtype=float)
+    ys = df[y].to_numpy(dtype=float)
+    starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+    ends = np.r_[starts[1:], len(df)]
+    rows = [start + lttb_indices(xs[start:end], ys[start:end], budget) for start, end in zip(starts, ends)]
+    return df.iloc[np.concatenate(rows)]
+
+
+def regional_bands(df, x, y, region="region", quantiles=(0.25, 0.75)):
+    """Mean, quantile band and country count of `y` per region and x value.
+
+    Returns a long frame with columns region, x, mean, low, high, countries.
+    Rows without a region are left out.
+    """
+    grouped = df.dropna(subset=[region, y]).groupby([region, x], sort=True)[y]
+    low, high = quantiles
+    bands = pd.DataFrame({
+        "mean": grouped.mean(),
+        "low": grouped.quantile(low),
+        "high": grouped.quantile(high),
+        "countries": grouped.count(),
+    })
+    return bands.reset_index()
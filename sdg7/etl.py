@@ -0,0 +1,295 @@
+# Raw -> processed ETL (scripted version of jupyter_notebooks/SDG7.ipynb)
+#
+# Reads the raw Kaggle CSV in chunks, renames/cleans/drops columns like the
+# notebook, interpolates, and writes the processed CSV atomically. The
+# notebook's interpolation is reproduced exactly: a linear interpolation over
+# the (country, year)-sorted rows, which also bridges gaps across neighbouring
+# countries, followed by a per-country interpolation for what is left.
+#
+# Incremental mode keeps a per-country hash of the raw rows next to the
+# output. Only countries whose raw rows changed, plus the countries sharing an
+# interpolation gap with them, are reprocessed; every other country is copied
+# from the previous output.
+import argparse
+import csv
+import itertools
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from sdg7.config import PROCESSED_CSV, RAW_CSV
+
+ETL_VERSION = 1
+
+RENAME_COLUMNS = {
+    "Entity": "country",
+    "Access to electricity (% of population)": "access_to_electricity",
+    "Access to clean fuels for cooking": "access_to_clean_fuels",
+    "Renewable-electricity-generating-capacity-per-capita": "renewable_capacity_per_capita",
+    "Financial flows to developing countries (US $)": "financial_flows",
+    "Renewable energy share in the total final energy consumption (%)": "renewable_energy_share",
+    "Electricity from fossil fuels (TWh)": "fossil_electricity",
+    "Electricity from nuclear (TWh)": "nuclear_electricity",
+    "Electricity from renewables (TWh)": "renewable_electricity",
+    "Low-carbon electricity (% electricity)": "low_carbon_electricity_pct",
+    "Primary energy consumption per capita (kWh/person)": "primary_energy_per_capita",
+    "Energy intensity level of primary energy (MJ/$2017 PPP GDP)": "energy_intensity",
+    "Value_co2_emissions_kt_by_country": "co2_emissions_kt",
+}
+DROP_COLUMNS = ["density", "land_areakm2", "latitude", "longitude", "renewables_%_equivalent_primary_energy",
+                "financial_flows", "nuclear_electricity"]
+
+
+def manifest_path(output):
+    return Path(output).with_suffix(".manifest.json")
+
+
+def clean_names(columns):
+    """Processed name of every raw column, as the notebook renames them."""
+    names = pd.Index(columns).map(lambda c: RENAME_COLUMNS.get(c, c))
+    names = (names.str.strip().str.lower().str.replace("\n", "_").str.replace(" ", "_")
+             .str.replace("(", "").str.replace(")", ""))
+    return names.map(lambda c: "density" if c == "density\\np/km2" else c)
+
+
+def clean_columns(df):
+    """Rename, normalize and drop columns as in the notebook."""
+    df = df.set_axis(clean_names(df.columns), axis=1)
+    return df.drop(columns=[c for c in DROP_COLUMNS if c in df.columns])
+
+
+def read_raw(path=RAW_CSV, chunksize=50_000):
+    """Read and clean the raw CSV chunk by chunk, sorted by (country, year)."""
+    # Only parse the columns that survive the cleaning step
+    header = pd.read_csv(path, encoding="latin1", nrows=0).columns
+    usecols = [raw for raw, name in zip(header, clean_names(header)) if name not in DROP_COLUMNS]
+    reader = pd.read_csv(path, encoding="latin1", usecols=usecols, chunksize=chunksize)
+    df = pd.concat([clean_columns(chunk) for chunk in reader], ignore_index=True)
+    return df.sort_values(["country", "year"], kind="stable").reset_index(drop=True)
+
+
+def interpolate_groups(df, columns, key="country"):
+    """Linear interpolation within each group (edges take the nearest value), vectorized.
+
+    Same result as groupby(key).apply(lambda g: g.interpolate(limit_direction="both")):
+    like pandas' 'linear' method it uses the row position, not the index.
+    """
+    values = df[columns]
+    groups = df[key]
+    pos = pd.DataFrame(np.where(values.notna(), np.arange(len(df))[:, None], np.nan),
+                       index=df.index, columns=columns)
+    prev_pos = pos.groupby(groups).ffill()
+    next_pos = pos.groupby(groups).bfill()
+    prev_val = values.groupby(groups).ffill()
+    next_val = values.groupby(groups).bfill()
+
+    rows = pd.Series(np.arange(len(df)), index=df.index)
+    span = next_pos - prev_pos
+    weight = prev_pos.rsub(rows, axis=0) / span.where(span > 0)
+    interpolated = prev_val + weight * (next_val - prev_val)
+    filled = values.fillna(interpolated).fillna(prev_val).fillna(next_val)
+
+    out = df.copy()
+    out[columns] = filled
+    return out
+
+
+def _interpolate_rows(df):
+    """The notebook's first pass: linear interpolation over rows, across countries."""
+    columns = [c for c in df.columns if c != "country"]
+    df = df.copy()
+    df[columns] = df[columns].interpolate(method="linear")
+    return df
+
+
+def process(df):
+    """Interpolate a (country, year)-sorted cleaned frame like the notebook."""
+    columns = [c for c in df.columns if c != "country"]
+    return interpolate_groups(_interpolate_rows(df), columns)
+
+
+def dependents(df):
+    """Pairs of countries whose processed values depend on each other's raw rows.
+
+    A missing value is filled from the previous and next valid values of its
+    column, which may sit in other countries; every country touched by such a
+    gap (including the ones holding its two bounds) depends on the others.
+    Returns a frame of (country, dependent) pairs, both directions included.
+    """
+    countries = df["country"].to_numpy()
+    runs = []
+    positions = np.arange(len(df))
+    for i, col in enumerate(df.columns.drop("country")):
+        valid = df[col].notna().to_numpy()
+        if valid.all():
+            continue
+        prev_valid = np.maximum.accumulate(np.where(valid, positions, -1))
+        next_valid = np.minimum.accumulate(np.where(valid, positions, len(df))[::-1])[::-1]
+        gap = np.flatnonzero(~valid)
+        # Gap rows of one run share their previous valid row; key runs per column
+        run_id = i * (len(df) + 1) + prev_valid[gap] + 1
+        # Each gap row links its own country with both bounds of its run
+        members = np.concatenate([gap, np.maximum(prev_valid[gap], 0), np.minimum(next_valid[gap], len(df) - 1)])
+        runs.append(pd.DataFrame({
+            "run": np.tile(run_id, 3),
+            "country": countries[members],
+        }))
+    if not runs:
+        return pd.DataFrame({"country": [], "dependent": []}, dtype=object)
+    runs = pd.concat(runs).drop_duplicates()
+    pairs = runs.merge(runs, on="run")
+    pairs = pairs[pairs["country_x"] != pairs["country_y"]].drop_duplicates(["country_x", "country_y"])
+    return pd.DataFrame({"country": pairs["country_x"].to_numpy(), "dependent": pairs["country_y"].to_numpy()})
+
+
+def country_hashes(df):
+    """Order-independent hash of each country's raw rows."""
+    row_hash = pd.util.hash_pandas_object(df, index=False)
+    return row_hash.groupby(df["country"].to_numpy()).sum().astype(str).to_dict()
+
+
+def write_atomic(text, output):
+    """Write to a temporary file next to `output`, then rename it into place."""
+    output = Path(output)
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{output.name}.", dir=output.parent)
+    try:
+        with os.fdopen(fd, "w", newline="") as tmp_file:
+            tmp_file.write(text)
+        # mkstemp creates the file as 0600; keep the permissions of the file being replaced
+        if output.exists():
+            shutil.copymode(output, tmp_name)
+        else:
+            os.chmod(tmp_name, 0o644)
+        os.replace(tmp_name, output)
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
+
+
+def _first_field(line):
+    if line.startswith('"'):
+        return next(csv.reader([line]))[0]
+    return line[:line.index(",")]
+
+
+def _splice_csv(previous_csv, reprocessed, keep):
+    """CSV text of the previous output's `keep` countries merged with the reprocessed rows.
+
+    Kept rows are copied as text, so they are neither parsed nor reformatted.
+    Returns None if the previous output has different columns.
+    """
+    header, *lines = Path(previous_csv).read_text().splitlines(keepends=True)
+    if header != reprocessed.iloc[:0].to_csv(index=False):
+        return None
+    blocks = {}
+    for country, group in itertools.groupby(lines, key=_first_field):
+        if country in keep:
+            blocks[country] = "".join(group)
+    new_lines = reprocessed.to_csv(index=False, header=False).splitlines(keepends=True)
+    for country, group in itertools.groupby(new_lines, key=_first_field):
+        blocks[country] = "".join(group)
+    return header + "".join(blocks[country] for country in sorted(blocks))
+
+
+def _affected_countries(hashes, deps, previous):
+    """Countries that must be reprocessed given the previous run's manifest."""
+    changed = {c for c, h in hashes.items() if previous["countries"].get(c) != h}
+    removed = set(previous["countries"]) - set(hashes)
+    affected = changed | set(deps.loc[deps["country"].isin(changed), "dependent"])
+    # Gaps that used to touch a changed or removed country have moved as well
+    old_deps = pd.DataFrame(previous["dependents"])
+    affected |= set(old_deps.loc[old_deps["country"].isin(changed | removed), "dependent"])
+    return affected & set(hashes)
+
+
+def _reprocess(raw, affected):
+    """Process only the rows of the affected countries.
+
+    Each contiguous block of affected rows is processed together with enough
+    surrounding rows to contain the valid bounds of every gap it touches, so
+    the result is identical to processing the whole file.
+    """
+    columns = [c for c in raw.columns if c != "country"]
+    n_rows = len(raw)
+    countries = raw["country"].to_numpy()
+    positions = np.arange(n_rows)[:, None]
+    valid = raw[columns].notna().to_numpy()
+    prev_valid = np.maximum.accumulate(np.where(valid, positions, -1), axis=0).min(axis=1)
+    next_valid = np.minimum.accumulate(np.where(valid, positions, n_rows)[::-1], axis=0)[::-1].max(axis=1)
+
+    is_affected = raw["country"].isin(affected).to_numpy()
+    edges = np.diff(np.concatenate([[0], is_affected.astype(int), [0]]))
+    windows = []
+    for start, end in zip(np.flatnonzero(edges == 1), np.flatnonzero(edges == -1) - 1):
+        lo = max(min(prev_valid[start], start), 0)
+        hi = min(max(next_valid[end], end), n_rows - 1)
+        # Whole countries, so the per-country step sees complete groups
+        lo = np.searchsorted(countries, countries[lo], side="left")
+        hi = np.searchsorted(countries, countries[hi], side="right") - 1
+        if windows and lo <= windows[-1][1] + 1:
+            windows[-1][1] = max(windows[-1][1], hi)
+        else:
+            windows.append([lo, hi])
+
+    if not windows:
+        return raw.iloc[:0]
+    parts = []
+    for lo, hi in windows:
+        part = _interpolate_rows(raw.iloc[lo:hi + 1])
+        parts.append(part[part["country"].isin(affected)])
+    # Windows hold whole countries, so the per-country pass can run on all of them at once
+    return interpolate_groups(pd.concat(parts, ignore_index=True), columns)
+
+
+def run(raw_path=RAW_CSV, output=PROCESSED_CSV, incremental=False, chunksize=50_000):
+    """Run the pipeline; returns the set of countries that were (re)processed."""
+    output = Path(output)
+    raw = read_raw(raw_path, chunksize)
+    deps = dependents(raw)
+    hashes = country_hashes(raw)
+
+    previous = None
+    if incremental and output.exists() and manifest_path(output).exists():
+        previous = json.loads(manifest_path(output).read_text())
+        if previous.get("version") != ETL_VERSION:
+            previous = None
+
+    csv_text = None
+    if previous is not None:
+        affected = _affected_countries(hashes, deps, previous)
+        if not affected and previous["countries"] == hashes:
+            return affected
+        csv_text = _splice_csv(output, _reprocess(raw, affected), set(hashes) - affected)
+    if csv_text is None:
+        affected = set(hashes)
+        csv_text = process(raw).to_csv(index=False)
+
+    write_atomic(csv_text, output)
+    manifest = {"version": ETL_VERSION, "countries": hashes, "dependents": {col: deps[col].to_numpy().tolist() for col in deps.columns}}
+    manifest_path(output).write_text(json.dumps(manifest))
+    return affected
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the processed SDG7 dataset from the raw CSV.")
+    parser.add_argument("--input", default=str(RAW_CSV))
+    parser.add_argument("--output", default=str(PROCESSED_CSV))
+    parser.add_argument("--incremental", action="store_true",
+                        help="Only reprocess countries whose raw rows changed since the last run")
+    parser.add_argument("--chunksize", type=int, default=50_000)
+    args = parser.parse_args()
+
+    affected = run(args.input, args.output, incremental=args.incremental, chunksize=args.chunksize)
+    if affected:
+        print(f"Processed data saved to: {args.output} ({len(affected)} countries processed)")
+    else:
+        print(f"{args.output} is up to date")
+
+
+if __name__ == "__main__":
+    main()
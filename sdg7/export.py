@@ -0,0 +1,480 @@
+# Static export of the dashboard pages as a self-contained site
+#
+# `python -m sdg7.export` renders the Dashboard (with one map page per
+# year_map option), Predictions, Hypotheses (one page per year, with the
+# seaborn heatmap as PNG) and a Country Overview page per country into plain
+# HTML, JSON and PNG files that any static file server can serve. plotly.js
+# (and, with the geometry bundle, its world base map) is copied into the
+# site, so pages load nothing from the app or a CDN.
+#
+# Pages are rendered in a process pool. Every page has a content key (hash of
+# the data it reads, its spec and the library versions) recorded in
+# manifest.json; a re-run only renders pages whose key changed, and deletes
+# the files of pages that no longer exist. Pages hash the rows they read:
+# a country page its own rows (and its region's 2020 rows, for the rank), a
+# Hypotheses page its year's and 2000's rows (bootstrap CIs are drawn from a
+# stream per year and pair, so other years don't move them), so a correction
+# to one country's value in one year re-renders that country, that year and
+# the few all-country pages.
+import argparse
+import hashlib
+import html
+import json
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+
+from sdg7.config import FORECAST_YEAR, ROOT_DIR
+
+SITE_DIR = ROOT_DIR / "site"
+EXPORT_VERSION = 4
+MAP_YEARS = [2000, 2010, 2020, FORECAST_YEAR]
+GROWTH_COLUMNS = ["renewable_capacity_per_capita", "co2_emissions_kt"]
+HYPOTHESIS_PAIRS = [
+    ("gdp_per_capita", "access_to_clean_fuels"),
+    ("renewable_capacity_per_capita", "access_to_electricity"),
+    ("renewable_energy_share", "energy_intensity"),
+]
+NAV = [("Home", "index.html"), ("Dashboard", "dashboard/index.html"), ("Predictions", "predictions/index.html"),
+       ("Country Overview", "countries/index.html"), ("Hypotheses", "hypotheses/index.html")]
+
+# Set in each worker by _init_worker
+_data = None
+_correlations = None
+_derived = {}
+
+
+def _library_versions():
+    import matplotlib
+    import plotly
+    import seaborn
+
+    return {"pandas": pd.__version__, "plotly": plotly.__version__,
+            "matplotlib": matplotlib.__version__, "seaborn": seaborn.__version__}
+
+
+def frame_hash(*frames):
+    """Content hash of the values (not the index) of one or more frames."""
+    digest = hashlib.sha256()
+    for frame in frames:
+        digest.update(",".join(map(str, frame.columns)).encode())
+        digest.update(pd.util.hash_pandas_object(frame, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def page_key(builder, params, inputs, versions):
+    header = json.dumps({"export_version": EXPORT_VERSION, "builder": builder, "params": params,
+                         "inputs": inputs, "versions": versions}, sort_keys=True)
+    return hashlib.sha256(header.encode()).hexdigest()
+
+
+def country_file(iso3):
+    return f"countries/{iso3}.html"
+
+
+def _init_worker(correlations, data):
+    global _data, _correlations
+    _data = data
+    _correlations = correlations
+    _derived.clear()
+
+
+def _summary():
+    if "summary" not in _derived:
+        from sdg7.summary import SummaryCube
+
+        _derived["summary"] = SummaryCube(_data)
+    return _derived["summary"]
+
+
+# ---- HTML ----
+
+def _page(path, title, body):
+    """A full HTML document for the file at `path` (relative to the site root)."""
+    root = "../" * path.count("/")
+    nav = " | ".join(f'<a href="{root}{href}">{name}</a>' for name, href in NAV)
+    return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>{html.escape(title)} - SDG 7</title>
+<script src="{root}assets/plotly.min.js"></script>
+<style>
+body {{ font-family: sans-serif; margin: 0 auto; max-width: 1100px; padding: 1em; }}
+table {{ border-collapse: collapse; font-size: 0.9em; }}
+th, td {{ border: 1px solid #ddd; padding: 0.2em 0.5em; text-align: right; }}
+img {{ max-width: 100%; }}
+</style>
+</head>
+<body>
+<nav>{nav}</nav>
+<h1>{html.escape(title)}</h1>
+{body}
+</body>
+</html>
+"""
+
+
+def _chart(fig, config=None):
+    return fig.to_html(full_html=False, include_plotlyjs=False, default_width="100%", config=config)
+
+
+def _table(df, float_format="{:.2f}".format, **kwargs):
+    return df.to_html(float_format=float_format, na_rep="", border=0, **kwargs)
+
+
+def _json(value):
+    return json.dumps(value, indent=1, default=str, allow_nan=False)
+
+
+def _records(df):
+    """Frame as a list of dicts with NaN as null."""
+    return json.loads(df.to_json(orient="records"))
+
+
+# ---- page builders: (params) -> {relative path: str or bytes} ----
+
+def build_plotly(params):
+    from plotly.offline import get_plotlyjs
+
+    return {"assets/plotly.min.js": get_plotlyjs()}
+
+
+def build_topojson(params):
+    from sdg7.geo import TOPOJSON_NAME, load_geometry, to_topojson
+
+    return {f"assets/topojson/{TOPOJSON_NAME}.json": json.dumps(to_topojson(load_geometry()), separators=(",", ":"))}
+
+
+def build_home(params):
+    links = "".join(f'<li><a href="{href}">{name}</a></li>' for name, href in NAV[1:])
+    body = (f"<p>Static export of the SDG 7 dashboard (data version {_data.version}).</p>"
+            f"<ul>{links}</ul>")
+    return {"index.html": _page("index.html", "Sustainable Energy for All", body)}
+
+
+def build_dashboard(params):
+    import plotly.express as px
+
+    from sdg7.data_access import CO2_QUARTILE_LABELS
+    from sdg7.downsample import regional_bands
+    from sdg7.figures import band_chart, scatter_with_trendline
+
+    df_2020 = _data.year(2020)
+    figs = [
+        band_chart(regional_bands(_data.df_cleaned, "year", "access_to_electricity"), "year",
+                   title="Access to Electricity Over Time by Region", y_title="access_to_electricity"),
+        scatter_with_trendline(df_2020, x="renewable_capacity_per_capita", y="access_to_electricity",
+                               color="country", title="Renewable Capacity vs Electricity Access (2020)"),
+        px.box(df_2020, y="co2_emissions_kt", title="Distribution of CO₂ Emissions"),
+        px.histogram(df_2020, x="co2_emissions_kt", nbins=50, title="Histogram of CO₂ Emissions (2020)"),
+        px.box(df_2020, x="region", y="co2_emissions_kt", color="region",
+               title="CO₂ Emissions by Region (2020)", points="all", hover_name="country"),
+        px.box(df_2020, x="co2_quartile", y="co2_emissions_kt", color="co2_quartile",
+               title="CO₂ Emissions by Quartile (2020)", points="all", hover_name="country",
+               category_orders={"co2_quartile": CO2_QUARTILE_LABELS}),
+    ]
+    maps = " | ".join(f'<a href="map-{year}.html">{year}</a>' for year in MAP_YEARS)
+    body = f"<p>Access to electricity by country: {maps}</p>" + "".join(_chart(fig) for fig in figs)
+    return {"dashboard/index.html": _page("dashboard/index.html", "Global Trends Dashboard", body)}
+
+
+def build_map(params):
+    from sdg7.geo import MapValues, choropleth, load_geometry
+
+    year = params["year"]
+    if "map_values" not in _derived:
+        _derived["map_values"] = MapValues(_data, "access_to_electricity", MAP_YEARS)
+    fig = choropleth(_derived["map_values"], year, load_geometry(),
+                     title=f"Access to Electricity in {year}", colorbar_title="access_to_electricity")
+    path = f"dashboard/map-{year}.html"
+    # plotly.js fetches its world base map from its CDN unless the site has one
+    config = {"topojsonURL": "../assets/topojson/"} if params["topojson"] else None
+    body = f'{_chart(fig, config)}<p><a href="map-{year}.json">Figure JSON</a></p>'
+    return {path: _page(path, f"Access to Electricity in {year}", body), f"dashboard/map-{year}.json": fig.to_json()}
+
+
+def build_predictions(params):
+    import plotly.express as px
+
+    df_combined = _data.combined
+    columns = ["access_to_clean_fuels_2020", "access_to_clean_fuels"]
+    top = df_combined.sort_values("clean_growth", ascending=False).head(10)
+    bottom = df_combined.sort_values("clean_growth", ascending=True).head(10)
+    body = (
+        _chart(px.bar(top, x="country", y=columns, barmode="group",
+                      title="Top 10 Countries - Clean Fuels Access Growth (2020-2030)"))
+        + _chart(px.bar(bottom, x="country", y=columns, barmode="group",
+                        title="Bottom 10 Countries - Clean Fuels Access Growth (2020-2030)"))
+        + '<h2>All countries</h2><p><a href="combined.json">JSON</a></p>'
+        + _table(df_combined.sort_values("clean_growth", ascending=False), index=False)
+    )
+    return {"predictions/index.html": _page("predictions/index.html", "Predictions for 2030", body),
+            "predictions/combined.json": _json(_records(df_combined))}
+
+
+def _correlation_text(cube, x, y, year):
+    pearson = cube.pair(x, y, year)
+    spearman = cube.pair(x, y, year, method="spearman", ci=False)
+    return (f"<p><b>{x} vs {y}</b>: r = {pearson['r']:.2f}, p = {pearson['p']:.4f}, "
+            f"95% CI [{pearson['low']:.2f}, {pearson['high']:.2f}], Spearman ρ = {spearman['r']:.2f}</p>")
+
+
+def build_hypotheses_index(params):
+    links = "".join(f'<li><a href="{year}.html">{year}</a></li>' for year in params["years"])
+    path = "hypotheses/index.html"
+    return {path: _page(path, "Hypotheses and Validation", f"<ul>{links}</ul>")}
+
+
+def build_hypotheses(params):
+    import plotly.express as px
+
+    from sdg7.correlations import growth_frames
+    from sdg7.figures import scatter_with_trendline
+    from sdg7.heatmap import render_heatmap
+
+    year = params["year"]
+    levels, changes = _correlations
+    df_year = _data.year(year)
+    files = {f"hypotheses/heatmap-{year}.png": render_heatmap(levels.matrix(year), fmt="png")}
+
+    body = f'<h2>Correlation between variables</h2><img src="heatmap-{year}.png" alt="Correlation heatmap {year}">'
+    titles = ["GDP per Capita vs Access to Clean Fuels", "Renewable Capacity per Capita vs Access to Electricity",
+              "Renewable Energy Share vs Energy Intensity"]
+    for i, ((x, y), title) in enumerate(zip(HYPOTHESIS_PAIRS, titles), start=1):
+        body += f"<h2>Hypothesis {i}: {title}</h2>"
+        body += _chart(scatter_with_trendline(df_year, x=x, y=y, color="country", title=title))
+        body += _correlation_text(levels, x, y, year)
+    body += _chart(px.violin(df_year, y="access_to_clean_fuels", x="gdp_quartile", box=True,
+                             title="Distribution of Clean Fuel Access by GDP Quartiles"))
+    body += _chart(px.box(df_year, x="region", y="energy_intensity", color="region",
+                          title=f"Energy Intensity by Region ({year})", points="all"))
+
+    pairs = {f"{x}|{y}": levels.pair(x, y, year) for x, y in HYPOTHESIS_PAIRS}
+    if year in changes.labels:
+        if "growth" not in _derived:
+            _derived["growth"] = growth_frames(_data.df_cleaned, GROWTH_COLUMNS, 2000)
+        df_growth = _derived["growth"][year].rename(columns={"renewable_capacity_per_capita": "renewable_growth",
+                                                             "co2_emissions_kt": "co2_growth"}).reset_index()
+        body += "<h2>Hypothesis 4: Renewable Capacity Growth vs CO₂ Emission Growth</h2>"
+        body += _chart(scatter_with_trendline(df_growth, x="renewable_growth", y="co2_growth", color="country",
+                                              title=f"Renewable Capacity Growth vs CO₂ Emission Growth (2000–{year})"))
+        body += _correlation_text(changes, *GROWTH_COLUMNS, year)
+        pairs["growth:" + "|".join(GROWTH_COLUMNS)] = changes.pair(*GROWTH_COLUMNS, year)
+
+    path = f"hypotheses/{year}.html"
+    files[path] = _page(path, f"Hypotheses and Validation ({year})", body)
+    files[f"hypotheses/{year}.json"] = _json({"year": year, "correlation": _records(levels.matrix(year).reset_index()),
+                                              "pairs": pairs})
+    return files
+
+
+def build_countries_index(params):
+    summary = _summary()
+    df_index = pd.DataFrame({"country": summary.countries, "region": summary.regions})
+    iso3 = _data.year(2020).set_index("country")["iso3"]
+    df_index["country"] = [f'<a href="{iso3[c]}.html">{html.escape(c)}</a>' for c in df_index["country"]]
+    body = ('<p>All metrics: <a href="summary.csv">CSV</a></p>'
+            + _table(df_index, index=False, escape=False))
+    return {"countries/index.html": _page("countries/index.html", "Country Overview", body),
+            "countries/summary.csv": summary.export("csv")}
+
+
+def build_country(params):
+    import plotly.graph_objects as go
+
+    summary = _summary()
+    country = params["country"]
+    df_country = _data.country(country)
+    df_pred = _data.df_pred_2030[_data.df_pred_2030["country"] == country]
+    df_summary = summary.country(country)
+
+    fig = go.Figure()
+    for column in ["access_to_electricity", "access_to_clean_fuels"]:
+        fig.add_trace(go.Scatter(x=df_country["year"], y=df_country[column], mode="lines+markers", name=column))
+        if not df_pred.empty:
+            fig.add_trace(go.Scatter(x=[FORECAST_YEAR], y=df_pred[column], mode="markers",
+                                     marker_symbol="diamond", name=f"{column} ({FORECAST_YEAR} forecast)"))
+    fig.update_layout(title=f"Access in {country}", yaxis_title="% of population")
+
+    path = country_file(params["iso3"])
+    body = (f"<p>Region: {html.escape(str(summary.region(country)))}</p>"
+            f"<h2>General results (2020 vs 2000)</h2>{_table(df_summary)}{_chart(fig)}"
+            f'<p><a href="{params["iso3"]}.json">JSON</a></p>')
+    data = {"country": country, "iso3": params["iso3"], "region": summary.region(country),
+            "summary": json.loads(df_summary.to_json(orient="index")),
+            "series": _records(df_country.drop(columns=["country", "iso3", "region", "sub_region"], errors="ignore"))}
+    return {path: _page(path, f"{country} - 2020 Summary", body), f"countries/{params['iso3']}.json": _json(data)}
+
+
+BUILDERS = {
+    "plotly": build_plotly,
+    "topojson": build_topojson,
+    "home": build_home,
+    "dashboard": build_dashboard,
+    "map": build_map,
+    "predictions": build_predictions,
+    "hypotheses_index": build_hypotheses_index,
+    "hypotheses": build_hypotheses,
+    "countries_index": build_countries_index,
+    "country": build_country,
+}
+
+
+# ---- planning and rendering ----
+
+def pages(data):
+    """Yield (page id, builder, params, inputs hash) of every page of the site."""
+    import plotly
+
+    from sdg7.geo import GEOMETRY_JSON
+    from sdg7.store import file_hash
+
+    yield "plotly", "plotly", {}, plotly.__version__
+    yield "home", "home", {}, data.version
+    yield "dashboard", "dashboard", {}, data.version
+    # The colour range of every map spans all map years
+    map_columns = ["country", "iso3", "access_to_electricity"]
+    map_inputs = frame_hash(data.years(MAP_YEARS)[map_columns], data.df_pred_2030[map_columns])
+    # The map pages draw the bundle when there is one, and the site then serves plotly.js's base map from it too
+    geometry = GEOMETRY_JSON.exists()
+    if geometry:
+        geometry_hash = file_hash(GEOMETRY_JSON)
+        yield "topojson", "topojson", {}, geometry_hash
+        map_inputs += geometry_hash
+    for year in MAP_YEARS:
+        yield f"map-{year}", "map", {"year": year, "topojson": geometry}, map_inputs
+    yield "predictions", "predictions", {}, frame_hash(data.combined)
+
+    # A year's correlations and bootstrap CIs only depend on that year's rows and, for the growth, 2000's
+    years = sorted(int(year) for year in data.df_cleaned["year"].unique() if float(year).is_integer())
+    yield "hypotheses", "hypotheses_index", {"years": years}, None
+    for year in years:
+        yield f"hypotheses-{year}", "hypotheses", {"year": year}, frame_hash(data.year(2000), data.year(year))
+
+    yield "countries", "countries_index", {}, data.version
+    df_2020 = data.year(2020)
+    metrics = [c for c in df_2020.columns if c not in ("iso3", "sub_region")]
+    region_frames = {region: df_region[metrics] for region, df_region in df_2020.groupby("region", observed=True)}
+    df_pred = data.df_pred_2030
+    for country, region, iso3 in df_2020[["country", "region", "iso3"]].itertuples(index=False):
+        inputs = frame_hash(data.country(country), df_pred[df_pred["country"] == country],
+                            region_frames.get(region, df_2020.iloc[:0][metrics]))
+        yield f"country-{iso3}", "country", {"country": country, "iso3": iso3}, inputs
+
+
+def render_page(task):
+    """Build one page and write its files; returns (page id, relative paths)."""
+    page_id, builder, params, output_dir = task
+    files = BUILDERS[builder](params)
+    for path, content in files.items():
+        _write(os.path.join(output_dir, path), content)
+    return page_id, sorted(files)
+
+
+def _write(path, content):
+    """Atomic write like etl.write_atomic, for str or bytes."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(content.encode() if isinstance(content, str) else content)
+        # mkstemp creates the file as 0600; static file servers often run as another user
+        if os.path.exists(path):
+            shutil.copymode(path, tmp)
+        else:
+            os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def read_manifest(output_dir):
+    try:
+        with open(output_dir / "manifest.json") as f:
+            return json.load(f)["pages"]
+    except FileNotFoundError:
+        return {}
+
+
+def load_correlations(data):
+    """Level and growth correlation cubes, as on the Hypotheses page."""
+    from sdg7.correlations import CorrelationCube, growth_frames
+    from sdg7.data_access import DERIVED_COLUMNS
+
+    columns = [c for c in data.df_cleaned.select_dtypes(include="number").columns
+               if c not in ["year"] + DERIVED_COLUMNS]
+    levels = CorrelationCube.from_years(data.df_cleaned, columns)
+    changes = CorrelationCube(growth_frames(data.df_cleaned, GROWTH_COLUMNS, 2000), GROWTH_COLUMNS)
+    return levels, changes
+
+
+def export(data, output_dir=SITE_DIR, workers=None, force=False):
+    """Render every page whose key changed since the last export into output_dir.
+
+    Returns (n_pages, n_rendered).
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    workers = workers or os.cpu_count()
+    versions = _library_versions()
+    manifest = {} if force else read_manifest(output_dir)
+
+    entries, tasks = {}, []
+    for page_id, builder, params, inputs in pages(data):
+        key = page_key(builder, params, inputs, versions)
+        entry = manifest.get(page_id)
+        if entry and entry["key"] == key and all((output_dir / path).exists() for path in entry["files"]):
+            entries[page_id] = entry
+        else:
+            entries[page_id] = {"key": key}
+            tasks.append((page_id, builder, params, str(output_dir)))
+
+    # Only worth computing (2-3 s) when a Hypotheses page is rendered
+    correlations = load_correlations(data) if any(task[1] == "hypotheses" for task in tasks) else None
+    if workers == 1 or len(tasks) < 2:
+        _init_worker(correlations, data)
+        results = list(map(render_page, tasks))
+    else:
+        chunksize = max(1, len(tasks) // (workers * 8))
+        # Workers render the caller's data (inherited when forked, pickled once per worker otherwise)
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(correlations, data)) as pool:
+            results = list(pool.map(render_page, tasks, chunksize=chunksize))
+    for page_id, files in results:
+        entries[page_id]["files"] = files
+
+    # Files of pages that are gone (e.g. a country dropped from the data)
+    for page_id, entry in manifest.items():
+        if page_id not in entries:
+            for path in entry.get("files", []):
+                (output_dir / path).unlink(missing_ok=True)
+    _write(str(output_dir / "manifest.json"),
+           json.dumps({"data_version": data.version, "pages": entries}, indent=1, sort_keys=True))
+    return len(entries), len(tasks)
+
+
+def main():
+    from sdg7.data_access import DataIndex
+    from sdg7.store import data_version, load_tables
+
+    parser = argparse.ArgumentParser(description="Export the dashboard pages as a static site.")
+    parser.add_argument("--output", default=str(SITE_DIR))
+    parser.add_argument("--workers", type=int, default=None, help="Process pool size (default: CPU count)")
+    parser.add_argument("--force", action="store_true", help="Render every page, ignoring the manifest")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    data = DataIndex(*load_tables(), version=data_version())
+    n_pages, n_rendered = export(data, Path(args.output), args.workers, args.force)
+    print(f"{n_pages} pages, {n_rendered} rendered (the rest unchanged) "
+          f"in {time.perf_counter() - start:.1f} s; site saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
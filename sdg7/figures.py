@@ -0,0 +1,163 @@
+# Memoized Plotly figures and rendered images shared across sessions
+#
+# Figures are stored as serialized Plotly JSON (images as PNG/SVG bytes)
+# keyed by (chart id, data version, widget inputs) in a bounded LRU cache,
+# so a rerun with the same inputs rebuilds the figure from JSON instead of
+# running Plotly Express (and statsmodels for trendlines) again.
+import json
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import plotly.express as px
+import plotly.graph_objects as go
+
+from sdg7.metrics import METRICS
+
+
+class RenderCache:
+    """Bounded LRU of rendered output (str or bytes) keyed by (chart id, data version, inputs).
+
+    max_size_bytes bounds the encoded size of the entries (str output counts
+    as its UTF-8 bytes). Hits and misses are counted, and reported to
+    sdg7.metrics as `name`.
+    """
+
+    def __init__(self, max_entries=128, max_size_bytes=64 * 1024 * 1024, name="renders"):
+        self.max_entries = max_entries
+        self.max_size_bytes = max_size_bytes
+        self.name = name
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def size_bytes(self):
+        return self._bytes
+
+    def get_rendered(self, chart_id, version, inputs, render):
+        """Return the cached output for the key, calling render() on a miss."""
+        key = (chart_id, version, inputs)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                METRICS.cache_result(self.name, hit=True)
+                return self._entries[key][0]
+            self.misses += 1
+        METRICS.cache_result(self.name, hit=False)
+
+        # Rendered outside the lock so slow charts don't block other sessions
+        with METRICS.section(f"build {chart_id}"):
+            output = render()
+        size = len(output.encode()) if isinstance(output, str) else len(output)
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = (output, size)
+                self._bytes += size
+            self._evict()
+        return output
+
+    def _evict(self):
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_size_bytes):
+            _, (_, size) = self._entries.popitem(last=False)
+            self._bytes -= size
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+
+class FigureCache(RenderCache):
+    """Plotly figures, stored as serialized JSON."""
+
+    def __init__(self, max_entries=128, max_size_bytes=64 * 1024 * 1024, name="figures"):
+        super().__init__(max_entries, max_size_bytes, name)
+
+    def get_json(self, chart_id, version, inputs, build):
+        """Return the figure JSON for the key, calling build() -> go.Figure on a miss."""
+        return self.get_rendered(chart_id, version, inputs, lambda: build().to_json())
+
+    def get(self, chart_id, version, inputs, build):
+        """Like get_json() but returns a fresh go.Figure the caller may modify."""
+        fig_json = self.get_json(chart_id, version, inputs, build)
+        # The JSON came from a valid figure, skip Plotly's per-property validation
+        return go.Figure(json.loads(fig_json), _validate=False)
+
+
+def ols_fit(x, y):
+    """Least-squares line through the finite (x, y) pairs -> (slope, intercept, r2)."""
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    ok = np.isfinite(x) & np.isfinite(y)
+    x, y = x[ok], y[ok]
+    if len(x) < 2 or np.ptp(x) == 0:
+        return np.nan, np.nan, np.nan
+    dx = x - x.mean()
+    dy = y - y.mean()
+    slope = (dx * dy).sum() / (dx * dx).sum()
+    intercept = y.mean() - slope * x.mean()
+    ss_tot = (dy * dy).sum()
+    r2 = 1 - ((y - intercept - slope * x) ** 2).sum() / ss_tot if ss_tot > 0 else np.nan
+    return slope, intercept, r2
+
+
+def add_ols_trendline(fig, df, x, y):
+    """Draw the overall OLS line of y on x as a plain line trace."""
+    slope, intercept, r2 = ols_fit(df[x], df[y])
+    if np.isnan(slope):
+        return fig
+    x_range = np.array([np.nanmin(df[x]), np.nanmax(df[x])])
+    fig.add_trace(go.Scatter(
+        x=x_range,
+        y=intercept + slope * x_range,
+        mode="lines",
+        name="OLS trendline",
+        line=dict(color="black", dash="dash"),
+        hovertemplate=f"{y} = {slope:.4g} * {x} + {intercept:.4g}<br>R² = {r2:.3f}<extra></extra>",
+    ))
+    return fig
+
+
+def scatter_with_trendline(df, x, y, **px_kwargs):
+    """px.scatter with a NumPy OLS trendline instead of trendline="ols" (no statsmodels)."""
+    fig = px.scatter(df, x=x, y=y, **px_kwargs)
+    return add_ols_trendline(fig, df, x, y)
+
+
+def _rgba(hex_color, alpha):
+    r, g, b = (int(hex_color[i:i + 2], 16) for i in (1, 3, 5))
+    return f"rgba({r}, {g}, {b}, {alpha})"
+
+
+def band_chart(bands, x, title, y_title=None, band_label="25th-75th percentile"):
+    """Mean line with a shaded quantile band per region (see downsample.regional_bands)."""
+    fig = go.Figure()
+    colors = px.colors.qualitative.Plotly
+    for i, (region, df_region) in enumerate(bands.groupby("region", sort=True)):
+        color = colors[i % len(colors)]
+        fig.add_trace(go.Scatter(
+            x=df_region[x], y=df_region["high"], mode="lines", line=dict(width=0),
+            legendgroup=region, showlegend=False, hoverinfo="skip",
+        ))
+        fig.add_trace(go.Scatter(
+            x=df_region[x], y=df_region["low"], mode="lines", line=dict(width=0),
+            fill="tonexty", fillcolor=_rgba(color, 0.2),
+            legendgroup=region, showlegend=False, hoverinfo="skip",
+        ))
+        fig.add_trace(go.Scatter(
+            x=df_region[x], y=df_region["mean"], mode="lines+markers", name=region,
+            line=dict(color=color), legendgroup=region,
+            customdata=df_region[["low", "high", "countries"]].to_numpy(),
+            hovertemplate=(f"<b>{region}</b><br>{x}=%{{x}}<br>mean=%{{y:.4g}}<br>"
+                           f"{band_label}: %{{customdata[0]:.4g}} - %{{customdata[1]:.4g}}<br>"
+                           "countries=%{customdata[2]}<extra></extra>"),
+        ))
+    fig.update_layout(title=title, xaxis_title=x, yaxis_title=y_title, legend_title_text="region")
+    return fig
@@ -0,0 +1,151 @@
+# Batched linear trend forecasting per country and target
+#
+# Replaces the per-country LinearRegression loop of Model.ipynb: every
+# country x target series is fitted at once with closed-form least squares
+# on a dense (country, year, target) array, missing values are masked out.
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from sdg7.config import (
+    FORECAST_YEAR,
+    MIN_POINTS,
+    NON_NEGATIVE_TARGETS,
+    PERCENT_TARGETS,
+    PREDICTIONS_CSV,
+    PROCESSED_CSV,
+    TARGET_VARS,
+)
+
+
+def build_panel(df, targets=TARGET_VARS):
+    """Reshape long country/year data into a (country, year, target) array.
+
+    Countries and years come back sorted, cells without data are NaN.
+    """
+    countries, country_codes = np.unique(df["country"].to_numpy(), return_inverse=True)
+    years, year_codes = np.unique(df["year"].to_numpy(), return_inverse=True)
+    values = np.full((len(countries), len(years), len(targets)), np.nan)
+    values[country_codes, year_codes] = df[targets].to_numpy(dtype=float)
+    return countries, years.astype(float), values
+
+
+def fit_trends(years, values, min_points=MIN_POINTS):
+    """Fit y = intercept + slope * year for every (country, target) series.
+
+    `years` has shape (n_years,), `values` (n_countries, n_years, n_targets).
+    Returns a dict of (n_countries, n_targets) arrays: n, slope, intercept,
+    r2, mae and `valid` (series with at least `min_points` observations).
+    """
+    mask = ~np.isnan(values)
+    x = years[None, :, None]
+    n = mask.sum(axis=1)
+    safe_n = np.maximum(n, 1)
+
+    x_mean = np.where(mask, x, 0.0).sum(axis=1) / safe_n
+    y_mean = np.where(mask, values, 0.0).sum(axis=1) / safe_n
+    dx = np.where(mask, x - x_mean[:, None, :], 0.0)
+    dy = np.where(mask, values - y_mean[:, None, :], 0.0)
+
+    sxx = (dx * dx).sum(axis=1)
+    sxy = (dx * dy).sum(axis=1)
+    syy = (dy * dy).sum(axis=1)
+    slope = np.divide(sxy, sxx, out=np.zeros_like(sxy), where=sxx > 0)
+    intercept = y_mean - slope * x_mean
+
+    resid = np.where(mask, values - (intercept[:, None, :] + slope[:, None, :] * x), 0.0)
+    ss_res = (resid * resid).sum(axis=1)
+    # Same convention as sklearn's r2_score for a constant series
+    r2 = np.where(syy > 0, 1 - ss_res / np.where(syy > 0, syy, 1.0), np.where(ss_res == 0, 1.0, 0.0))
+    mae = np.abs(resid).sum(axis=1) / safe_n
+
+    return {
+        "n": n,
+        "slope": slope,
+        "intercept": intercept,
+        "r2": r2,
+        "mae": mae,
+        "valid": n >= min_points,
+    }
+
+
+def clip_predictions(pred, targets=TARGET_VARS, axis=-1):
+    """Apply the 0-100 bound for % targets and >= 0 for capacity (`axis` = targets)."""
+    pred = pred.copy()
+    by_target = np.moveaxis(pred, axis, -1)
+    for i, target in enumerate(targets):
+        if target in PERCENT_TARGETS:
+            np.clip(by_target[..., i], 0, 100, out=by_target[..., i])
+        elif target in NON_NEGATIVE_TARGETS:
+            np.maximum(by_target[..., i], 0, out=by_target[..., i])
+    return pred
+
+
+def predict(fit, horizons, targets=TARGET_VARS):
+    """Evaluate fitted trends at each horizon year -> (n_countries, n_horizons, n_targets)."""
+    horizons = np.asarray(horizons, dtype=float)
+    pred = fit["intercept"][:, None, :] + fit["slope"][:, None, :] * horizons[None, :, None]
+    pred = clip_predictions(pred, targets)
+    pred[~np.broadcast_to(fit["valid"][:, None, :], pred.shape)] = np.nan
+    return pred
+
+
+def forecast(df, horizons=(FORECAST_YEAR,), targets=TARGET_VARS, min_points=MIN_POINTS):
+    """Forecast every country/target for the given horizon years.
+
+    Returns (df_predictions, df_metrics) in long format:
+    country, target, year, predicted_value and country, target, n, r2, mae.
+    Series with fewer than `min_points` observations are left out.
+    """
+    countries, years, values = build_panel(df, targets)
+    fit = fit_trends(years, values, min_points)
+    pred = predict(fit, horizons, targets)
+
+    n_countries, n_horizons, n_targets = pred.shape
+    df_predictions = pd.DataFrame({
+        "country": np.repeat(countries, n_horizons * n_targets),
+        "target": np.tile(np.asarray(targets, dtype=object), n_countries * n_horizons),
+        "year": np.tile(np.repeat(np.asarray(horizons, dtype=int), n_targets), n_countries),
+        "predicted_value": pred.ravel(),
+    }).dropna(subset=["predicted_value"]).reset_index(drop=True)
+
+    valid = fit["valid"].ravel()
+    df_metrics = pd.DataFrame({
+        "country": np.repeat(countries, n_targets)[valid],
+        "target": np.tile(np.asarray(targets, dtype=object), n_countries)[valid],
+        "n": fit["n"].ravel()[valid],
+        "r2": fit["r2"].ravel()[valid],
+        "mae": fit["mae"].ravel()[valid],
+    })
+    return df_predictions, df_metrics
+
+
+def to_wide(df_predictions):
+    """Pivot long predictions to the predictions_linear_2030.csv layout."""
+    df_wide = df_predictions.pivot(index=["country", "year"], columns="target", values="predicted_value")
+    df_wide = df_wide.reset_index()
+    df_wide.columns.name = None
+    target_cols = sorted(c for c in df_wide.columns if c not in ("country", "year"))
+    return df_wide[["country"] + target_cols + ["year"]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Forecast SDG7 targets with per-country linear trends.")
+    parser.add_argument("--years", type=int, nargs="+", default=[FORECAST_YEAR], help="Horizon years to forecast")
+    parser.add_argument("--input", default=str(PROCESSED_CSV))
+    parser.add_argument("--output", default=str(PREDICTIONS_CSV))
+    args = parser.parse_args()
+
+    df = pd.read_csv(args.input)
+    df_predictions, df_metrics = forecast(df, horizons=args.years)
+    to_wide(df_predictions).to_csv(args.output, index=False)
+    print(f"Predictions saved to {args.output}")
+
+    summary = df_metrics.groupby("target")[["mae", "r2"]].mean()
+    for target, row in summary.iterrows():
+        print(f"{target}: MAE {row['mae']:.2f} | R² {row['r2']:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+# Choropleth geometry and per-year colour values keyed by ISO3
+#
+# Maps are keyed by the ISO3 codes of the country table (sdg7.countries), so
+# Plotly never has to resolve country names. `python -m sdg7.geo --source`
+# turns a country-level GeoJSON (e.g. Natural Earth admin 0 at 1:110m)
+# into a small bundle: one feature per country in the table with id = ISO3,
+# rings simplified with Douglas-Peucker and coordinates rounded. When the
+# bundle is present the map draws from it; otherwise it falls back to
+# Plotly's built-in ISO-3 geometry. plotly.js still fetches its world base
+# map (world_110m.json, from its CDN by default) for GeoJSON traces, so the
+# same shapes are also written as that TopoJSON for the app and the static
+# export to serve themselves. Colour values for every map year are
+# computed once per data version (MapValues) with one colour range.
+import argparse
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+from sdg7.config import DATA_DIR, ROOT_DIR
+from sdg7.countries import load_countries
+
+GEOMETRY_JSON = DATA_DIR / "Reference" / "world_simplified.geojson"
+# Served by Streamlit at app/static/topojson/ when server.enableStaticServing is on
+TOPOJSON_DIR = ROOT_DIR / "static" / "topojson"
+TOPOJSON_NAME = "world_110m"  # the file plotly.js asks for at the default scope and resolution
+# Properties that carry the ISO3 code in common world GeoJSON files
+ISO3_PROPERTIES = ["ISO_A3", "ADM0_A3", "iso_a3", "ISO3", "iso3"]
+TOLERANCE = 0.1  # degrees
+PRECISION = 2  # decimals kept per coordinate
+
+
+def simplify_ring(points, tolerance=TOLERANCE):
+    """Douglas-Peucker on one ring/line given as an (n, 2) array; keeps the end points."""
+    n = len(points)
+    if n <= 3:
+        return points
+    keep = np.zeros(n, dtype=bool)
+    keep[[0, -1]] = True
+    stack = [(0, n - 1)]
+    while stack:
+        start, end = stack.pop()
+        if end - start < 2:
+            continue
+        seg = points[end] - points[start]
+        rel = points[start + 1:end] - points[start]
+        length = np.hypot(*seg)
+        if length == 0:
+            dist = np.hypot(rel[:, 0], rel[:, 1])
+        else:
+            dist = np.abs(seg[0] * rel[:, 1] - seg[1] * rel[:, 0]) / length
+        i = int(np.argmax(dist))
+        if dist[i] > tolerance:
+            mid = start + 1 + i
+            keep[mid] = True
+            stack += [(start, mid), (mid, end)]
+    return points[keep]
+
+
+def _simplify_polygon(rings, tolerance, precision):
+    """Simplified rings of one polygon; rings that collapse are dropped (None if the outer one does)."""
+    out = []
+    for ring in rings:
+        points = np.round(simplify_ring(np.asarray(ring, dtype=float), tolerance), precision)
+        # Rounding can create repeated points
+        points = points[np.r_[True, np.any(np.diff(points, axis=0) != 0, axis=1)]]
+        if len(points) >= 4:
+            out.append(points.tolist())
+        elif not out:
+            return None
+    return out
+
+
+def simplify_geometry(geometry, tolerance=TOLERANCE, precision=PRECISION):
+    """Simplified (Multi)Polygon geometry."""
+    if geometry["type"] == "Polygon":
+        polygons = [geometry["coordinates"]]
+    elif geometry["type"] == "MultiPolygon":
+        polygons = geometry["coordinates"]
+    else:
+        raise ValueError(f"Unsupported geometry type: {geometry['type']}")
+    polygons = [p for p in (_simplify_polygon(rings, tolerance, precision) for rings in polygons) if p]
+    if not polygons:
+        # Small islands: keep the unsimplified outer ring so the country stays on the map
+        first = geometry["coordinates"] if geometry["type"] == "Polygon" else geometry["coordinates"][0]
+        polygons = [[np.round(np.asarray(first[0], dtype=float), precision).tolist()]]
+    if len(polygons) == 1:
+        return {"type": "Polygon", "coordinates": polygons[0]}
+    return {"type": "MultiPolygon", "coordinates": polygons}
+
+
+def feature_iso3(feature):
+    for key in ISO3_PROPERTIES:
+        code = (feature.get("properties") or {}).get(key)
+        if isinstance(code, str) and len(code) == 3 and code != "-99":
+            return code
+    code = feature.get("id")
+    return code if isinstance(code, str) and len(code) == 3 else None
+
+
+def build_geometry(source, output=GEOMETRY_JSON, df_countries=None, tolerance=TOLERANCE, precision=PRECISION):
+    """Write the bundle from a source GeoJSON; returns the ISO3 codes of the table that have no shape."""
+    if df_countries is None:
+        df_countries = load_countries()
+    codes = set(df_countries["iso3"])
+    with open(source, encoding="utf-8") as f:
+        collection = json.load(f)
+
+    features = {}
+    for feature in collection["features"]:
+        code = feature_iso3(feature)
+        if code in codes and feature.get("geometry") and code not in features:
+            features[code] = {"type": "Feature", "id": code, "properties": {},
+                              "geometry": simplify_geometry(feature["geometry"], tolerance, precision)}
+    bundle = {"type": "FeatureCollection", "features": [features[code] for code in sorted(features)]}
+    output = Path(output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(bundle, f, separators=(",", ":"))
+    return sorted(codes - set(features))
+
+
+def load_geometry(path=GEOMETRY_JSON):
+    """The bundled FeatureCollection, or None if it hasn't been built."""
+    if not path.exists():
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def to_topojson(bundle):
+    """The bundle as a TopoJSON topology with "countries" and "land" objects.
+
+    One arc per ring and no quantization: plotly.js only needs it to resolve
+    its base map, the shapes it draws come from the GeoJSON.
+    """
+    arcs, countries, land = [], [], []
+    for feature in bundle["features"]:
+        geometry = feature["geometry"]
+        polygons = [geometry["coordinates"]] if geometry["type"] == "Polygon" else geometry["coordinates"]
+        indices = []
+        for rings in polygons:
+            indices.append([[len(arcs) + i] for i in range(len(rings))])
+            arcs.extend(rings)
+        land.extend(indices)
+        countries.append({"type": geometry["type"], "id": feature["id"],
+                          "arcs": indices[0] if geometry["type"] == "Polygon" else indices})
+    return {"type": "Topology", "arcs": arcs, "objects": {
+        "countries": {"type": "GeometryCollection", "geometries": countries},
+        "land": {"type": "MultiPolygon", "arcs": land},
+    }}
+
+
+def write_topojson(bundle, directory=TOPOJSON_DIR):
+    path = Path(directory) / f"{TOPOJSON_NAME}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(to_topojson(bundle), f, separators=(",", ":"))
+    return path
+
+
+class MapValues:
+    """Colour values of one column for every map year, indexed [country, year].
+
+    Observed years come from the data, forecast_year from df_pred_2030.
+    zmin/zmax span every year so colours are comparable across the year
+    selector. Countries without an ISO3 code are left out.
+    """
+
+    def __init__(self, data, column, years, forecast_year=2030, decimals=2):
+        frames = [data.df_pred_2030 if year == forecast_year else data.year(year) for year in years]
+        df_values = pd.concat(
+            [frame.set_index("iso3")[column].rename(year) for year, frame in zip(years, frames)], axis=1)
+        df_values = df_values[df_values.index.notna()].sort_index()
+        names = pd.concat([frame.set_index("iso3")["country"] for frame in frames])
+        self.iso3 = df_values.index.to_numpy()
+        self.names = names[~names.index.duplicated()].reindex(self.iso3).to_numpy()
+        self.years = list(years)
+        self.values = df_values.to_numpy(dtype=float).round(decimals)
+        self.zmin = float(np.nanmin(self.values))
+        self.zmax = float(np.nanmax(self.values))
+
+    def year(self, year):
+        """(iso3, names, values) of the countries with a value in `year`."""
+        values = self.values[:, self.years.index(year)]
+        present = ~np.isnan(values)
+        return self.iso3[present], self.names[present], values[present]
+
+
+def choropleth(map_values, year, geometry=None, title=None, colorscale="YlGnBu", colorbar_title=None):
+    """ISO3-keyed choropleth of one year, drawn from the bundle if given."""
+    iso3, names, values = map_values.year(year)
+    trace = dict(locations=iso3, z=values, text=names, zmin=map_values.zmin, zmax=map_values.zmax,
+                 colorscale=colorscale, colorbar_title=colorbar_title,
+                 hovertemplate="%{text}<br>%{z}<extra></extra>")
+    if geometry is not None:
+        trace.update(geojson=geometry, featureidkey="id")
+    else:
+        trace.update(locationmode="ISO-3")
+    fig = go.Figure(go.Choropleth(**trace))
+    fig.update_layout(title=title, margin=dict(l=0, r=0, t=40, b=0))
+    if geometry is not None:
+        fig.update_geos(showframe=False, showcoastlines=False, projection_type="natural earth")
+    return fig
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the simplified choropleth geometry bundle")
+    parser.add_argument("--source", required=True, help="Country-level GeoJSON with ISO3 codes")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE)
+    parser.add_argument("--precision", type=int, default=PRECISION)
+    args = parser.parse_args()
+
+    missing = build_geometry(args.source, tolerance=args.tolerance, precision=args.precision)
+    print(f"Geometry saved to {GEOMETRY_JSON} ({GEOMETRY_JSON.stat().st_size / 1024:.0f} KB)")
+    topojson = write_topojson(load_geometry())
+    print(f"Base map saved to {topojson} ({topojson.stat().st_size / 1024:.0f} KB)")
+    if missing:
+        print(f"No shape for {len(missing)} countries: {', '.join(missing)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+# Correlation heatmap of the Hypotheses page, as an image or a Plotly figure
+#
+# render_heatmap() draws with matplotlib's object-oriented Figure API: no
+# pyplot, so no global figure state shared by the Streamlit session threads.
+# matplotlib and seaborn are imported on the first render, not when the app
+# starts. The encoded PNG/SVG bytes are meant to be kept in a RenderCache
+# keyed by (year, columns, format) and data version, so each combination is
+# rasterized once. heatmap_figure() is the Plotly alternative, drawn in the
+# browser.
+import io
+
+import numpy as np
+import plotly.graph_objects as go
+
+FORMATS = {"png": "image/png", "svg": "image/svg+xml"}
+# Same output as st.pyplot
+DPI = 200
+
+
+def render_heatmap(df_corr, fmt="png", figsize=(8, 4), dpi=DPI):
+    """Annotated heatmap of a correlation matrix, encoded as `fmt` bytes."""
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown image format {fmt!r}, expected one of {list(FORMATS)}")
+    import seaborn as sns
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=figsize)
+    ax = fig.subplots()
+    sns.heatmap(df_corr,
+                ax=ax,
+                annot=True,
+                fmt=".2f",
+                cmap="coolwarm",
+                cbar=True,
+                square=True,
+                linewidths=0.5,
+                annot_kws={"size": 6})
+    ax.tick_params(axis="x", labelsize=6, labelrotation=45)
+    ax.tick_params(axis="y", labelsize=6, labelrotation=0)
+    for label in ax.get_xticklabels():
+        label.set_horizontalalignment("right")
+
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format=fmt, dpi=dpi, bbox_inches="tight")
+    return buffer.getvalue()
+
+
+def heatmap_figure(df_corr, title=None):
+    """The same matrix as a Plotly heatmap (values shown in the cells)."""
+    values = df_corr.to_numpy(dtype=float)
+    fig = go.Figure(go.Heatmap(
+        z=values, x=list(df_corr.columns), y=list(df_corr.index),
+        zmin=-1, zmax=1, colorscale="RdBu", reversescale=True,
+        text=np.round(values, 2), texttemplate="%{text:.2f}", textfont={"size": 9},
+        hovertemplate="%{y} / %{x}: %{z:.3f}<extra></extra>"))
+    fig.update_layout(title=title, yaxis_autorange="reversed", xaxis_tickangle=-45)
+    return fig
@@ -0,0 +1,251 @@
+# Opt-in instrumentation of app.py reruns
+#
+# Enabled with SDG7_METRICS=1 (see sdg7.config); otherwise every call below
+# is a no-op. Each rerun of a page is timed as a whole and per named section
+# (data loading, figure builds, chart rendering, ...), together with cache
+# hits/misses and the serialized size of every chart. A finished rerun is
+# written as one JSON line to the "sdg7.metrics" logger and merged into
+# process-wide aggregates, which are served as Prometheus text by
+# start_server() and summarized (p50/p95) for the admin sidebar panel.
+import functools
+import json
+import logging
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager, nullcontext
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pandas as pd
+
+from sdg7.config import METRICS_ENABLED, METRICS_LOG
+
+logger = logging.getLogger("sdg7.metrics")
+# Recent samples kept per (page, section) for the quantiles
+MAX_SAMPLES = 1000
+QUANTILES = [0.5, 0.95]
+
+
+class _Rerun:
+    def __init__(self, page):
+        self.page = page
+        self.start = time.perf_counter()
+        self.sections = defaultdict(float)
+        self.cache = defaultdict(lambda: {"hits": 0, "misses": 0})
+        self.payload_bytes = {}
+
+
+class Metrics:
+    def __init__(self, enabled=METRICS_ENABLED):
+        self.enabled = enabled
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._samples = defaultdict(lambda: deque(maxlen=MAX_SAMPLES))
+        self._totals = defaultdict(lambda: [0, 0.0])  # (page, section) -> [count, sum]
+        self._cache = defaultdict(lambda: {"hits": 0, "misses": 0})
+        self._payload = defaultdict(lambda: [0, 0, 0])  # chart -> [last, count, sum]
+
+    # ---- recording (called from the script thread of a session) ----
+
+    def _current(self):
+        return getattr(self._local, "rerun", None)
+
+    def start_rerun(self, page):
+        if self.enabled:
+            self._local.rerun = _Rerun(page)
+
+    def end_rerun(self):
+        """Close the current rerun: log it and add it to the aggregates."""
+        rerun = self._current()
+        if rerun is None:
+            return
+        self._local.rerun = None
+        seconds = time.perf_counter() - rerun.start
+        with self._lock:
+            for name, value in [("total", seconds), *rerun.sections.items()]:
+                self._samples[rerun.page, name].append(value)
+                totals = self._totals[rerun.page, name]
+                totals[0] += 1
+                totals[1] += value
+        logger.info(json.dumps({
+            "event": "rerun",
+            "time": time.time(),
+            "page": rerun.page,
+            "seconds": round(seconds, 6),
+            "sections": {name: round(value, 6) for name, value in rerun.sections.items()},
+            "cache": rerun.cache,
+            "payload_bytes": rerun.payload_bytes,
+        }))
+
+    @contextmanager
+    def _timed(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            rerun = self._current()
+            if rerun is not None:
+                rerun.sections[name] += time.perf_counter() - start
+
+    def section(self, name):
+        """Context manager timing a named section of the current rerun (summed if repeated)."""
+        return self._timed(name) if self.enabled else nullcontext()
+
+    def cache_result(self, cache, hit):
+        if not self.enabled:
+            return
+        outcome = "hits" if hit else "misses"
+        with self._lock:
+            self._cache[cache][outcome] += 1
+        rerun = self._current()
+        if rerun is not None:
+            rerun.cache[cache][outcome] += 1
+
+    def record_payload(self, chart, fig):
+        """Serialized size of a Plotly figure sent to the browser (serializes it, so only when enabled)."""
+        if not self.enabled:
+            return
+        size = len(fig.to_json().encode())
+        with self._lock:
+            payload = self._payload[chart]
+            payload[0] = size
+            payload[1] += 1
+            payload[2] += size
+        rerun = self._current()
+        if rerun is not None:
+            rerun.payload_bytes[chart] = size
+
+    # ---- reporting ----
+
+    def summary(self):
+        """One row per (page, section): runs, mean, p50 and p95 in milliseconds."""
+        with self._lock:
+            samples = {key: np.array(values) for key, values in self._samples.items()}
+            totals = {key: tuple(value) for key, value in self._totals.items()}
+        rows = []
+        for (page, section), values in sorted(samples.items()):
+            p50, p95 = np.quantile(values, QUANTILES) * 1000
+            count, total = totals[page, section]
+            rows.append({"page": page, "section": section, "runs": count,
+                         "mean_ms": total / count * 1000, "p50_ms": p50, "p95_ms": p95})
+        return pd.DataFrame(rows, columns=["page", "section", "runs", "mean_ms", "p50_ms", "p95_ms"])
+
+    def cache_summary(self):
+        with self._lock:
+            cache = {name: dict(counts) for name, counts in self._cache.items()}
+        df_cache = pd.DataFrame.from_dict(cache, orient="index", columns=["hits", "misses"])
+        df_cache["hit_rate"] = df_cache["hits"] / (df_cache["hits"] + df_cache["misses"])
+        return df_cache.rename_axis("cache").reset_index()
+
+    def payload_summary(self):
+        with self._lock:
+            payload = {chart: tuple(values) for chart, values in self._payload.items()}
+        return pd.DataFrame([{"chart": chart, "last_bytes": last, "mean_bytes": total / count}
+                             for chart, (last, count, total) in payload.items()],
+                            columns=["chart", "last_bytes", "mean_bytes"]).sort_values("last_bytes", ascending=False)
+
+    def prometheus(self):
+        """The aggregates in the Prometheus text exposition format."""
+        def labels(**values):
+            return "{" + ",".join(f'{key}="{str(value).replace(chr(34), chr(39))}"'
+                                  for key, value in values.items()) + "}"
+
+        lines = ["# HELP sdg7_section_seconds Time spent per page rerun and named section.",
+                 "# TYPE sdg7_section_seconds summary"]
+        with self._lock:
+            samples = {key: np.array(values) for key, values in self._samples.items()}
+            totals = {key: tuple(value) for key, value in self._totals.items()}
+            cache = {name: dict(counts) for name, counts in self._cache.items()}
+            payload = {chart: tuple(values) for chart, values in self._payload.items()}
+        for (page, section), values in sorted(samples.items()):
+            for q, value in zip(QUANTILES, np.quantile(values, QUANTILES)):
+                lines.append(f"sdg7_section_seconds{labels(page=page, section=section, quantile=q)} {value:.6f}")
+            count, total = totals[page, section]
+            lines.append(f"sdg7_section_seconds_sum{labels(page=page, section=section)} {total:.6f}")
+            lines.append(f"sdg7_section_seconds_count{labels(page=page, section=section)} {count}")
+
+        lines += ["# HELP sdg7_cache_requests_total Cache lookups by cache and result.",
+                  "# TYPE sdg7_cache_requests_total counter"]
+        for name, counts in sorted(cache.items()):
+            for outcome, result in [("hits", "hit"), ("misses", "miss")]:
+                lines.append(f"sdg7_cache_requests_total{labels(cache=name, result=result)} {counts[outcome]}")
+
+        lines += ["# HELP sdg7_chart_payload_bytes Serialized size of the last render of each chart.",
+                  "# TYPE sdg7_chart_payload_bytes gauge"]
+        lines += [f"sdg7_chart_payload_bytes{labels(chart=chart)} {last}"
+                  for chart, (last, _, _) in sorted(payload.items())]
+        lines += ["# HELP sdg7_chart_payload_bytes_total Bytes of every render of each chart.",
+                  "# TYPE sdg7_chart_payload_bytes_total counter"]
+        lines += [f"sdg7_chart_payload_bytes_total{labels(chart=chart)} {total}"
+                  for chart, (_, _, total) in sorted(payload.items())]
+        return "\n".join(lines) + "\n"
+
+
+METRICS = Metrics()
+
+
+def tracked_cache(name, cache_decorator):
+    """Like cache_decorator (st.cache_resource(...) etc.), also counting hits and misses as `name`.
+
+    The wrapped function only runs on a miss, in the caller's thread, so a
+    thread-local flag tells the two apart.
+    """
+    def decorator(func):
+        local = threading.local()
+
+        @functools.wraps(func)
+        def compute(*args, **kwargs):
+            local.missed = True
+            return func(*args, **kwargs)
+
+        cached = cache_decorator(compute)
+
+        @functools.wraps(func)
+        def call(*args, **kwargs):
+            local.missed = False
+            result = cached(*args, **kwargs)
+            METRICS.cache_result(name, hit=not local.missed)
+            return result
+
+        call.clear = cached.clear
+        return call
+    return decorator
+
+
+def configure_logging(path=METRICS_LOG):
+    """JSON lines to `path` (stderr if None); idempotent."""
+    if logger.handlers:
+        return
+    handler = logging.FileHandler(path) if path else logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = METRICS.prometheus().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_server(port, host="127.0.0.1"):
+    """Serve /metrics from a daemon thread; returns the server, or None if the port is taken."""
+    try:
+        server = ThreadingHTTPServer((host, port), _Handler)
+    except OSError as error:
+        logger.warning(json.dumps({"event": "metrics_server_failed", "port": port, "error": str(error)}))
+        return None
+    threading.Thread(target=server.serve_forever, name="sdg7-metrics", daemon=True).start()
+    return server
@@ -0,0 +1,284 @@
+# Linear, random forest and XGBoost forecasters per (country, target)
+#
+# Every series is fitted by every model in a process pool (each worker limited
+# to a few BLAS/OpenMP threads so the pool does not oversubscribe the cores).
+# Fitted models and their metrics go to a content-addressed artifact cache:
+# the key hashes the series data, the model name, its hyperparameters and the
+# library versions, so re-running after a data update only retrains the series
+# that actually changed.
+#
+# The models only see the year, so the tree models predict a flat continuation
+# of the recent level; the holdout MAE (last HOLDOUT_YEARS years) is what the
+# Predictions page uses to pick the best model of each series.
+import argparse
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from sdg7.config import DATA_DIR, FORECAST_YEAR, MIN_POINTS, PROCESSED_CSV, TARGET_VARS
+from sdg7.forecast import clip_predictions
+
+ZOO_DIR = DATA_DIR / "Models"
+ARTIFACT_DIR = ZOO_DIR / "artifacts"
+RESULTS_CSV = ZOO_DIR / "zoo_results.csv"
+ZOO_VERSION = 1
+HOLDOUT_YEARS = 3
+
+MODELS = {
+    "linear": {},
+    "random_forest": {"n_estimators": 100, "min_samples_leaf": 2, "random_state": 0},
+    "xgboost": {"n_estimators": 100, "max_depth": 3, "learning_rate": 0.1, "random_state": 0},
+}
+
+# Set in each worker by _init_worker, kept alive so the limits stay applied
+_thread_limits = None
+
+
+def _library_versions(model):
+    import sklearn
+
+    versions = {"sklearn": sklearn.__version__}
+    if model == "xgboost":
+        import xgboost
+
+        versions["xgboost"] = xgboost.__version__
+    return versions
+
+
+def make_model(model, params, threads=1):
+    if model == "linear":
+        from sklearn.linear_model import LinearRegression
+
+        return LinearRegression(**params)
+    if model == "random_forest":
+        from sklearn.ensemble import RandomForestRegressor
+
+        return RandomForestRegressor(n_jobs=threads, **params)
+    if model == "xgboost":
+        from xgboost import XGBRegressor
+
+        return XGBRegressor(n_jobs=threads, **params)
+    raise ValueError(f"Unknown model: {model}")
+
+
+def artifact_key(model, params, years, values):
+    """Content hash of one (series, model, hyperparameters) fit."""
+    header = json.dumps({"zoo_version": ZOO_VERSION, "model": model, "params": params,
+                         "holdout_years": HOLDOUT_YEARS, "versions": _library_versions(model)},
+                        sort_keys=True)
+    digest = hashlib.sha256(header.encode())
+    digest.update(np.ascontiguousarray(years, dtype=np.int64).tobytes())
+    digest.update(np.ascontiguousarray(values, dtype=np.float64).tobytes())
+    return digest.hexdigest()
+
+
+def artifact_path(key, artifact_dir=ARTIFACT_DIR):
+    return artifact_dir / key[:2] / key
+
+
+def _init_worker(threads):
+    global _thread_limits
+    for var in ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS"):
+        os.environ[var] = str(threads)
+    from threadpoolctl import threadpool_limits
+
+    _thread_limits = threadpool_limits(threads)
+
+
+def _predict(model, horizons):
+    return {str(h): float(p) for h, p in zip(horizons, model.predict(np.asarray(horizons, float)[:, None]))}
+
+
+def fit_series(task):
+    """Fit one model on one series and store the artifact; returns its result dict.
+
+    Predictions are stored unclipped (artifacts are shared by identical series
+    of different targets); run() clips them per target. If the artifact exists
+    but lacks some horizons, its stored model predicts them instead.
+    """
+    model_name, params, years, values, horizons, key, artifact_dir, threads = task
+    path = artifact_path(key, artifact_dir)
+    result = _read_result(path)
+    if result is not None:
+        return _extend_result(path, result, horizons)
+    x = years.reshape(-1, 1).astype(float)
+
+    holdout_mae = np.nan
+    split = len(years) - HOLDOUT_YEARS
+    if split >= MIN_POINTS:
+        model = make_model(model_name, params, threads).fit(x[:split], values[:split])
+        holdout_mae = float(np.mean(np.abs(values[split:] - model.predict(x[split:]))))
+
+    model = make_model(model_name, params, threads).fit(x, values)
+    fitted = model.predict(x)
+    ss_res = float(np.sum((values - fitted) ** 2))
+    ss_tot = float(np.sum((values - values.mean()) ** 2))
+    result = {
+        "n": len(years),
+        "r2": 1 - ss_res / ss_tot if ss_tot > 0 else (1.0 if ss_res == 0 else 0.0),
+        "mae": float(np.mean(np.abs(values - fitted))),
+        "holdout_mae": holdout_mae,
+        "predictions": _predict(model, horizons),
+    }
+    _write_artifact(path, model, result)
+    return result
+
+
+def _extend_result(path, result, horizons):
+    """Add the missing horizons to a cached result, predicted by its stored model."""
+    missing = _missing_horizons(result, horizons)
+    if missing:
+        with open(path / "model.pkl", "rb") as f:
+            model = pickle.load(f)
+        result["predictions"].update(_predict(model, missing))
+        fd, tmp = tempfile.mkstemp(dir=path, prefix=".tmp-")
+        with os.fdopen(fd, "w") as f:
+            json.dump(result, f)
+        os.replace(tmp, path / "result.json")
+    return result
+
+
+def _write_artifact(path, model, result):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = tempfile.mkdtemp(dir=path.parent, prefix=".tmp-")
+    with open(os.path.join(tmp, "model.pkl"), "wb") as f:
+        pickle.dump(model, f)
+    with open(os.path.join(tmp, "result.json"), "w") as f:
+        json.dump(result, f)
+    try:
+        os.rename(tmp, path)
+    except OSError:
+        # Another worker stored the same artifact first
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def _read_result(path):
+    """Cached result of an artifact, None if missing."""
+    try:
+        with open(path / "result.json") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def _missing_horizons(result, horizons):
+    return [h for h in horizons if str(h) not in result["predictions"]]
+
+
+def series(df, targets=TARGET_VARS, min_points=MIN_POINTS):
+    """Yield (country, target, years, values) of every series with enough points."""
+    df = df.sort_values(["country", "year"], kind="stable")
+    for country, df_country in df.groupby("country", sort=True):
+        years = df_country["year"].to_numpy()
+        for target in targets:
+            values = df_country[target].to_numpy(dtype=float)
+            valid = ~np.isnan(values)
+            if valid.sum() >= min_points:
+                yield country, target, years[valid], values[valid]
+
+
+def run(df, models=None, horizons=(FORECAST_YEAR,), workers=None, threads_per_worker=1,
+        artifact_dir=ARTIFACT_DIR, targets=TARGET_VARS, min_points=MIN_POINTS):
+    """Fit every model on every series, reusing cached artifacts.
+
+    Returns (df_results, n_trained): one row per (country, target, model, year)
+    with n, r2, mae, holdout_mae and predicted_value, and the number of fits
+    that were not in the cache (cached fits only predict missing horizons).
+    """
+    models = MODELS if models is None else models
+    workers = workers or os.cpu_count()
+    horizons = [int(h) for h in horizons]
+
+    rows, tasks, fit_keys = [], [], set()
+    for country, target, years, values in series(df, targets, min_points):
+        for model_name, params in models.items():
+            key = artifact_key(model_name, params, years, values)
+            rows.append((country, target, model_name, key))
+            result = _read_result(artifact_path(key, artifact_dir))
+            if result is None:
+                fit_keys.add(key)
+            if result is None or _missing_horizons(result, horizons):
+                tasks.append((model_name, params, years, values, horizons, key, artifact_dir, threads_per_worker))
+
+    # Identical series share a key: fit each one once
+    tasks = list({task[5]: task for task in tasks}.values())
+    if workers == 1 or len(tasks) < 2:
+        # In the caller: limit the thread pools for these fits only, its environment is left alone
+        from threadpoolctl import threadpool_limits
+
+        with threadpool_limits(limits=threads_per_worker):
+            list(map(fit_series, tasks))
+    else:
+        chunksize = max(1, len(tasks) // (workers * 8))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(threads_per_worker,)) as pool:
+            list(pool.map(fit_series, tasks, chunksize=chunksize))
+
+    records = []
+    for country, target, model_name, key in rows:
+        result = _read_result(artifact_path(key, artifact_dir))
+        for year in horizons:
+            records.append({
+                "country": country, "target": target, "model": model_name, "key": key,
+                "n": result["n"], "r2": result["r2"], "mae": result["mae"],
+                "holdout_mae": result["holdout_mae"], "year": year,
+                "predicted_value": result["predictions"][str(year)],
+            })
+    df_results = pd.DataFrame.from_records(records)
+    for target in targets:
+        mask = df_results["target"] == target
+        df_results.loc[mask, "predicted_value"] = clip_predictions(
+            df_results.loc[mask, "predicted_value"].to_numpy()[:, None], [target])[:, 0]
+    return df_results, len(fit_keys)
+
+
+def best_models(df_results, metric="holdout_mae"):
+    """The row of the best model of each (country, target, year).
+
+    Series too short for a holdout score keep the linear trend.
+    """
+    order = {name: i for i, name in enumerate(MODELS)}
+    ranked = df_results.assign(_order=df_results["model"].map(order))
+    ranked = ranked.sort_values(["country", "target", "year", metric, "_order"], kind="stable")
+    best = ranked.drop_duplicates(["country", "target", "year"]).drop(columns="_order")
+    return best.reset_index(drop=True)
+
+
+def best_predictions_wide(df_results, year=FORECAST_YEAR, metric="holdout_mae"):
+    """Best-model predictions of one year in the predictions CSV layout."""
+    best = best_models(df_results[df_results["year"] == year], metric)
+    df_wide = best.pivot(index="country", columns="target", values="predicted_value").reset_index()
+    df_wide.columns.name = None
+    df_wide["year"] = year
+    return df_wide
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fit the model zoo per country and target.")
+    parser.add_argument("--models", nargs="+", choices=list(MODELS), default=list(MODELS))
+    parser.add_argument("--years", type=int, nargs="+", default=[FORECAST_YEAR])
+    parser.add_argument("--workers", type=int, default=None, help="Process pool size (default: CPU count)")
+    parser.add_argument("--threads-per-worker", type=int, default=1)
+    parser.add_argument("--output", default=str(RESULTS_CSV))
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    df = pd.read_csv(PROCESSED_CSV)
+    models = {name: MODELS[name] for name in args.models}
+    df_results, n_trained = run(df, models, args.years, args.workers, args.threads_per_worker)
+    df_results.to_csv(args.output, index=False)
+    n_fits = len(df_results.drop_duplicates(["country", "target", "model"]))
+    print(f"{n_fits} fits, {n_trained} trained (the rest from the cache) "
+          f"in {time.perf_counter() - start:.1f} s; results saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,21 @@
+# The pages of app.py, one module each
+#
+# A page module is imported the first time the page is opened, so its
+# plotting libraries (plotly.express, seaborn/matplotlib, scipy) and its
+# cached data prep are only paid for by the pages a session visits.
+# Every module exposes render(data), data being the shared DataIndex.
+import importlib
+
+PAGES = {
+    "Quick Summary": "quick_summary",
+    "Dashboard": "dashboard",
+    "Predictions": "predictions",
+    "What-if Scenarios": "scenarios",
+    "Country Overview": "country_overview",
+    "Hypotheses": "hypotheses",
+}
+
+
+def load_page(title):
+    """The module of a page, imported on first use."""
+    return importlib.import_module(f"{__name__}.{PAGES[title]}")
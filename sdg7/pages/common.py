@@ -0,0 +1,18 @@
+# Helpers shared by the chart pages
+import streamlit as st
+
+from sdg7.figures import FigureCache
+from sdg7.metrics import METRICS
+
+
+@st.cache_resource
+def load_figure_cache():
+    # Serialized figures keyed by (chart id, data version, widget inputs), LRU-bounded
+    return FigureCache(max_entries=128)
+
+
+def plotly_chart(fig, name, **kwargs):
+    # st.plotly_chart, timed as a section, with the chart's payload size recorded when instrumented
+    with METRICS.section(f"render {name}"):
+        st.plotly_chart(fig, **kwargs)
+    METRICS.record_payload(name, fig)
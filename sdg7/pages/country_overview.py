@@ -0,0 +1,58 @@
+# Country Overview page: one country's summary and the all-country table
+import numpy as np
+import streamlit as st
+
+from sdg7.metrics import METRICS, tracked_cache
+from sdg7.summary import SummaryCube
+
+
+@tracked_cache("summary", st.cache_resource(max_entries=2))
+def load_summary(version, _data):
+    # 2000/2020 values, changes, 2030 forecast and region rank of every country and metric
+    return SummaryCube(_data)
+
+
+def highlight_change(col):
+    # Whole column at once: green for increases, red for decreases
+    return np.where(col > 0, "color: green;", np.where(col < 0, "color: red;", ""))
+
+
+def render(data):
+    st.title(" Country Overview - 2020 Summary")
+
+    st.markdown("""
+    This section provides a country-by-country summary of key sustainable energy indicators for the year 2020.
+    Use the selector below to choose a country and explore its performance in terms of electricity access, clean fuels, emissions, and more.
+    """)
+
+    with METRICS.section("load summary"):
+        summary = load_summary(data.version, data)
+
+    selected_country = st.selectbox("Select a country:", summary.countries)
+
+    if selected_country:
+        st.markdown(f"### General Results for {selected_country} (2020 vs 2000)")
+
+        with METRICS.section("render country table"):
+            df_summary = summary.country(selected_country)
+            st.dataframe(df_summary.style.apply(highlight_change, subset=["% Change"]), use_container_width=True)
+
+        st.markdown("---")
+        st.markdown("**Additional context:**")
+        st.write("Region:", summary.region(selected_country))
+        st.write("Income classification or further metrics could be added here.")
+
+    st.markdown("### All Countries")
+    st.markdown("Click a column header to sort. Rank in region: 1 = highest 2020 value in the region.")
+    summary_metric = st.selectbox("Metric:", summary.metrics, key="summary_metric")
+    with METRICS.section("render all-country table"):
+        df_table = summary.table(summary_metric)
+        # Plain frame (no Styler): styling every cell of the full table costs more than the rest of the page
+        st.dataframe(df_table, use_container_width=True, hide_index=True,
+                     column_config={"% Change": st.column_config.NumberColumn(format="%.2f %%")})
+    with METRICS.section("exports"):
+        col_csv, col_parquet = st.columns(2)
+        col_csv.download_button("Download all metrics (CSV)", summary.export("csv"),
+                                file_name="sdg7_country_summary.csv", mime="text/csv")
+        col_parquet.download_button("Download all metrics (Parquet)", summary.export("parquet"),
+                                    file_name="sdg7_country_summary.parquet", mime="application/octet-stream")
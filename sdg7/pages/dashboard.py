@@ -0,0 +1,99 @@
+# Dashboard page: electricity access over time, the map and the 2020 CO₂ charts
+import plotly.express as px
+import streamlit as st
+
+from sdg7.data_access import CO2_QUARTILE_LABELS
+from sdg7.downsample import downsample, regional_bands
+from sdg7.figures import band_chart, scatter_with_trendline
+from sdg7.geo import TOPOJSON_DIR, TOPOJSON_NAME, MapValues, choropleth, load_geometry
+from sdg7.metrics import tracked_cache
+from sdg7.pages.common import load_figure_cache, plotly_chart
+
+
+@tracked_cache("map_values", st.cache_resource(max_entries=2))
+def load_map_values(version, _data):
+    # Electricity access by ISO3 code for every year of the map selector
+    return MapValues(_data, "access_to_electricity", [2000, 2010, 2020, 2030])
+
+
+def map_config():
+    # plotly.js loads its world base map even for GeoJSON maps: from the app's static files when they are served
+    if st.get_option("server.enableStaticServing") and (TOPOJSON_DIR / f"{TOPOJSON_NAME}.json").exists():
+        return {"topojsonURL": "app/static/topojson/"}
+    return {}
+
+
+def render(data):
+    figures = load_figure_cache()
+    st.title(" Global Trends Dashboard")
+    # ------------------ visual 1 ------------------
+    st.subheader("Access to Electricity Over Time")
+    st.markdown("""
+    Displays the evolution of access to electricity access (% of population) from 2000 to 2020 for selected countries.
+    """)
+    electricity_view = st.radio("View", ["Countries", "Regional aggregate"], horizontal=True, key="electricity_view",
+                                help="Regional aggregate: mean and 25th-75th percentile band of all countries per region.")
+    countries_to_plot = st.multiselect("Select countries", data.country_names, default=["India", "Kenya", "Germany"],
+                                       key="electricity_countries", disabled=electricity_view != "Countries")
+    if electricity_view == "Countries":
+        # Long selections / fine-grained data are trimmed to the chart point budget (min-max per country)
+        fig1 = figures.get("electricity_over_time", data.version, tuple(sorted(countries_to_plot)), lambda: px.line(
+            downsample(data.countries(countries_to_plot), "year", "access_to_electricity", by="country"),
+            x="year", y="access_to_electricity", color="country", title="Access to Electricity Over Time"))
+    else:
+        fig1 = figures.get("electricity_by_region", data.version, (), lambda: band_chart(
+            regional_bands(data.df_cleaned, "year", "access_to_electricity"), "year",
+            title="Access to Electricity Over Time by Region", y_title="access_to_electricity"))
+    plotly_chart(fig1, "electricity_over_time", use_container_width=True, key="chart_electricity")
+
+    st.subheader("Access to Electricity Change by Year")
+    year_map = st.selectbox("Select a year", [2000, 2010, 2020, 2030])
+    st.markdown("""
+    Shows the percentage of the population with access to electricity by country for a selected year (2000, 2010, 2020, or 2030). Darker colors indicate higher access levels. This map allows for global comparisons at a glance.
+    """)
+    def build_map():
+        return choropleth(load_map_values(data.version, data), year_map, load_geometry(),
+                          title=f"Access to Electricity in {year_map}", colorbar_title="access_to_electricity")
+
+    fig_map = figures.get("electricity_map", data.version, (year_map,), build_map)
+    plotly_chart(fig_map, "electricity_map", use_container_width=True, config=map_config())
+
+    st.subheader("Renewable Capacity vs Access to Electricity")
+    st.markdown("""
+    Examines the correlation between renewable electricity capacity per capita (in Watts) and access to electricity. This helps determine whether investment in renewables correlates with broader electrification.""")
+    df_2020_features = data.year(2020)
+    fig3 = figures.get("renewables_vs_access", data.version, (), lambda: scatter_with_trendline(
+        df_2020_features, x="renewable_capacity_per_capita", y="access_to_electricity",
+        color="country", title="Renewable Capacity vs Electricity Access (2020)"))
+    plotly_chart(fig3, "renewables_vs_access", use_container_width=True, key="chart_scatter")
+
+    st.subheader("CO₂ Emissions Distribution in 2020")
+    st.markdown(""" Shows the spread and outliers of CO₂ emissions (in kilotonnes) across countries in 2020. It highlights countries with extremely high or low emission values and the median range.
+""")
+    fig4 = figures.get("co2_box", data.version, (), lambda: px.box(
+        df_2020_features, y="co2_emissions_kt", title="Distribution of CO₂ Emissions"))
+    plotly_chart(fig4, "co2_box", use_container_width=True, key="chart_emissions")
+
+    # Histogram of CO₂ emissions
+    fig_hist_co2 = figures.get("co2_hist", data.version, (), lambda: px.histogram(
+        df_2020_features, x="co2_emissions_kt", nbins=50, title="Histogram of CO₂ Emissions (2020)"))
+    st.markdown("""Displays the distribution of countries based on their CO₂ emissions in 2020. Useful to understand how emissions are concentrated across different emission ranges.
+""")
+    plotly_chart(fig_hist_co2, "co2_hist", use_container_width=True)
+
+    # Box plot of CO₂ emissions by region
+    st.markdown("""Compares CO₂ emission levels grouped by continent. This allows users to spot regional disparities and understand the geographic distribution of climate impact.
+""")
+    fig_box_region = figures.get("co2_by_region", data.version, (), lambda: px.box(
+        df_2020_features, x="region", y="co2_emissions_kt", color="region",
+        title="CO₂ Emissions by Region (2020)", points="all", hover_name="country"))
+    plotly_chart(fig_box_region, "co2_by_region", use_container_width=True)
+
+    # Divide CO₂ emissions into quartiles
+    st.markdown("""Divides countries into quartiles based on their CO₂ emission levels. This segmentation helps identify trends and compare emission patterns among the lowest and highest emitting nations.
+""")
+    fig_quartile = figures.get("co2_by_quartile", data.version, (), lambda: px.box(
+        df_2020_features, x="co2_quartile", y="co2_emissions_kt",
+        title="CO₂ Emissions by Quartile (2020)", color="co2_quartile", points="all", hover_name="country",
+        category_orders={"co2_quartile": CO2_QUARTILE_LABELS}))
+    plotly_chart(fig_quartile, "co2_by_quartile", use_container_width=True)
@@ -0,0 +1,175 @@
+# Hypotheses page: correlation heatmap and the four hypothesis tests
+import plotly.express as px
+import streamlit as st
+
+from sdg7.correlations import CorrelationCube, growth_frames
+from sdg7.data_access import DERIVED_COLUMNS, year_key
+from sdg7.downsample import downsample, regional_bands
+from sdg7.figures import RenderCache, band_chart, scatter_with_trendline
+from sdg7.heatmap import heatmap_figure, render_heatmap
+from sdg7.metrics import METRICS, tracked_cache
+from sdg7.pages.common import load_figure_cache, plotly_chart
+
+
+@st.cache_resource
+def load_image_cache():
+    # PNG bytes of the matplotlib heatmap keyed by (chart id, data version, year/columns/format), LRU-bounded
+    return RenderCache(max_entries=64, max_size_bytes=32 * 1024 * 1024, name="images")
+
+
+@tracked_cache("correlations", st.cache_resource)
+def load_correlations(version, _data):
+    # r and p for every column pair (bootstrap CIs on first use): levels per year and changes since 2000
+    columns = [c for c in _data.df_cleaned.select_dtypes(include="number").columns
+               if c not in ["year"] + DERIVED_COLUMNS]
+    levels = CorrelationCube.from_years(_data.df_cleaned, columns)
+    growth_columns = ["renewable_capacity_per_capita", "co2_emissions_kt"]
+    changes = CorrelationCube(growth_frames(_data.df_cleaned, growth_columns, 2000), growth_columns)
+    return levels, changes
+
+
+def correlation_text(cube, x, y, year):
+    pearson = cube.pair(x, y, year)
+    spearman = cube.pair(x, y, year, method="spearman", ci=False)
+    return (f"**Correlation coefficient (r):** {pearson['r']:.2f} | **p-value:** {pearson['p']:.4f} | "
+            f"**95% CI:** [{pearson['low']:.2f}, {pearson['high']:.2f}] | **Spearman ρ:** {spearman['r']:.2f}")
+
+
+def render(data):
+    figures = load_figure_cache()
+    st.title(" Hypotheses and Validation")
+    with METRICS.section("load correlations"):
+        correlations, growth_correlations = load_correlations(data.version, data)
+    year = st.select_slider("Select a year", options=correlations.labels, value=2020, key="hypotheses_year")
+    df_year = data.year(year)
+    tab1, tab2, tab3, tab4, tab5 = st.tabs(["Correlation Heatmap", "Hypotheses Tests 1", "Hypotheses Tests 2", "Hypotheses Tests 3", "Hypotheses Test 4"])
+
+    with tab1:
+        st.subheader(f"Heatmap of Correlation Between Variables ({year})")
+        st.markdown(f"""
+        This heatmap shows how numerical variables correlate in {year}.
+        Red = strong positive correlation, blue = strong negative.
+        Look for variables that move together (strong correlation) or in opposite directions (negative correlation).
+        """)
+
+        df_year_corr = correlations.matrix(year)
+        heatmap_mode = st.radio("Heatmap", ["Image", "Interactive"], horizontal=True, key="heatmap_mode",
+                                help="Image: drawn with seaborn once per year and cached. "
+                                     "Interactive: Plotly heatmap drawn in the browser.")
+        heatmap_inputs = (year, tuple(df_year_corr.columns))
+        if heatmap_mode == "Image":
+            png = load_image_cache().get_rendered("correlation_heatmap", data.version, heatmap_inputs + ("png",),
+                                                  lambda: render_heatmap(df_year_corr, fmt="png"))
+            with METRICS.section("render heatmap"):
+                st.image(png, use_container_width=True)
+        else:
+            fig_heatmap = figures.get("correlation_heatmap", data.version, heatmap_inputs, lambda: heatmap_figure(
+                df_year_corr, title=f"Correlation Between Variables ({year})"))
+            plotly_chart(fig_heatmap, "correlation_heatmap", use_container_width=True, key="correlation_heatmap")
+
+    with tab2:
+        st.subheader("Hypothesis 1: GDP per Capita vs Access to Clean Fuels")
+        st.markdown("""
+        This hypothesis explores if richer countries (higher GDP per capita) also provide more access to clean cooking fuels.
+        We expect a positive correlation if economic development supports energy access.
+        """)
+        fig_h1 = figures.get("h1_scatter", data.version, (year,), lambda: scatter_with_trendline(
+            df_year, x="gdp_per_capita", y="access_to_clean_fuels", color="country",
+            title="GDP per Capita vs Access to Clean Fuels"))
+        plotly_chart(fig_h1, "h1_scatter", use_container_width=True, key="h1_scatter")
+        st.markdown(correlation_text(correlations, "gdp_per_capita", "access_to_clean_fuels", year))
+        st.info("This hypothesis suggests that economic prosperity improves energy access. A significant positive correlation would support this assumption.")
+
+        fig_violin = figures.get("h1_violin", data.version, (year,), lambda: px.violin(
+            df_year, y="access_to_clean_fuels", x="gdp_quartile", box=True,
+            title="Distribution of Clean Fuel Access by GDP Quartiles"))
+        plotly_chart(fig_violin, "h1_violin", use_container_width=True, key="h1_violin")
+        st.markdown("Higher GDP quartiles should ideally show higher access levels. This violin plot groups countries by income level to visually assess disparities.")
+
+    with tab3:
+        st.subheader("Hypothesis 2: Renewable Growth vs Access to Electricity")
+        st.markdown("""
+        This test checks whether countries that invest more in renewable energy per person also have higher access to electricity.
+        This helps understand if renewable capacity supports electrification.
+        """)
+        fig_h2 = figures.get("h2_scatter", data.version, (year,), lambda: scatter_with_trendline(
+            df_year, x="renewable_capacity_per_capita", y="access_to_electricity", color="country",
+            title="Renewable Capacity per Capita vs Access to Electricity"))
+        plotly_chart(fig_h2, "h2_scatter", use_container_width=True, key="h2_scatter")
+        st.markdown(correlation_text(correlations, "renewable_capacity_per_capita", "access_to_electricity", year))
+
+        fig_diff = figures.get("h2_hist", data.version, (year,), lambda: px.histogram(
+            df_year, x="difference", nbins=30, title="Difference between Access to Electricity and Renewable Capacity per Capita"))
+        plotly_chart(fig_diff, "h2_hist", use_container_width=True, key="h2_hist")
+        st.markdown("This histogram shows if high renewable capacity aligns well with electricity access. Smaller differences suggest better alignment.")
+
+    with tab4:
+        st.subheader("Hypothesis 3: Renewable Energy Share vs Energy Intensity")
+        st.markdown("""
+
+        This hypothesis tests whether a higher share of renewable energy in total consumption leads to more efficient energy usage (lower energy intensity).
+        """)
+        fig_h3 = figures.get("h3_scatter", data.version, (year,), lambda: scatter_with_trendline(
+            df_year, x="renewable_energy_share", y="energy_intensity", color="country",
+            title="Renewable Energy Share vs Energy Intensity"))
+        plotly_chart(fig_h3, "h3_scatter", use_container_width=True, key="h3_scatter")
+
+        st.markdown(f"""
+                This chart displays the distribution of energy intensity across world regions in {year}.
+                Lower energy intensity indicates better efficiency. Outliers represent countries with unusually high or low energy consumption relative to GDP.
+                """)
+        fig_box = figures.get("h3_box", data.version, (year,), lambda: px.box(
+            df_year,
+            x="region",
+            y="energy_intensity",
+            color="region",
+            title=f"Energy Intensity by Region ({year})",
+            points="all"))  # Muestra puntos además del boxplot
+        plotly_chart(fig_box, "h3_box", use_container_width=True)
+        st.info("""
+            This visualization compares the energy intensity of countries grouped by region.
+            Lower energy intensity indicates greater energy efficiency. The boxplot helps us observe whether regions
+            with higher renewable energy share tend to have lower energy intensity, supporting the hypothesis that renewables improve efficiency.
+            """)
+        st.markdown(correlation_text(correlations, "renewable_energy_share", "energy_intensity", year))
+
+
+    with tab5:
+        st.subheader("Hypothesis 4: Renewable Capacity Growth vs CO₂ Emission Growth")
+        st.markdown(f"""
+        This chart compares the change in renewable energy capacity with the change in CO₂ emissions between 2000 and {year}.
+        If renewable capacity increases and emissions decrease, we expect a **negative correlation**, suggesting that renewables help reduce emissions.
+        """)
+        df_growth = data.years([2000, year])[
+            ["country", "year", "renewable_capacity_per_capita", "co2_emissions_kt"]
+        ].dropna()
+
+        if not df_growth.empty and df_growth["year"].nunique() == 2:
+            df_pivot = df_growth.pivot(index="country", columns="year", values=["renewable_capacity_per_capita", "co2_emissions_kt"])
+            df_pivot.columns = [f"{col}_{year_key(yr)}" for col, yr in df_pivot.columns.values]
+            df_pivot = df_pivot.dropna()
+            df_pivot["renewable_growth"] = df_pivot[f"renewable_capacity_per_capita_{year}"] - df_pivot["renewable_capacity_per_capita_2000"]
+            df_pivot["co2_growth"] = df_pivot[f"co2_emissions_kt_{year}"] - df_pivot["co2_emissions_kt_2000"]
+            df_pivot.reset_index(inplace=True)
+
+            fig_h4 = figures.get("h4_scatter", data.version, (year,), lambda: scatter_with_trendline(
+                df_pivot, x="renewable_growth", y="co2_growth", color="country",
+                title=f"Renewable Capacity Growth vs CO₂ Emission Growth (2000–{year})"))
+            plotly_chart(fig_h4, "h4_scatter", use_container_width=True, key="h4_scatter", hover_name="country")
+
+            arrow_view = st.radio("View", ["Countries", "Regional aggregate"], horizontal=True, key="h4_arrow_view",
+                                  help="Regional aggregate: mean and 25th-75th percentile band of the countries per region.")
+            if arrow_view == "Countries":
+                fig_arrow = figures.get("h4_arrow", data.version, (year,), lambda: px.line(
+                    downsample(df_growth, "year", "co2_emissions_kt", by="country"), x="year", y="co2_emissions_kt",
+                    color="country", title=f"CO₂ Emission Change per Country (2000–{year})", markers=True))
+            else:
+                fig_arrow = figures.get("h4_arrow_regions", data.version, (year,), lambda: band_chart(
+                    regional_bands(data.df_cleaned.loc[df_growth.index], "year", "co2_emissions_kt"), "year",
+                    title=f"CO₂ Emission Change per Region (2000–{year})", y_title="co2_emissions_kt"))
+            plotly_chart(fig_arrow, "h4_arrow", use_container_width=True, key="h4_arrow", hover_name="country")
+
+            st.markdown(correlation_text(growth_correlations, "renewable_capacity_per_capita", "co2_emissions_kt", year))
+            st.info("This hypothesis assumes that expanding renewables leads to emission reductions. A strong negative correlation would support this. The arrow chart visualizes emission evolution per country.")
+        else:
+            st.warning("Not enough data to evaluate Hypothesis 4. Please check the dataset.")
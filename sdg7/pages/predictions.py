@@ -0,0 +1,59 @@
+# Predictions page: 2020 vs 2030 clean fuel access, linear trend or best model per series
+import pandas as pd
+import plotly.express as px
+import streamlit as st
+
+from sdg7.metrics import METRICS, tracked_cache
+from sdg7.model_zoo import RESULTS_CSV, best_models, best_predictions_wide
+from sdg7.pages.common import plotly_chart
+from sdg7.store import file_hash
+
+
+@tracked_cache("model_zoo", st.cache_resource(max_entries=2))
+def load_model_zoo(results_hash, version, _data):
+    # Best of linear / random forest / XGBoost per series (lowest holdout MAE), from `python -m sdg7.model_zoo`
+    df_results = pd.read_csv(RESULTS_CSV)
+    df_results = df_results[df_results["year"] == 2030]
+    return best_models(df_results), _data.combine(best_predictions_wide(df_results, 2030))
+
+
+def render(data):
+    st.title(" Predictions for 2030")
+    forecast_model = "Linear trend"
+    if RESULTS_CSV.exists():
+        forecast_model = st.radio("Forecast model", ["Linear trend", "Best model per series"], horizontal=True,
+                                  key="forecast_model",
+                                  help="Best of linear, random forest and XGBoost per country and indicator, "
+                                       "by mean absolute error on the last 3 years held out.")
+    if forecast_model == "Linear trend":
+        df_combined = data.combined
+    else:
+        with METRICS.section("load model zoo"):
+            df_best, df_combined = load_model_zoo(file_hash(RESULTS_CSV), data.version, data)
+        with st.expander("Model chosen per series"):
+            st.dataframe(pd.crosstab(df_best["target"], df_best["model"]), use_container_width=True)
+
+    st.subheader("Access to Clean Fuels in 2020 vs 2030")
+
+    top_clean = df_combined.sort_values("clean_growth", ascending=False).head(10)
+    bottom_clean = df_combined.sort_values("clean_growth", ascending=True).head(10)
+
+    st.markdown("### Top 10 Countries with Highest Growth in Clean Fuels")
+    with METRICS.section("build top_clean"):
+        fig_top_clean = px.bar(top_clean, x="country", y=["access_to_clean_fuels_2020", "access_to_clean_fuels"],
+                               barmode="group", title="Top 10 Countries - Clean Fuels Access Growth (2020-2030)")
+    plotly_chart(fig_top_clean, "top_clean", use_container_width=True)
+
+    st.markdown("### Top 10 Countries with Lowest Growth in Clean Fuels")
+    with METRICS.section("build bottom_clean"):
+        fig_bottom_clean = px.bar(bottom_clean, x="country", y=["access_to_clean_fuels_2020", "access_to_clean_fuels"],
+                                  barmode="group", title="Bottom 10 Countries - Clean Fuels Access Growth (2020-2030)")
+    plotly_chart(fig_bottom_clean, "bottom_clean", use_container_width=True)
+
+    custom_clean = st.multiselect("Select additional countries to compare (Clean Fuels):", df_combined["country"].unique())
+    if custom_clean:
+        df_selected_clean = df_combined[df_combined["country"].isin(custom_clean)]
+        with METRICS.section("build custom_clean"):
+            fig_custom_clean = px.bar(df_selected_clean, x="country", y=["access_to_clean_fuels_2020", "access_to_clean_fuels"],
+                                      barmode="group", title="Selected Countries - Clean Fuels Access (2020 vs 2030)")
+        plotly_chart(fig_custom_clean, "custom_clean", use_container_width=True)
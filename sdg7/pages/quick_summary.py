@@ -0,0 +1,91 @@
+# Quick Summary page: project context, objectives and variables (static)
+import streamlit as st
+
+
+def render(data):
+    st.markdown("""
+    <h1 style='text-align: center;'>Sustainable Development Goal 7: Affordable and Clean Energy 🌍</h1>
+    """, unsafe_allow_html=True)
+
+    st.markdown("""
+    <div style="display: flex; justify-content: center;">
+    <div style="max-width: 900px; width: 100%;">
+        <div style="background-color:#0c1c2c; padding: 20px; border-radius: 8px; color: white;">
+        <h3> Project Context</h3>
+        <p><strong>Sustainable Development Goal 7 (SDG 7)</strong> aims to ensure access to affordable, reliable, sustainable, and modern energy for all by 2030.
+        This project uses data analytics and machine learning to analyse trends and make predictions for 175 countries.</p>
+        <ul>
+            <li> Covers data from 2000 to 2020, with forecasts for 2030.</li>
+            <li> 13 key indicators including access to electricity, renewable energy, emissions, and GDP.</li>
+            <li> Data Source: <a href="https://www.kaggle.com/datasets/anshtanwar/global-data-on-sustainable-energy" target="_blank" style="color:#2dcdd5;">Kaggle Dataset</a></li>
+            <li> It includes more than 3,500 records of annual data per country from 2000 to 2020 with linear predictions for 2030</li>
+        </ul>
+        </div>
+    </div>
+    </div>
+    """, unsafe_allow_html=True)
+
+
+    st.markdown("""
+    <div style="display: flex; justify-content: center;">
+    <div style="max-width: 900px; width: 100%;">
+        <div style="background-color:#073f24; padding: 20px; border-radius: 8px; color: #ccebd4; border-left: 6px solid #00cc66;">
+        <h3> Project Objectives</h3>
+        <ol>
+            <li><strong>Understand key relationships:</strong> Explore how indicators such as renewable energy share and fossil electricity correlate with energy access and emissions.</li>
+            <li><strong>Forecast for 2030:</strong> Predict access to electricity, access to clean fuels, and CO₂ emissions using linear regression models per country.</li>
+            <li><strong>Support global analysis:</strong> Identify at-risk countries to help inform policy recommendations aligned with SDG 7.</li>
+        </ol>
+        </div>
+    </div>
+    </div>
+    """, unsafe_allow_html=True)
+
+
+
+    st.markdown("""
+    <div style="display: flex; justify-content: center;">
+    <div style="max-width: 900px; width: 100%;">
+        <div style="background-color:#132743; padding: 20px; border-radius: 8px; color: #d6ecf2;">
+        <h3> Key Dataset Variables</h3>
+        <table style="width:100%; border-collapse: collapse;">
+            <tr style="background-color:#1c3d5a;">
+            <th style="padding: 8px; border: 1px solid #395870;">Variable</th>
+            <th style="padding: 8px; border: 1px solid #395870;">Meaning</th>
+            <th style="padding: 8px; border: 1px solid #395870;">Units</th>
+            </tr>
+            <tr>
+            <td style="padding: 8px;">access_to_electricity</td>
+            <td style="padding: 8px;">Population with electricity access</td>
+            <td style="padding: 8px;">% of total population</td>
+            </tr>
+            <tr>
+            <td style="padding: 8px;">access_to_clean_fuels</td>
+            <td style="padding: 8px;">Population with access to clean cooking fuels</td>
+            <td style="padding: 8px;">% of total population</td>
+            </tr>
+            <tr>
+            <td style="padding: 8px;">renewable_capacity_per_capita</td>
+            <td style="padding: 8px;">Renewable capacity installed per person</td>
+            <td style="padding: 8px;">Watts/person</td>
+            </tr>
+            <tr>
+            <td style="padding: 8px;">fossil_electricity</td>
+            <td style="padding: 8px;">Share of electricity from fossil sources</td>
+            <td style="padding: 8px;">%</td>
+            </tr>
+            <tr>
+            <td style="padding: 8px;">co2_emissions_kt</td>
+            <td style="padding: 8px;">Annual CO₂ emissions</td>
+            <td style="padding: 8px;">Kilotonnes</td>
+            </tr>
+            <tr>
+            <td style="padding: 8px;">gdp_per_capita</td>
+            <td style="padding: 8px;">Gross domestic product per person</td>
+            <td style="padding: 8px;">USD</td>
+            </tr>
+        </table>
+        </div>
+    </div>
+    </div>
+    """, unsafe_allow_html=True)
@@ -0,0 +1,123 @@
+# What-if Scenarios page: 2021-2030 trajectories under adjusted growth, with Monte Carlo bands
+import time
+
+import plotly.graph_objects as go
+import streamlit as st
+from plotly.colors import qualitative
+
+from sdg7.config import PERCENT_TARGETS
+from sdg7.figures import band_chart
+from sdg7.metrics import METRICS, tracked_cache
+from sdg7.pages.common import plotly_chart
+from sdg7.scenarios import BASES, GOAL, SUM_TARGETS, ScenarioEngine
+
+ADJUSTMENT_RANGE = (-100, 200)
+
+
+@tracked_cache("scenarios", st.cache_resource(max_entries=2))
+def load_scenario_engine(version, _data):
+    # Trends, recent slopes and Monte Carlo residual draws of every series, once per data version
+    return ScenarioEngine(_data)
+
+
+def scenario_inputs(engine):
+    # Widgets of every target are rendered (one tab each) so their values persist while another target is shown
+    bases, region_pct, country_pct = {}, {}, {}
+    for target, tab in zip(engine.targets, st.tabs(engine.targets)):
+        with tab:
+            bases[target] = st.radio("Trend basis", list(BASES), format_func=BASES.get, horizontal=True,
+                                     key=f"scenario_basis_{target}",
+                                     help="Full-period trend: linear fit on all years (as on the Predictions page). "
+                                          f"Recent slope: fit on {engine.recent_start}-{engine.base_year} only.")
+            columns = st.columns(3)
+            region_pct[target] = {
+                region: columns[i % len(columns)].slider(region, *ADJUSTMENT_RANGE, 0, step=10, format="%d%%",
+                                                         key=f"scenario_{target}_{region}")
+                for i, region in enumerate(engine.region_names)
+            }
+            selected = st.multiselect("Country overrides", engine.countries, key=f"scenario_countries_{target}")
+            value = st.slider("Growth adjustment of the selected countries", *ADJUSTMENT_RANGE, 0, step=10,
+                              format="%d%%", key=f"scenario_country_pct_{target}", disabled=not selected)
+            country_pct[target] = dict.fromkeys(selected, value)
+    return bases, region_pct, country_pct
+
+
+def country_figure(data, result, target, countries):
+    # Observed series, then the scenario line with its 90% band (the fill defaults to the line colour, half transparent)
+    fig = go.Figure()
+    colors = qualitative.Plotly
+    df_projection = result.country_frame(target, countries)
+    for i, (country, df_country) in enumerate(df_projection.groupby("country", sort=False)):
+        color = colors[i % len(colors)]
+        df_observed = data.country(country)
+        fig.add_trace(go.Scatter(x=df_observed["year"], y=df_observed[target], mode="lines", name=country,
+                                 line=dict(color=color), legendgroup=country))
+        fig.add_trace(go.Scatter(x=df_country["year"], y=df_country["high"], mode="lines",
+                                 line=dict(width=0, color=color), legendgroup=country, showlegend=False,
+                                 hoverinfo="skip"))
+        fig.add_trace(go.Scatter(x=df_country["year"], y=df_country["low"], mode="lines",
+                                 line=dict(width=0, color=color), fill="tonexty", legendgroup=country,
+                                 showlegend=False, hoverinfo="skip"))
+        fig.add_trace(go.Scatter(x=df_country["year"], y=df_country["central"], mode="lines",
+                                 line=dict(color=color, dash="dash"), legendgroup=country, showlegend=False,
+                                 customdata=df_country[["low", "high"]].to_numpy(),
+                                 hovertemplate=(f"<b>{country}</b><br>%{{x}}: %{{y:.4g}}<br>"
+                                                "90%: %{customdata[0]:.4g} - %{customdata[1]:.4g}<extra></extra>")))
+    fig.update_layout(title=f"{target}: observed and scenario", xaxis_title="year", yaxis_title=target)
+    return fig
+
+
+def goal_counts(df_goal):
+    # Countries missing the goal per access target, 0 for a target no country misses
+    return df_goal["target"].value_counts().reindex(PERCENT_TARGETS, fill_value=0)
+
+
+def render(data):
+    st.title(" What-if Scenarios 2021-2030")
+    st.markdown("""
+    Adjust how fast each indicator keeps growing, per region or for selected countries, and see the 2021-2030 trajectories of every country, region and the world.
+    A slider scales the trend slope: **+50%** grows 1.5 times as fast as the trend, **-100%** freezes the indicator at its 2020 trend value.
+    Bands are the 90% interval of Monte Carlo simulations built from each country's historical deviations from its trend.
+    """)
+    with METRICS.section("load scenarios"):
+        engine = load_scenario_engine(data.version, data)
+
+    bases, region_pct, country_pct = scenario_inputs(engine)
+    # Filled in at the end: the simulations are drawn as each chart and the goal table ask for them
+    timing = st.empty()
+    start = time.perf_counter()
+    with METRICS.section("simulate"):
+        result = engine.run(bases, engine.multipliers(region_pct, country_pct))
+
+    target = st.selectbox("Indicator", engine.targets, key="scenario_target")
+    aggregate = "total" if target in SUM_TARGETS else "mean of the countries"
+    st.subheader("Regions and world")
+    with METRICS.section("build scenario_regions"):
+        fig_regions = band_chart(result.aggregate_frame(target), "year",
+                                 title=f"{target} by region ({aggregate}), observed and scenario",
+                                 y_title=target, band_label="90% simulation interval")
+    plotly_chart(fig_regions, "scenario_regions", use_container_width=True, key="scenario_regions")
+
+    st.subheader("Countries")
+    countries = st.multiselect("Select countries", engine.countries,
+                               default=[c for c in ["India", "Kenya", "Germany"] if c in engine],
+                               key="scenario_countries")
+    if countries:
+        with METRICS.section("build scenario_countries"):
+            fig_countries = country_figure(data, result, target, countries)
+        plotly_chart(fig_countries, "scenario_countries", use_container_width=True, key="scenario_countries_chart")
+
+    st.subheader(f"SDG 7.1: universal access by {engine.years[-1]}")
+    with METRICS.section("simulate goal"):
+        df_goal = result.goal_table()
+    st.markdown(f"""
+    Countries whose median {engine.years[-1]} access stays below {GOAL}% under this scenario.
+    *P(reach goal)* is the share of simulations in which the country gets there.
+    """)
+    missed = goal_counts(df_goal)
+    for column, (goal_target, count) in zip(st.columns(len(missed)), missed.items()):
+        column.metric(f"Miss the goal: {goal_target}", f"{count} countries")
+    st.dataframe(df_goal, use_container_width=True, hide_index=True,
+                 column_config={"P(reach goal)": st.column_config.NumberColumn(format="%.2f")})
+    timing.caption(f"{len(engine.countries)} countries x {engine.n_sims} simulations: trajectories, bands and "
+                   f"the goal table recomputed in {(time.perf_counter() - start) * 1000:.0f} ms.")
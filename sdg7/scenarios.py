@@ -0,0 +1,299 @@
+# What-if scenarios for the 2030 targets
+#
+# The linear trend of every (country, target) series is fitted once per data
+# version (with forecast.fit_trends), next to the trend of the recent years
+# only, and the Monte Carlo draws are prepared from the historical residuals:
+# a residual-bootstrap perturbation of each slope and a resampled residual
+# for every projected year. A scenario (a basis and growth adjustments per
+# target, by region or country) is then a broadcast over [country, year,
+# simulation] arrays of the series that are shown: no model is refitted, so
+# the page can recompute its trajectories, bands and aggregates on each
+# slider move.
+import numpy as np
+import pandas as pd
+
+from sdg7.config import FORECAST_YEAR, MIN_POINTS, PERCENT_TARGETS, TARGET_VARS
+from sdg7.forecast import build_panel, clip_predictions, fit_trends
+
+BASES = {"trend": "Full-period trend", "recent": "Recent slope"}
+# Aggregated as the total over countries; the other targets as the mean of the countries
+SUM_TARGETS = ["co2_emissions_kt"]
+WORLD = "World"
+# SDG 7.1: universal access; a country counts as reaching it from 99.5 %
+GOAL = 100
+GOAL_TOLERANCE = 0.5
+QUANTILES = (0.05, 0.5, 0.95)
+
+
+def sorted_quantiles(sorted_values, quantiles=QUANTILES):
+    """Linear-interpolated quantiles along the last (sorted) axis, stacked on a new first axis.
+
+    Same result as np.quantile, but sorting a contiguous axis is several times
+    faster than np.quantile's selection for a few hundred simulations.
+    """
+    pos = np.asarray(quantiles) * (sorted_values.shape[-1] - 1)
+    low = np.floor(pos).astype(int)
+    high = np.minimum(low + 1, sorted_values.shape[-1] - 1)
+    frac = (pos - low).astype(sorted_values.dtype)
+    return np.stack([sorted_values[..., lo] * (1 - f) + sorted_values[..., hi] * f
+                     for lo, hi, f in zip(low, high, frac)])
+
+
+class ScenarioEngine:
+    """Fitted trends and Monte Carlo draws of every (country, target) series.
+
+    Projections start from the fitted line at base_year and run to horizon;
+    the "recent" basis uses the trend over recent_start..base_year (falling
+    back to the full-period trend where it has fewer than 3 points). The
+    uncertainty comes from the full-period residuals either way. Arrays are
+    indexed [target, country, ...]; simulations are float32.
+
+    Draws come in antithetic pairs (each resampled deviation and its
+    negation) plus one draw on the trend itself, so with an odd n_sims the
+    median simulation is the projected trend, clipped or not.
+    """
+
+    def __init__(self, data, targets=TARGET_VARS, base_year=2020, horizon=FORECAST_YEAR, recent_start=2015,
+                 n_sims=201, seed=0, min_points=MIN_POINTS):
+        self.targets = list(targets)
+        self.base_year = base_year
+        self.recent_start = recent_start
+        self.n_sims = n_sims
+        self.years = np.arange(base_year + 1, horizon + 1)
+        countries, years, values = build_panel(data.df_cleaned, self.targets)
+        regions = data.df_cleaned.groupby("country", observed=True)["region"].first()
+        self.countries = countries
+        self.regions = regions.reindex(countries).to_numpy(dtype=object)
+        self.region_names = sorted(r for r in set(self.regions) if isinstance(r, str))
+        self.groups = self.region_names + [WORLD]
+        self._pos = {country: i for i, country in enumerate(countries)}
+
+        fit = fit_trends(years, values, min_points)
+        recent = (years >= recent_start) & (years <= base_year)
+        fit_recent = fit_trends(years[recent], values[:, recent], min_points=3)
+        use_recent = fit_recent["valid"]
+        self.valid = fit["valid"].T
+        self._slope = {"trend": fit["slope"].T,
+                       "recent": np.where(use_recent, fit_recent["slope"], fit["slope"]).T}
+        self._anchor = {
+            "trend": (fit["intercept"] + fit["slope"] * base_year).T,
+            "recent": np.where(use_recent, fit_recent["intercept"] + fit_recent["slope"] * base_year,
+                               fit["intercept"] + fit["slope"] * base_year).T,
+        }
+        self._draw_residuals(years, values, fit, n_sims, np.random.default_rng(seed))
+
+        # [group, country] membership (groups = regions + World) and [target, group, country] weights
+        self._membership = np.array([self.regions == region for region in self.region_names]
+                                    + [np.ones(len(countries), bool)], dtype=float)
+        weights = self._membership[None, :, :] * self.valid[:, None, :]
+        totals = weights.sum(axis=2, keepdims=True)
+        mean = np.array([target not in SUM_TARGETS for target in self.targets])[:, None, None]
+        self._weights = np.where(mean, np.divide(weights, totals, out=np.zeros_like(weights), where=totals > 0),
+                                 weights)
+        self.history = self._history(years, values)
+
+    def __contains__(self, country):
+        return country in self._pos
+
+    def _draw_residuals(self, years, values, fit, n_sims, rng, max_chunk_bytes=64 * 2**20):
+        """Slope perturbations [target, country, sim] and residual noise [target, country, year, sim].
+
+        n_sims // 2 deviations are drawn; the others are their negations and, for
+        an odd n_sims, a zero one.
+        """
+        # [target, country, year] from here on
+        mask = ~np.isnan(values).transpose(2, 0, 1)
+        values = values.transpose(2, 0, 1)
+        n, slope, intercept = fit["n"].T, fit["slope"].T, fit["intercept"].T
+        resid = np.where(mask, values - (intercept[..., None] + slope[..., None] * years), 0.0)
+        x_mean = np.where(mask, years, 0.0).sum(axis=-1) / np.maximum(n, 1)
+        dx = np.where(mask, years - x_mean[..., None], 0.0)
+        sxx = (dx * dx).sum(axis=-1)
+        # Valid observations first in every series, so a draw is an index below n
+        order = np.argsort(~mask, axis=-1, kind="stable")
+        resid = np.take_along_axis(resid, order, axis=-1)
+        dx = np.take_along_axis(dx, order, axis=-1)
+
+        def draw(size, sims):
+            """Residuals resampled within each series -> [target, country, size, sim]."""
+            idx = (rng.random((*n.shape, size * sims)) * np.maximum(n, 1)[..., None]).astype(int)
+            return np.take_along_axis(resid, idx, axis=-1).reshape(*n.shape, size, sims)
+
+        # Bootstrap refit of the slope on resampled residuals: Σ dx·e* / Σ dx², in
+        # chunks of simulations so long (e.g. monthly) panels don't exhaust memory
+        n_years = values.shape[-1]
+        n_draws = n_sims // 2
+        chunk_size = int(np.clip(max_chunk_bytes // (values.size * 8), 1, max(n_draws, 1)))
+        slope_delta = np.zeros((*n.shape, n_draws), dtype=np.float32)
+        for start in range(0, n_draws, chunk_size):
+            size = min(chunk_size, n_draws - start)
+            boot = np.where(np.arange(n_years)[:, None] < n[..., None, None], draw(n_years, size), 0.0)
+            slope_delta[..., start:start + size] = np.divide(
+                (dx[..., None] * boot).sum(axis=2), sxx[..., None],
+                out=np.zeros((*n.shape, size)), where=sxx[..., None] > 0)
+        noise = draw(len(self.years), n_draws).astype(np.float32)
+
+        def antithetic(deviations):
+            zero = np.zeros((*deviations.shape[:-1], n_sims % 2), dtype=np.float32)
+            return np.concatenate([deviations, -deviations, zero], axis=-1)
+
+        self._slope_delta = antithetic(slope_delta)
+        self._noise = antithetic(noise)
+
+    def _history(self, years, values):
+        """Observed aggregates per group as [target, group, year] (series with a trend only)."""
+        values = values.transpose(2, 0, 1)
+        mask = ~np.isnan(values) & self.valid[..., None]
+        totals = np.matmul(self._membership, np.where(mask, values, 0.0))
+        counts = np.matmul(self._membership, mask.astype(float))
+        mean = np.array([target not in SUM_TARGETS for target in self.targets])[:, None, None]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            history = np.where(mean, totals / counts, totals)
+        history[counts == 0] = np.nan
+        return {"years": years, "values": history, "countries": counts.astype(int)}
+
+    def multipliers(self, region_pct=None, country_pct=None):
+        """[target, country] slope multipliers from % adjustments.
+
+        region_pct maps target -> {region: %}, country_pct target -> {country: %};
+        a country adjustment replaces the one of its region. +50 % means the
+        trend grows 1.5 times as fast, -100 % flattens it.
+        """
+        pct = np.zeros((len(self.targets), len(self.countries)))
+        for k, target in enumerate(self.targets):
+            for region, value in (region_pct or {}).get(target, {}).items():
+                pct[k, self.regions == region] = value
+            for country, value in (country_pct or {}).get(target, {}).items():
+                if country in self._pos:
+                    pct[k, self._pos[country]] = value
+        return 1 + pct / 100
+
+    def run(self, bases=None, multipliers=None):
+        """Set up a scenario: bases maps target -> "trend"/"recent" (default "trend").
+
+        The central trajectories are computed here; the simulations only when
+        a band is asked for (see ScenarioResult).
+        """
+        bases = bases or {}
+        recent = np.array([bases.get(target, "trend") == "recent" for target in self.targets])[:, None]
+        slope = np.where(recent, self._slope["recent"], self._slope["trend"])
+        anchor = np.where(recent, self._anchor["recent"], self._anchor["trend"])
+        multipliers = np.ones_like(slope) if multipliers is None else multipliers
+        return ScenarioResult(self, anchor, slope, multipliers)
+
+
+class ScenarioResult:
+    """Trajectories of one scenario: country quantiles, group aggregates and the access goal.
+
+    central is indexed [target, country, year], the group arrays [target,
+    group, year]. Simulations are drawn per request and only for what is
+    shown: one target's countries for its aggregates, the selected
+    countries, or the horizon year for the goal table. The engine's draws are
+    fixed, so the bands don't depend on what else was asked.
+    """
+
+    def __init__(self, engine, anchor, slope, multipliers):
+        self.engine = engine
+        self._steps = (engine.years - engine.base_year).astype(np.float32)
+        self._anchor = anchor.astype(np.float32)
+        self._slope = slope
+        self._multipliers = multipliers
+
+        central = anchor[..., None] + (slope * multipliers)[..., None] * self._steps
+        central = clip_predictions(central, engine.targets, axis=0)
+        self.group_central = np.matmul(engine._weights, np.nan_to_num(central))
+        self.group_countries = (engine._weights > 0).sum(axis=-1)
+        self.central = np.where(~engine.valid[..., None], np.nan, central)
+
+    def simulations(self, k, rows=slice(None), years=slice(None)):
+        """Simulated trajectories [country, year, sim] of target k for some countries and years."""
+        engine = self.engine
+        slope = ((self._slope[k, rows, None] + engine._slope_delta[k, rows])
+                 * self._multipliers[k, rows, None]).astype(np.float32)
+        sims = (self._anchor[k, rows, None, None] + slope[:, None, :] * self._steps[years, None]
+                + engine._noise[k, rows][:, years])
+        return clip_predictions(sims[None], [engine.targets[k]], axis=0)[0]
+
+    def group_quantiles(self, k):
+        """QUANTILES of the group aggregates of target k -> [quantile, group, year]."""
+        sims = self.simulations(k)
+        n_countries, n_years, n_sims = sims.shape
+        # Aggregated per simulation, before sorting reorders each series' draws
+        group_sims = np.matmul(self.engine._weights[k].astype(np.float32), sims.reshape(n_countries, -1))
+        group_sims = group_sims.reshape(-1, n_years, n_sims)
+        group_sims.sort(axis=-1)
+        return sorted_quantiles(group_sims)
+
+    def quantiles(self, k, rows=slice(None), years=slice(None)):
+        """QUANTILES of target k for some countries and years -> [quantile, country, year], NaN without a trend."""
+        sims = self.simulations(k, rows, years)
+        sims.sort(axis=-1)
+        return np.where(~self.engine.valid[k, rows, None], np.nan, sorted_quantiles(sims))
+
+    def aggregate_frame(self, target):
+        """Long frame (region, year, mean, low, high, countries) of observed and projected aggregates.
+
+        "mean" is the total for SUM_TARGETS; observed years have no band.
+        """
+        engine = self.engine
+        k = engine.targets.index(target)
+        history = engine.history
+        n_groups, n_history = len(engine.groups), len(history["years"])
+        observed = pd.DataFrame({
+            "region": np.repeat(engine.groups, n_history),
+            "year": np.tile(history["years"], n_groups),
+            "mean": history["values"][k].ravel(),
+            "countries": history["countries"][k].ravel(),
+        })
+        observed["low"] = observed["high"] = observed["mean"]
+        n_years = len(engine.years)
+        quantiles = self.group_quantiles(k)
+        projected = pd.DataFrame({
+            "region": np.repeat(engine.groups, n_years),
+            "year": np.tile(engine.years, n_groups),
+            "mean": self.group_central[k].ravel(),
+            "low": quantiles[0].ravel(),
+            "high": quantiles[-1].ravel(),
+            "countries": np.repeat(self.group_countries[k], n_years),
+        })
+        return pd.concat([observed.dropna(subset=["mean"]), projected], ignore_index=True)
+
+    def country_frame(self, target, countries):
+        """Long frame (country, year, central, low, median, high) of the projections of some countries."""
+        engine = self.engine
+        k = engine.targets.index(target)
+        rows = [engine._pos[country] for country in countries if country in engine._pos]
+        n_years = len(engine.years)
+        quantiles = self.quantiles(k, rows)
+        return pd.DataFrame({
+            "country": np.repeat(engine.countries[rows], n_years),
+            "year": np.tile(engine.years, len(rows)),
+            "central": self.central[k, rows].ravel(),
+            "low": quantiles[0].ravel(),
+            "median": quantiles[1].ravel(),
+            "high": quantiles[-1].ravel(),
+        })
+
+    def goal_table(self, targets=PERCENT_TARGETS):
+        """Countries whose median horizon-year access misses the goal, one row per (country, target)."""
+        engine = self.engine
+        horizon = engine.years[-1]
+        frames = []
+        for target in targets:
+            k = engine.targets.index(target)
+            # The horizon year only, sorted once for the quantiles and the share at the goal
+            sims = self.simulations(k, years=slice(-1, None))[:, 0]
+            sims.sort(axis=-1)
+            low, median, high = sorted_quantiles(sims)
+            reach = (sims >= GOAL - GOAL_TOLERANCE).mean(axis=-1)
+            missed = engine.valid[k] & (median < GOAL - GOAL_TOLERANCE)
+            frames.append(pd.DataFrame({
+                "country": engine.countries[missed],
+                "region": engine.regions[missed],
+                "target": target,
+                f"{horizon} median": median[missed],
+                f"{horizon} low": low[missed],
+                f"{horizon} high": high[missed],
+                "P(reach goal)": reach[missed],
+            }))
+        return pd.concat(frames, ignore_index=True).sort_values(["target", f"{horizon} median"])
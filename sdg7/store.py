@@ -0,0 +1,181 @@
+# Columnar binary store for the processed data and predictions
+#
+# `python -m sdg7.store` converts the CSVs into one memory-mappable .npy file
+# per column under Data/Store, with country/region/ISO3 dictionary-encoded and a
+# (country, year) row index. load_tables() reads the store and falls back to
+# the CSVs when it is missing or was built from different source files.
+import argparse
+import hashlib
+import json
+import shutil
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from sdg7.config import DATA_DIR, PREDICTIONS_CSV, PROCESSED_CSV
+from sdg7.countries import COUNTRIES_CSV, add_country_columns, load_countries
+
+STORE_DIR = DATA_DIR / "Store"
+STORE_VERSION = 1
+CATEGORY_COLUMNS = ["country", "iso3", "region", "sub_region"]
+
+
+# path -> ((mtime_ns, size), sha256) of the last hash of each file
+_file_hashes = {}
+
+
+def file_hash(path):
+    """SHA-256 of a file, re-read only when its mtime or size changed.
+
+    Every rerun asks for the data version, so the sources are stat'ed
+    instead of hashed again.
+    """
+    stat = path.stat()
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    cached = _file_hashes.get(path)
+    if cached is None or cached[0] != stamp:
+        cached = _file_hashes[path] = (stamp, hashlib.sha256(path.read_bytes()).hexdigest())
+    return cached[1]
+
+
+def source_hashes():
+    """Hashes of everything the store is derived from."""
+    return {
+        "processed": file_hash(PROCESSED_CSV),
+        "predictions": file_hash(PREDICTIONS_CSV),
+        "countries": file_hash(COUNTRIES_CSV),
+    }
+
+
+def data_version():
+    """Short id that changes whenever any source of the data changes."""
+    hashes = json.dumps(source_hashes(), sort_keys=True).encode()
+    return hashlib.sha256(hashes).hexdigest()[:16]
+
+
+def load_csv_tables():
+    """Parse the CSVs directly (the fallback path).
+
+    Country names are checked against the country table (ValueError on
+    unknown names) and the ISO3 code, region and sub-region are added.
+    """
+    df_countries = load_countries()
+    df_cleaned = add_country_columns(pd.read_csv(PROCESSED_CSV), df_countries)
+    df_cleaned = df_cleaned.sort_values(["country", "year"], kind="stable").reset_index(drop=True)
+    df_pred_2030 = add_country_columns(pd.read_csv(PREDICTIONS_CSV), df_countries, columns=("iso3",))
+    return df_cleaned, df_pred_2030
+
+
+def _write_table(df, table_dir):
+    table_dir.mkdir()
+    columns = {}
+    for col in df.columns:
+        if col in CATEGORY_COLUMNS:
+            cat = df[col].astype("category")
+            codes = cat.cat.codes.to_numpy()
+            np.save(table_dir / f"{col}.npy", codes)
+            columns[col] = {"kind": "category", "categories": cat.cat.categories.tolist()}
+        else:
+            values = df[col].to_numpy()
+            np.save(table_dir / f"{col}.npy", values)
+            columns[col] = {"kind": "numeric", "dtype": values.dtype.str}
+    return {"rows": len(df), "columns": columns}
+
+
+def _country_offsets(df_cleaned):
+    """Start row of every country in the (country, year)-sorted table, plus the end."""
+    countries, starts = np.unique(df_cleaned["country"].to_numpy(), return_index=True)
+    return countries, np.append(starts, len(df_cleaned)).astype(np.int64)
+
+
+def build_store(store_dir=STORE_DIR):
+    """Convert the CSVs into the columnar store, replacing any previous build."""
+    hashes = source_hashes()
+    df_cleaned, df_pred_2030 = load_csv_tables()
+
+    store_dir.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = Path(tempfile.mkdtemp(prefix=".store-", dir=store_dir.parent))
+    try:
+        tables = {
+            "processed": _write_table(df_cleaned, tmp_path / "processed"),
+            "predictions": _write_table(df_pred_2030, tmp_path / "predictions"),
+        }
+        _, offsets = _country_offsets(df_cleaned)
+        np.save(tmp_path / "processed" / "_country_offsets.npy", offsets)
+        manifest = {"version": STORE_VERSION, "sources": hashes, "tables": tables}
+        (tmp_path / "manifest.json").write_text(json.dumps(manifest, indent=1))
+        if store_dir.exists():
+            shutil.rmtree(store_dir)
+        tmp_path.rename(store_dir)
+    except BaseException:
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        raise
+    return manifest
+
+
+def read_manifest(store_dir=STORE_DIR):
+    """Return the store manifest, or None if the store is missing or stale."""
+    manifest_path = store_dir / "manifest.json"
+    if not manifest_path.exists():
+        return None
+    manifest = json.loads(manifest_path.read_text())
+    if manifest.get("version") != STORE_VERSION or manifest.get("sources") != source_hashes():
+        return None
+    return manifest
+
+
+def _read_table(table_dir, meta, categorical):
+    data = {}
+    for col, spec in meta["columns"].items():
+        values = np.load(table_dir / f"{col}.npy", mmap_mode="r")
+        if spec["kind"] == "category":
+            cat = pd.Categorical.from_codes(values, categories=spec["categories"])
+            # Plotly Express chokes on unused categories, so decode by default
+            data[col] = cat if categorical else np.asarray(cat)
+        else:
+            data[col] = values
+    return pd.DataFrame(data, copy=False)
+
+
+def load_tables(store_dir=STORE_DIR, categorical=False):
+    """Return (df_cleaned, df_pred_2030), from the store when it is fresh.
+
+    df_cleaned is sorted by (country, year) and carries iso3, region and
+    sub_region columns; df_pred_2030 carries iso3.
+    """
+    manifest = read_manifest(store_dir)
+    if manifest is None:
+        return load_csv_tables()
+    tables = manifest["tables"]
+    df_cleaned = _read_table(store_dir / "processed", tables["processed"], categorical)
+    df_pred_2030 = _read_table(store_dir / "predictions", tables["predictions"], categorical)
+    return df_cleaned, df_pred_2030
+
+
+def load_country_index(df_cleaned, store_dir=STORE_DIR):
+    """Return (countries, offsets): rows of countries[i] are offsets[i]:offsets[i + 1]."""
+    manifest = read_manifest(store_dir)
+    if manifest is None:
+        return _country_offsets(df_cleaned)
+    countries = np.asarray(manifest["tables"]["processed"]["columns"]["country"]["categories"], dtype=object)
+    offsets = np.load(store_dir / "processed" / "_country_offsets.npy", mmap_mode="r")
+    return countries, offsets
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the columnar data store used by app.py.")
+    parser.add_argument("--check", action="store_true", help="Only report whether the store is fresh")
+    args = parser.parse_args()
+
+    if args.check:
+        print("fresh" if read_manifest() is not None else "missing or stale")
+        return
+    manifest = build_store()
+    rows = {name: table["rows"] for name, table in manifest["tables"].items()}
+    print(f"Store written to {STORE_DIR} {rows}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+# All-country summary cube for the Country Overview page
+#
+# The 2000 and 2020 values, change, % change, 2030 forecast and rank within
+# the region of every country and metric are computed with whole-array
+# operations once per data version (cached with st.cache_resource), so
+# selecting a country is an array lookup and the all-country table and the
+# CSV/Parquet exports are slices of the same (country, metric, stat) array.
+import io
+
+import numpy as np
+import pandas as pd
+
+METRICS = [
+    "access_to_electricity",
+    "access_to_clean_fuels",
+    "renewable_capacity_per_capita",
+    "renewable_energy_share",
+    "fossil_electricity",
+    "energy_intensity",
+    "co2_emissions_kt",
+    "gdp_per_capita",
+]
+STATS = ["2000", "2020", "Change", "% Change", "2030 forecast", "Rank in region"]
+
+
+class SummaryCube:
+    """Summary statistics indexed [country, metric, stat].
+
+    Countries are those with a row in `year`. "Rank in region" ranks the
+    `year` value within the country's region, 1 being the highest; the 2030
+    forecast is only available for the forecast targets.
+    """
+
+    def __init__(self, data, metrics=METRICS, base_year=2000, year=2020):
+        df_year = data.year(year)
+        self.countries = df_year["country"].to_numpy()
+        self.regions = df_year["region"].to_numpy()
+        self.metrics = list(metrics)
+        self._pos = {country: i for i, country in enumerate(self.countries)}
+        self._exports = {}
+
+        current = df_year[self.metrics].to_numpy(dtype=float)
+        base = (data.year(base_year).set_index("country")[self.metrics]
+                .reindex(self.countries).to_numpy(dtype=float))
+        forecast = (data.df_pred_2030.set_index("country")
+                    .reindex(index=self.countries, columns=self.metrics).to_numpy(dtype=float))
+        change = current - base
+        with np.errstate(divide="ignore", invalid="ignore"):
+            pct_change = np.round(change / base * 100, 2)
+        # Countries without a region get no rank
+        rank = (pd.DataFrame(current, columns=self.metrics)
+                .groupby(self.regions).rank(ascending=False, method="min")
+                .reindex(range(len(self.countries))).to_numpy(dtype=float))
+        self.values = np.stack([base, current, change, pct_change, forecast, rank], axis=-1)
+
+    def __contains__(self, country):
+        return country in self._pos
+
+    def country(self, country):
+        """Metric x stat frame of one country."""
+        return pd.DataFrame(self.values[self._pos[country]], index=self.metrics, columns=STATS)
+
+    def region(self, country):
+        return self.regions[self._pos[country]]
+
+    def table(self, metric):
+        """Country x stat frame of one metric, with the region."""
+        df_table = pd.DataFrame(self.values[:, self.metrics.index(metric)], columns=STATS)
+        df_table.insert(0, "country", self.countries)
+        df_table.insert(1, "region", self.regions)
+        return df_table
+
+    def long(self):
+        """Tidy frame: one row per (country, metric) with every stat."""
+        n_countries, n_metrics, _ = self.values.shape
+        df_long = pd.DataFrame(self.values.reshape(n_countries * n_metrics, -1), columns=STATS)
+        df_long.insert(0, "country", np.repeat(self.countries, n_metrics))
+        df_long.insert(1, "region", np.repeat(self.regions, n_metrics))
+        df_long.insert(2, "metric", np.tile(self.metrics, n_countries))
+        return df_long
+
+    def export(self, fmt):
+        """The long frame as CSV or Parquet bytes, built once per cube."""
+        if fmt not in self._exports:
+            if fmt == "csv":
+                self._exports[fmt] = self.long().to_csv(index=False).encode()
+            elif fmt == "parquet":
+                buffer = io.BytesIO()
+                self.long().to_parquet(buffer, index=False)
+                self._exports[fmt] = buffer.getvalue()
+            else:
+                raise ValueError(f"Unknown export format: {fmt}")
+        return self._exports[fmt]
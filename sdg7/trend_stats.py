@@ -0,0 +1,227 @@
+# Incremental linear trend forecasts from stored sufficient statistics
+#
+# A least-squares line per (country, target) only needs n, Σx, Σy, Σxy, Σx²
+# (plus Σy² for R²). Those sums are kept in Data/Predictions/trend_stats.csv,
+# so new or corrected observations are folded in by adding/subtracting their
+# contribution and only the touched series are refitted, instead of
+# refitting every series from the processed CSV.
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from sdg7.config import (
+    DATA_DIR,
+    FORECAST_YEAR,
+    MIN_POINTS,
+    PREDICTIONS_CSV,
+    PROCESSED_CSV,
+    TARGET_VARS,
+)
+from sdg7.forecast import clip_predictions, to_wide
+from sdg7.store import STORE_DIR, build_store, load_country_index, load_tables
+
+STATS_CSV = DATA_DIR / "Predictions" / "trend_stats.csv"
+STAT_COLUMNS = ["n", "sum_x", "sum_y", "sum_xy", "sum_xx", "sum_yy"]
+# Years are shifted by this before summing to keep the sums well-conditioned
+REFERENCE_YEAR = 2000
+
+
+def observations(df, targets=TARGET_VARS):
+    """Long (country, target, year, value) rows of the non-missing target values."""
+    df_obs = df.melt(id_vars=["country", "year"], value_vars=targets, var_name="target")
+    return df_obs.dropna(subset=["value"])
+
+
+def _sums(df_obs):
+    """Sufficient statistics of each (country, target) series in the observations."""
+    x = df_obs["year"].to_numpy(dtype=float) - REFERENCE_YEAR
+    y = df_obs["value"].to_numpy(dtype=float)
+    terms = pd.DataFrame({
+        "country": df_obs["country"].to_numpy(),
+        "target": df_obs["target"].to_numpy(),
+        "n": 1.0, "sum_x": x, "sum_y": y, "sum_xy": x * y, "sum_xx": x * x, "sum_yy": y * y,
+    })
+    return terms.groupby(["country", "target"])[STAT_COLUMNS].sum()
+
+
+def _fit(table):
+    """Slope, intercept (in shifted years) and R² of every row of a stats table."""
+    n, sx, sy, sxy, sxx, syy = (table[col].to_numpy() for col in STAT_COLUMNS)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        var_x = n * sxx - sx * sx
+        slope = np.where(var_x > 0, (n * sxy - sx * sy) / var_x, 0.0)
+        intercept = (sy - slope * sx) / n
+        ss_tot = syy - sy * sy / n
+        ss_res = (syy - 2 * intercept * sy - 2 * slope * sxy + intercept * intercept * n
+                  + 2 * intercept * slope * sx + slope * slope * sxx)
+        ss_res = np.maximum(ss_res, 0)
+        # Same convention as sklearn's r2_score for a constant series
+        scale = np.maximum(np.abs(syy), 1.0) * 1e-12
+        r2 = np.where(ss_tot > scale, 1 - ss_res / ss_tot, np.where(ss_res <= scale, 1.0, 0.0))
+    return slope, intercept, r2
+
+
+class TrendStats:
+    """Per-(country, target) sums with an add/remove update API."""
+
+    def __init__(self, table, targets=TARGET_VARS):
+        self.table = table
+        self.targets = list(targets)
+
+    @classmethod
+    def from_data(cls, df, targets=TARGET_VARS):
+        table = _sums(observations(df, targets))
+        table["mae"] = _mae(table, observations(df, targets))
+        return cls(table, targets)
+
+    @classmethod
+    def load(cls, path=STATS_CSV, targets=TARGET_VARS):
+        table = pd.read_csv(path, float_precision="round_trip").set_index(["country", "target"])
+        return cls(table, targets)
+
+    def save(self, path=STATS_CSV):
+        self.table.reset_index().to_csv(path, index=False)
+
+    def update(self, added=None, removed=None, df_current=None):
+        """Fold observations in and/or out; returns the (country, target) keys touched.
+
+        `added` and `removed` are frames in the processed layout (country, year
+        and target columns). A corrected value is passed as the old row in
+        `removed` and the new row in `added`. MAE needs the residuals of every
+        point, so it is recomputed for the touched series only from the rows of
+        the touched countries in `df_current`, or set to NaN when it is not
+        given. df_current may hold the data from before or after the update:
+        its values at the added and removed (country, year) points are
+        replaced by the added ones.
+        """
+        delta = []
+        if added is not None and len(added):
+            delta.append(_sums(observations(added, self.targets)))
+        if removed is not None and len(removed):
+            delta.append(-_sums(observations(removed, self.targets)))
+        if not delta:
+            return pd.MultiIndex.from_tuples([], names=["country", "target"])
+        delta = pd.concat(delta).groupby(level=["country", "target"]).sum()
+
+        # Existing series are updated in place by position, new ones appended
+        table = self.table
+        pos = table.index.get_indexer(delta.index)
+        known = pos >= 0
+        cols = [table.columns.get_loc(col) for col in STAT_COLUMNS]
+        table.iloc[pos[known], cols] = table.iloc[pos[known], cols].to_numpy() + delta[known].to_numpy()
+        if not known.all():
+            table = pd.concat([table, delta[~known].assign(mae=np.nan)]).sort_index()
+
+        # Series that lost all their observations disappear
+        emptied = table.index[table["n"].to_numpy() <= 0]
+        if len(emptied):
+            table = table.drop(emptied)
+        touched = delta.index.difference(emptied)
+        rows = table.index.get_indexer(touched)
+        mae_col = table.columns.get_loc("mae")
+        if df_current is not None:
+            current = df_current[df_current["country"].isin(touched.get_level_values("country"))]
+            df_obs = _apply(observations(current, self.targets), observations(added, self.targets)
+                            if added is not None else None, observations(removed, self.targets)
+                            if removed is not None else None)
+            table.iloc[rows, mae_col] = _mae(table.iloc[rows], df_obs).to_numpy()
+        else:
+            table.iloc[rows, mae_col] = np.nan
+        self.table = table
+        return touched
+
+    def metrics(self, min_points=MIN_POINTS):
+        """country, target, n, r2, mae of every series with enough points."""
+        table = self.table[self.table["n"] >= min_points]
+        _, _, r2 = _fit(table)
+        return pd.DataFrame({
+            "country": table.index.get_level_values("country"),
+            "target": table.index.get_level_values("target"),
+            "n": table["n"].astype(int).to_numpy(),
+            "r2": r2,
+            "mae": table["mae"].to_numpy(),
+        })
+
+    def predict(self, horizons=(FORECAST_YEAR,), min_points=MIN_POINTS):
+        """Long predictions (country, target, year, predicted_value), like forecast.forecast()."""
+        table = self.table[self.table["n"] >= min_points]
+        slope, intercept, _ = _fit(table)
+        horizons = np.asarray(horizons, dtype=float)
+        pred = intercept[:, None] + slope[:, None] * (horizons[None, :] - REFERENCE_YEAR)
+        targets = table.index.get_level_values("target").to_numpy()
+        for target in self.targets:
+            rows = targets == target
+            pred[rows] = clip_predictions(pred[rows][..., None], [target])[..., 0]
+        return pd.DataFrame({
+            "country": np.repeat(table.index.get_level_values("country").to_numpy(), len(horizons)),
+            "target": np.repeat(targets, len(horizons)),
+            "year": np.tile(horizons.astype(int), len(table)),
+            "predicted_value": pred.ravel(),
+        })
+
+
+def _apply(df_obs, added=None, removed=None):
+    """Observations with those at the added/removed (country, target, year) points replaced by the added ones."""
+    changes = [obs for obs in (added, removed) if obs is not None]
+    if not changes:
+        return df_obs
+    keys = ["country", "target", "year"]
+    changed = pd.MultiIndex.from_frame(pd.concat(changes)[keys].astype({"year": float}))
+    kept = df_obs[~pd.MultiIndex.from_frame(df_obs[keys].astype({"year": float})).isin(changed)]
+    return pd.concat([kept] + ([added] if added is not None else []), ignore_index=True)
+
+
+def processed_rows(countries):
+    """Processed rows of `countries`, sliced out of the memory-mapped store by its country offsets.
+
+    Falls back to the CSV when the store is missing or stale.
+    """
+    df_cleaned, _ = load_tables(categorical=True)
+    names, offsets = load_country_index(df_cleaned)
+    pos = {name: i for i, name in enumerate(names)}
+    rows = [np.arange(offsets[pos[c]], offsets[pos[c] + 1]) for c in set(countries) if c in pos]
+    df = df_cleaned.iloc[np.concatenate(rows)] if rows else df_cleaned.iloc[:0]
+    return df.astype({col: object for col in df.select_dtypes("category").columns})
+
+
+def _mae(table, df_obs):
+    """Mean absolute residual of each series in `table` over its observations."""
+    slope, intercept, _ = _fit(table)
+    coef = pd.DataFrame({"slope": slope, "intercept": intercept}, index=table.index)
+    df_obs = df_obs.join(coef, on=["country", "target"], how="inner")
+    resid = df_obs["value"] - df_obs["intercept"] - df_obs["slope"] * (df_obs["year"] - REFERENCE_YEAR)
+    return resid.abs().groupby([df_obs["country"], df_obs["target"]]).mean().reindex(table.index)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or update the stored trend statistics and predictions.")
+    parser.add_argument("--add", help="CSV of new observations (processed layout)")
+    parser.add_argument("--remove", help="CSV of observations to take out (e.g. the old version of corrected rows)")
+    parser.add_argument("--years", type=int, nargs="+", default=[FORECAST_YEAR])
+    parser.add_argument("--output", default=str(PREDICTIONS_CSV))
+    args = parser.parse_args()
+
+    if args.add or args.remove:
+        stats = TrendStats.load()
+        added = pd.read_csv(args.add) if args.add else None
+        removed = pd.read_csv(args.remove) if args.remove else None
+        # The processed CSV may or may not include the change yet; update() applies it to these rows
+        countries = pd.concat([df["country"] for df in (added, removed) if df is not None])
+        touched = stats.update(added, removed, df_current=processed_rows(countries))
+        print(f"Updated {len(touched)} series")
+    else:
+        stats = TrendStats.from_data(pd.read_csv(PROCESSED_CSV))
+        print(f"Built statistics for {len(stats.table)} series")
+
+    stats.save()
+    to_wide(stats.predict(args.years)).to_csv(args.output, index=False)
+    print(f"Predictions saved to {args.output}")
+    if STORE_DIR.exists():
+        # Keep app.py on the memory-mapped path with the fresh predictions
+        build_store()
+        print(f"Store rebuilt in {STORE_DIR}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,5 +4,6 @@ echo "\
 headless = true\n\
 port = $PORT\n\
 enableCORS = false\n\
+enableStaticServing = true\n\
 \n\
 " > ~/.streamlit/config.toml
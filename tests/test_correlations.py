@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scipy.stats import pearsonr, spearmanr
+
+from sdg7.correlations import CorrelationCube
+
+COLUMNS = ["a", "b", "c", "d"]
+
+
+@pytest.fixture(scope="module")
+def frames():
+    # Correlated columns with ties and gaps in different rows of each column
+    rng = np.random.default_rng(1)
+    frames = {}
+    for label in [2000, 2001]:
+        base = rng.normal(size=40)
+        df = pd.DataFrame({col: base * w + rng.normal(size=40) for col, w in zip(COLUMNS, [1, -0.5, 0.3, 2])})
+        df["d"] = df["d"].round()
+        for col, frac in zip(COLUMNS, [0.1, 0.2, 0.3, 0.0]):
+            df.loc[rng.random(40) < frac, col] = np.nan
+        frames[label] = df
+    return frames
+
+
+@pytest.fixture(scope="module")
+def cube(frames):
+    return CorrelationCube(frames, COLUMNS, n_boot=50)
+
+
+@pytest.mark.parametrize("method", ["pearson", "spearman"])
+def test_matrix_matches_pandas(frames, cube, method):
+    for label, df in frames.items():
+        expected = df.corr(method=method)
+        pd.testing.assert_frame_equal(cube.matrix(label, method), expected, rtol=1e-10, atol=1e-12)
+
+
+@pytest.mark.parametrize("method, func", [("pearson", pearsonr), ("spearman", spearmanr)])
+def test_pair_matches_scipy(frames, cube, method, func):
+    for label, df in frames.items():
+        for x in COLUMNS:
+            for y in COLUMNS:
+                if x == y:
+                    continue
+                complete = df[[x, y]].dropna()
+                expected = func(complete[x], complete[y])
+                stats = cube.pair(x, y, label, method, ci=False)
+                assert stats["n"] == len(complete)
+                assert stats["r"] == pytest.approx(expected.statistic, abs=1e-12)
+                assert stats["p"] == pytest.approx(expected.pvalue, rel=1e-8)
+
+
+@pytest.mark.parametrize("method", ["pearson", "spearman"])
+def test_interval_only_depends_on_the_complete_rows(frames, cube, method):
+    # Same CI as a cube of the pair's complete rows alone: the other columns' gaps don't move it
+    df = frames[2001][["a", "c"]].dropna()
+    alone = CorrelationCube({2001: df}, ["a", "c"], n_boot=50)
+    low, high = cube.interval("a", "c", 2001, method)
+    assert (low, high) == alone.interval("a", "c", 2001, method)
+    assert low <= cube.pair("a", "c", 2001, method, ci=False)["r"] <= high
@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from sdg7.downsample import MIN_POINTS_PER_SERIES, downsample
+
+MAX_POINTS = 300
+
+
+@pytest.fixture(scope="module")
+def df():
+    # 30 series of 2-400 points with gaps, ties and shuffled rows
+    rng = np.random.default_rng(0)
+    frames = []
+    for i, n in enumerate(rng.integers(2, 400, size=30)):
+        y = np.cumsum(rng.normal(size=n)).round(1)
+        y[rng.random(n) < 0.05] = np.nan
+        frames.append(pd.DataFrame({"country": f"C{i:02d}", "year": 1990 + np.arange(n) / 12, "value": y}))
+    df = pd.concat(frames, ignore_index=True)
+    return df.sample(frac=1, random_state=0)
+
+
+def _series(df):
+    return df[df["value"].notna()].sort_values(["country", "year"]).groupby("country")
+
+
+@pytest.mark.parametrize("method", ["minmax", "lttb"])
+def test_within_budget_keeps_endpoints(df, method):
+    out = downsample(df, "year", "value", by="country", max_points=MAX_POINTS, method=method)
+    assert len(out) <= MAX_POINTS
+    assert out.index.is_unique
+    pd.testing.assert_frame_equal(out, df.loc[out.index])
+    kept = out.groupby("country")["year"].agg(["min", "max"])
+    expected = _series(df)["year"].agg(["min", "max"])
+    pd.testing.assert_frame_equal(kept, expected)
+
+
+def test_minmax_keeps_every_bucket_extreme(df):
+    out = downsample(df, "year", "value", by="country", max_points=MAX_POINTS)
+    budget = max(MAX_POINTS // df["country"].nunique(), MIN_POINTS_PER_SERIES)
+    n_buckets = max(budget // 2 - 1, 1)
+    for country, series in _series(df):
+        kept = out[out["country"] == country]
+        if len(series) <= budget:
+            assert len(kept) == len(series)
+            continue
+        bucket = np.arange(len(series)) * n_buckets // len(series)
+        extremes = series.groupby(bucket)["value"].agg(["min", "max"])
+        kept_extremes = kept.groupby(bucket[series.index.get_indexer(kept.index)])["value"].agg(["min", "max"])
+        pd.testing.assert_frame_equal(kept_extremes, extremes)
+
+
+def test_frame_within_budget_is_unchanged(df):
+    assert downsample(df, "year", "value", by="country", max_points=len(df)) is df
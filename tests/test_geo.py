@@ -0,0 +1,50 @@
+import json
+
+import pytest
+
+from sdg7.config import ROOT_DIR
+from sdg7.countries import load_countries
+from sdg7.geo import GEOMETRY_JSON, TOPOJSON_DIR, TOPOJSON_NAME, load_geometry, to_topojson
+
+
+@pytest.fixture(scope="module")
+def bundle():
+    return load_geometry()
+
+
+def test_bundle_is_committed(bundle):
+    assert GEOMETRY_JSON.exists()
+    codes = {feature["id"] for feature in bundle["features"]}
+    iso3 = set(load_countries()["iso3"].dropna())
+    assert codes <= iso3
+    # Natural Earth 1:110m leaves out the smallest island states only
+    assert len(codes) >= 0.85 * len(iso3)
+
+
+def test_dashboard_map_draws_the_bundle(bundle):
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(str(ROOT_DIR / "app.py"), default_timeout=120)
+    at.run()
+    at.sidebar.radio[0].set_value("Dashboard").run()
+    assert not at.exception
+    maps = [json.loads(chart.proto.spec)["data"][0] for chart in at.get("plotly_chart")]
+    trace = next(trace for trace in maps if trace["type"] == "choropleth")
+    assert trace["featureidkey"] == "id"
+    assert trace["geojson"] == bundle
+    codes = {feature["id"] for feature in bundle["features"]}
+    assert set(trace["locations"]) & codes
+
+
+def test_topojson_matches_the_bundle(bundle):
+    with open(TOPOJSON_DIR / f"{TOPOJSON_NAME}.json", encoding="utf-8") as f:
+        topology = json.load(f)
+    assert topology == to_topojson(bundle)
+
+    arcs = topology["arcs"]
+    for feature, geometry in zip(bundle["features"], topology["objects"]["countries"]["geometries"]):
+        assert geometry["id"] == feature["id"]
+        polygons = [geometry["arcs"]] if geometry["type"] == "Polygon" else geometry["arcs"]
+        rings = [[arcs[i] for [i] in polygon] for polygon in polygons]
+        expected = feature["geometry"]["coordinates"]
+        assert rings == ([expected] if geometry["type"] == "Polygon" else expected)
@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from sdg7.config import PERCENT_TARGETS, PREDICTIONS_CSV
+from sdg7.data_access import DataIndex
+from sdg7.scenarios import ScenarioEngine
+from sdg7.store import data_version, load_tables
+
+
+@pytest.fixture(scope="module")
+def engine():
+    return ScenarioEngine(DataIndex(*load_tables(), version=data_version()))
+
+
+def test_unadjusted_median_is_the_linear_forecast(engine):
+    result = engine.run(multipliers=engine.multipliers({}, {}))
+    df_pred = pd.read_csv(PREDICTIONS_CSV).set_index("country").reindex(engine.countries)
+    for k, target in enumerate(engine.targets):
+        median = result.quantiles(k)[1, :, -1]
+        expected = df_pred[target].to_numpy()
+        # Same series have a trend, and the median sits on it (up to float32)
+        np.testing.assert_array_equal(np.isnan(median), np.isnan(expected))
+        np.testing.assert_allclose(median, expected, rtol=1e-6, atol=1e-4)
+        np.testing.assert_allclose(result.central[k, :, -1], expected, rtol=1e-12, atol=1e-9)
+
+
+def test_goal_counts_keep_targets_no_country_misses(engine):
+    from sdg7.pages.scenarios import goal_counts
+
+    df_goal = engine.run().goal_table()
+    low, median, high = (df_goal[f"{engine.years[-1]} {q}"] for q in ["low", "median", "high"])
+    assert ((low <= median) & (median < 100) & (median <= high)).all()
+
+    counts = goal_counts(df_goal[df_goal["target"] != PERCENT_TARGETS[0]])
+    assert list(counts.index) == PERCENT_TARGETS
+    assert counts[PERCENT_TARGETS[0]] == 0
+    assert counts[PERCENT_TARGETS[1]] == (df_goal["target"] == PERCENT_TARGETS[1]).sum() > 0
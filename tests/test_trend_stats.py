@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from sdg7.config import PROCESSED_CSV, TARGET_VARS
+from sdg7.forecast import forecast
+from sdg7.trend_stats import TrendStats
+
+COUNTRIES = ["Germany", "India", "Kenya", "Chile", "Ghana", "Morocco", "Peru", "Nepal"]
+
+
+@pytest.fixture(scope="module")
+def df():
+    df = pd.read_csv(PROCESSED_CSV)
+    return df[df["country"].isin(COUNTRIES)].reset_index(drop=True)
+
+
+def add_only(df):
+    latest = df[df["year"] == df["year"].max()]
+    added = latest[latest["country"].isin(["India", "Kenya"])].copy()
+    added["year"] += 1
+    added[TARGET_VARS] = added[TARGET_VARS] * 1.03
+    return added, None, pd.concat([df, added], ignore_index=True)
+
+
+def correction(df):
+    removed = df[df["country"].isin(["Chile", "Peru"]) & (df["year"] == 2010)]
+    added = removed.copy()
+    added[TARGET_VARS] = added[TARGET_VARS] * 1.1
+    return added, removed, pd.concat([df.drop(removed.index), added], ignore_index=True)
+
+
+def remove_only(df):
+    removed = df[df["country"].isin(["Germany", "Nepal"]) & df["year"].isin([2001, 2015])]
+    return None, removed, df.drop(removed.index)
+
+
+def new_country(df):
+    added = df[df["country"] == "Morocco"].copy()
+    added["country"] = "Aaa New Country"
+    added[TARGET_VARS] = added[TARGET_VARS] * 0.9
+    return added, None, pd.concat([df, added], ignore_index=True)
+
+
+@pytest.mark.parametrize("change", [add_only, correction, remove_only, new_country])
+def test_update_matches_full_refit(df, change):
+    added, removed, df_updated = change(df)
+    stats = TrendStats.from_data(df)
+    stats.update(added, removed, df_current=df_updated)
+    df_predictions, df_metrics = forecast(df_updated)
+
+    keys = ["country", "target", "year"]
+    pred = df_predictions.merge(stats.predict(), on=keys, how="outer", suffixes=("_full", "_incr"))
+    assert len(pred) == len(df_predictions)
+    np.testing.assert_allclose(pred["predicted_value_incr"], pred["predicted_value_full"], rtol=1e-9, atol=1e-9)
+
+    metrics = df_metrics.merge(stats.metrics(), on=["country", "target"], how="outer", suffixes=("_full", "_incr"))
+    assert len(metrics) == len(df_metrics)
+    assert (metrics["n_full"] == metrics["n_incr"]).all()
+    np.testing.assert_allclose(metrics["r2_incr"], metrics["r2_full"], rtol=0, atol=1e-9)
+    np.testing.assert_allclose(metrics["mae_incr"], metrics["mae_full"], rtol=1e-9, atol=1e-9)
+
+
+def test_update_with_data_before_the_change(df):
+    # MAE comes out the same when df_current does not contain the change yet (ETL not run)
+    added, removed, df_updated = correction(df)
+    before, after = TrendStats.from_data(df), TrendStats.from_data(df)
+    before.update(added, removed, df_current=df)
+    after.update(added, removed, df_current=df_updated)
+    pd.testing.assert_frame_equal(before.metrics(), after.metrics(), rtol=1e-12)